@@ -0,0 +1,271 @@
+# =========================
+# IMPORTAÇÕES
+# =========================
+
+# Biblioteca padrão para ler argumentos da linha de comando
+import argparse
+
+# Biblioteca padrão para programação assíncrona (concorrência de I/O)
+import asyncio
+
+# Biblioteca padrão para gravar os resultados em JSONL
+import json
+
+# Biblioteca padrão para acessar variáveis de ambiente
+import os
+
+# Biblioteca padrão para o jitter do backoff
+import random
+
+# Biblioteca padrão para medir latência e throughput
+import time
+
+# Carrega variáveis de ambiente a partir de um arquivo .env
+from dotenv import load_dotenv
+
+# Cliente assíncrono da Groq e os erros que valem uma nova tentativa
+from groq import (
+    APIConnectionError,
+    AsyncGroq,
+    InternalServerError,
+    RateLimitError,
+)
+
+# Cliente principal para interagir com o Qdrant
+from qdrant_client import QdrantClient
+
+# Modelo para gerar embeddings (transforma texto em vetor numérico)
+from sentence_transformers import SentenceTransformer
+
+# Retrievers em lote (um encode para várias perguntas)
+from retrievers import numpy_batch_retriever, qdrant_batch_retriever
+
+
+# =========================
+# CONFIGURAÇÃO
+# =========================
+
+LLM_MODEL = "llama-3.1-8b-instant"
+
+SYSTEM_PROMPT = (
+    "Você é um especialista em machine learning. "
+    "Use apenas o contexto fornecido para responder as perguntas."
+)
+
+# Erros temporários: a requisição é repetida com backoff
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, InternalServerError)
+
+
+# =========================
+# LIMITADOR DE REQUISIÇÕES
+# =========================
+
+
+class RateLimiter:
+    # Limita as chamadas a requests_per_minute, espaçando-as igualmente
+    # Cada acquire() reserva o próximo horário livre e espera por ele
+
+    def __init__(self, requests_per_minute):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self.next_slot = 0.0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.interval:
+            return
+
+        async with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+
+        await asyncio.sleep(slot - now)
+
+
+# =========================
+# CHAMADA AO LLM COM RETRY
+# =========================
+
+
+def retry_delay(error, attempt, base_delay):
+    # Respeita o cabeçalho Retry-After quando o servidor informa
+    response = getattr(error, "response", None)
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+
+    # Backoff exponencial com jitter: base, 2*base, 4*base, ...
+    return base_delay * 2**attempt * (1 + random.random())
+
+
+async def generate_answer(
+    client, query, context, limiter, max_retries=5, base_delay=0.5
+):
+    # Mesmo prompt de generate_answer() em rag.py / rag-qdrant.py
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": f"Contexto:\n{context}\n\nPergunta: {query}"},
+    ]
+
+    for attempt in range(max_retries + 1):
+        # Toda tentativa (inclusive as repetidas) passa pelo limitador
+        await limiter.acquire()
+        try:
+            response = await client.chat.completions.create(
+                model=LLM_MODEL,
+                messages=messages,
+                temperature=0,
+            )
+            return response.choices[0].message.content, attempt
+        except RETRYABLE_ERRORS as error:
+            if attempt == max_retries:
+                raise
+            await asyncio.sleep(retry_delay(error, attempt, base_delay))
+
+
+# =========================
+# EXECUÇÃO EM LOTE
+# =========================
+
+
+async def run_batch(
+    questions,
+    retrieve_batch,
+    client,
+    top_k=3,
+    concurrency=8,
+    requests_per_minute=0,
+    max_retries=5,
+    embed_batch_size=64,
+):
+    # Gerador assíncrono: devolve um resultado por pergunta
+    # na ordem em que ficam prontos (não na ordem de entrada)
+    #
+    # retrieve_batch: função (perguntas, top_k) -> lista de documentos
+    # concurrency: número máximo de chamadas simultâneas ao LLM
+    # requests_per_minute: limite de requisições por minuto (0 = sem limite)
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(requests_per_minute)
+    results = asyncio.Queue()
+
+    async def answer(index, question, retrieved):
+        start = time.perf_counter()
+        result = {"index": index, "question": question, "retrieved": retrieved}
+
+        async with semaphore:
+            context = "\n".join([doc for doc, _ in retrieved])
+            try:
+                result["answer"], result["retries"] = await generate_answer(
+                    client, question, context, limiter, max_retries
+                )
+            except Exception as error:
+                # Falha definitiva: registra o erro e segue com o lote
+                result["answer"], result["error"] = None, repr(error)
+
+        result["latency"] = time.perf_counter() - start
+        await results.put(result)
+
+    tasks = []
+    delivered = 0
+    for start in range(0, len(questions), embed_batch_size):
+        batch = questions[start : start + embed_batch_size]
+
+        # Embedding + busca do lote inteiro fora do event loop (uso de CPU)
+        retrieved = await asyncio.to_thread(retrieve_batch, batch, top_k)
+
+        # Dispara as chamadas ao LLM enquanto o próximo lote é recuperado
+        for offset, (question, docs) in enumerate(zip(batch, retrieved)):
+            tasks.append(asyncio.create_task(answer(start + offset, question, docs)))
+
+        # Entrega o que já terminou sem esperar o restante do lote
+        while not results.empty():
+            yield results.get_nowait()
+            delivered += 1
+
+    # Entrega os demais conforme terminam
+    while delivered < len(tasks):
+        yield await results.get()
+        delivered += 1
+
+
+async def main(args):
+    load_dotenv()
+
+    # Carrega as perguntas (uma por linha)
+    with open(args.questions, encoding="utf-8") as f:
+        questions = [line.strip() for line in f if line.strip()]
+
+    model = SentenceTransformer("all-MiniLM-L6-v2")
+
+    if args.backend == "numpy":
+        # Base de conhecimento em arquivo (um documento por linha)
+        with open(args.documents, encoding="utf-8") as f:
+            documents = [line.strip() for line in f if line.strip()]
+        retrieve_batch = numpy_batch_retriever(model, documents)
+    else:
+        # Coleção criada por rag-qdrant.py
+        qdrant = QdrantClient(path=args.qdrant_path)
+        retrieve_batch = qdrant_batch_retriever(model, qdrant, args.collection)
+
+    # max_retries=0: as novas tentativas são controladas pelo runner
+    # GROQ_BASE_URL pode apontar para o fake_llm_server.py
+    client = AsyncGroq(api_key=os.getenv("GROQ_API_KEY"), max_retries=0)
+
+    start = time.perf_counter()
+    errors = retries = 0
+
+    with open(args.output, "w", encoding="utf-8") as out:
+        async for result in run_batch(
+            questions,
+            retrieve_batch,
+            client,
+            top_k=args.top_k,
+            concurrency=args.concurrency,
+            requests_per_minute=args.rpm,
+            max_retries=args.max_retries,
+        ):
+            # Grava cada resultado assim que fica pronto
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()
+
+            errors += "error" in result
+            retries += result.get("retries", 0)
+            print(f"[{result['index']}] {result['latency']:.2f}s {result['question']}")
+
+    elapsed = time.perf_counter() - start
+    print("-" * 80)
+    print(
+        f"{len(questions)} perguntas em {elapsed:.2f}s "
+        f"({len(questions) / elapsed:.1f} perguntas/s) | "
+        f"novas tentativas: {retries} | erros: {errors}"
+    )
+
+    await client.close()
+
+
+# =========================
+# EXECUÇÃO
+# =========================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Executa o RAG em lote (asyncio)")
+    parser.add_argument("questions", help="arquivo com uma pergunta por linha")
+    parser.add_argument("--backend", choices=["numpy", "qdrant"], default="numpy")
+    parser.add_argument("--documents", help="base de documentos (backend numpy)")
+    parser.add_argument("--qdrant-path", default="db/data")
+    parser.add_argument("--collection", default="ml_documents")
+    parser.add_argument("--output", default="batch_results.jsonl")
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rpm", type=int, default=0, help="requisições por minuto")
+    parser.add_argument("--max-retries", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.backend == "numpy" and not args.documents:
+        parser.error("--documents é obrigatório com o backend numpy")
+
+    asyncio.run(main(args))
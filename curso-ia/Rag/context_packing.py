@@ -0,0 +1,99 @@
+# =========================
+# IMPORTAÇÕES
+# =========================
+
+# Biblioteca para operações vetoriais (similaridade entre passagens)
+import numpy as np
+
+
+# =========================
+# MONTAGEM DO CONTEXTO
+# =========================
+
+
+def approx_token_count(text):
+    # Estimativa simples (~4 caracteres por token) usada quando
+    # nenhum tokenizer é informado
+    return max(1, len(text) // 4)
+
+
+def pack_context(
+    retrieve_docs,
+    embeddings,
+    token_budget,
+    count_tokens=approx_token_count,
+    lambda_mult=0.7,
+    duplicate_threshold=0.9,
+):
+    # Seleciona passagens para o prompt usando MMR (Maximal Marginal Relevance):
+    #   score = lambda * relevância - (1 - lambda) * redundância
+    # - relevância: similaridade já calculada pelo retriever
+    # - redundância: maior similaridade com uma passagem já escolhida
+    # Passagens quase idênticas (>= duplicate_threshold) são descartadas e
+    # a soma de tokens nunca passa de token_budget.
+    #
+    # retrieve_docs: lista de (texto, similaridade) vinda do retrieve()
+    # embeddings: vetores dessas passagens, na mesma ordem
+    # Retorna (passagens escolhidas, relatório com contagem de tokens)
+    report = {
+        "candidates": len(retrieve_docs),
+        "selected": 0,
+        "duplicates": 0,
+        "over_budget": 0,
+        "tokens_before": 0,
+        "tokens_after": 0,
+    }
+    if not retrieve_docs:
+        return [], report
+
+    # Normaliza os vetores: produto escalar = similaridade de cosseno
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    pairwise = vectors @ vectors.T
+
+    relevance = np.array([sim for _, sim in retrieve_docs], dtype=np.float32)
+    tokens = [count_tokens(doc) for doc, _ in retrieve_docs]
+    report["tokens_before"] = sum(tokens)
+
+    remaining = list(range(len(retrieve_docs)))
+    selected = []
+    used_tokens = 0
+
+    while remaining:
+        # Redundância de cada candidata em relação às já escolhidas
+        if selected:
+            redundancy = pairwise[np.ix_(remaining, selected)].max(axis=1)
+        else:
+            redundancy = np.zeros(len(remaining), dtype=np.float32)
+
+        scores = lambda_mult * relevance[remaining] - (1 - lambda_mult) * redundancy
+        position = int(np.argmax(scores))
+        index = remaining.pop(position)
+
+        if redundancy[position] >= duplicate_threshold:
+            # Quase duplicada de uma passagem já escolhida
+            report["duplicates"] += 1
+        elif used_tokens + tokens[index] > token_budget:
+            # Não cabe no orçamento; uma passagem menor ainda pode caber
+            report["over_budget"] += 1
+        else:
+            selected.append(index)
+            used_tokens += tokens[index]
+
+    report["selected"] = len(selected)
+    report["tokens_after"] = used_tokens
+
+    return [retrieve_docs[i] for i in selected], report
+
+
+def format_report(report):
+    # Formata o relatório de montagem do contexto para o terminal
+    text = (
+        f"Contexto: {report['selected']}/{report['candidates']} passagens | "
+        f"duplicadas: {report['duplicates']} | "
+        f"fora do orçamento: {report['over_budget']} | "
+        f"tokens do contexto: {report['tokens_before']} -> {report['tokens_after']}"
+    )
+    if report.get("prompt_tokens") is not None:
+        text += f" | tokens do prompt (LLM): {report['prompt_tokens']}"
+    return text
@@ -0,0 +1,164 @@
+# =========================
+# IMPORTAÇÕES
+# =========================
+
+# Biblioteca padrão para ler argumentos da linha de comando
+import argparse
+
+# Biblioteca padrão para ler o conjunto rotulado
+import json
+
+# Biblioteca padrão para medir latência
+import time
+
+# Biblioteca para percentis e vetores sintéticos
+import numpy as np
+
+# Cliente principal para interagir com o Qdrant
+from qdrant_client import QdrantClient
+
+# Modelo para gerar embeddings (transforma texto em vetor numérico)
+from sentence_transformers import SentenceTransformer
+
+# Os mesmos retrievers de rag.py (NumPy) e rag-qdrant.py (Qdrant)
+from retrievers import index_qdrant, numpy_retriever, qdrant_retriever
+
+
+# =========================
+# AVALIAÇÃO DOS RETRIEVERS
+# =========================
+
+# Compara precisão e latência dos dois retrievers, sem nenhuma chamada ao LLM:
+#
+#   uv run Rag/evaluation.py --top-k 3 --sizes 0,1000,10000
+#
+# O conjunto rotulado (eval_set.json) traz os documentos e, para cada
+# pergunta, os índices dos documentos relevantes.
+# --sizes acrescenta documentos sintéticos (vetores aleatórios, nunca
+# relevantes) para medir como o throughput cai com o tamanho da base.
+
+
+def synthetic_corpus(documents, doc_embeddings, extra, seed=42):
+    # Acrescenta `extra` documentos de distração com embeddings aleatórios
+    # (normalizados, mesma dimensão do modelo) sem precisar rodar o encoder
+    if not extra:
+        return documents, doc_embeddings
+
+    rng = np.random.default_rng(seed)
+    noise = rng.standard_normal((extra, doc_embeddings.shape[1])).astype(np.float32)
+    noise /= np.linalg.norm(noise, axis=1, keepdims=True)
+
+    return (
+        documents + [f"documento sintético {i}" for i in range(extra)],
+        np.vstack([doc_embeddings, noise]),
+    )
+
+
+def evaluate(retrieve, questions, documents, top_k=3):
+    # Roda cada pergunta e calcula recall@k, MRR e latência
+    position = {doc: i for i, doc in enumerate(documents)}
+
+    recalls, reciprocal_ranks, latencies = [], [], []
+
+    for item in questions:
+        relevant = set(item["relevant"])
+
+        start = time.perf_counter()
+        retrieved = retrieve(item["question"], top_k)
+        latencies.append(time.perf_counter() - start)
+
+        ranked = [position[doc] for doc, _ in retrieved]
+
+        # recall@k: fração dos relevantes que apareceram no top_k
+        recalls.append(len(relevant.intersection(ranked)) / len(relevant))
+
+        # MRR: inverso da posição do primeiro relevante (0 se não apareceu)
+        rank = next((r for r, i in enumerate(ranked, 1) if i in relevant), None)
+        reciprocal_ranks.append(1 / rank if rank else 0.0)
+
+    latencies = np.array(latencies) * 1000
+    return {
+        "recall": float(np.mean(recalls)),
+        "mrr": float(np.mean(reciprocal_ranks)),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "qps": len(questions) / (latencies.sum() / 1000),
+    }
+
+
+def format_row(backend, corpus_size, metrics):
+    # Linha da tabela de resultados
+    return (
+        f"{backend:<8} {corpus_size:>8} "
+        f"{metrics['recall']:>9.3f} {metrics['mrr']:>7.3f} "
+        f"{metrics['p50_ms']:>9.2f} {metrics['p95_ms']:>9.2f} "
+        f"{metrics['p99_ms']:>9.2f} {metrics['qps']:>9.1f}"
+    )
+
+
+def main(args):
+    with open(args.dataset, encoding="utf-8") as f:
+        dataset = json.load(f)
+
+    questions = dataset["questions"] * args.repeats
+
+    model = SentenceTransformer(args.model)
+
+    # Embeddings da base real calculados uma única vez
+    base_documents = dataset["documents"]
+    base_embeddings = np.asarray(model.encode(base_documents), dtype=np.float32)
+
+    # Qdrant local em memória, ou um servidor real via --qdrant-url
+    if args.qdrant_url:
+        qdrant = QdrantClient(url=args.qdrant_url)
+    else:
+        qdrant = QdrantClient(":memory:")
+
+    # Aquece o modelo para a primeira pergunta não distorcer a latência
+    model.encode(["aquecimento"])
+
+    print(
+        f"{'backend':<8} {'docs':>8} {f'recall@{args.top_k}':>9} {'MRR':>7} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'q/s':>9}"
+    )
+    print("-" * 76)
+
+    for extra in args.sizes:
+        documents, doc_embeddings = synthetic_corpus(
+            base_documents, base_embeddings, extra
+        )
+
+        retrievers = {"numpy": numpy_retriever(model, documents, doc_embeddings)}
+
+        index_qdrant(qdrant, documents, doc_embeddings, args.collection)
+        retrievers["qdrant"] = qdrant_retriever(model, qdrant, args.collection)
+
+        for backend, retrieve in retrievers.items():
+            metrics = evaluate(retrieve, questions, documents, args.top_k)
+            print(format_row(backend, len(documents), metrics))
+
+    qdrant.close()
+
+
+# =========================
+# EXECUÇÃO
+# =========================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Avalia os retrievers do RAG")
+    parser.add_argument("--dataset", default="Rag/eval_set.json")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: [int(size) for size in value.split(",")],
+        default=[0, 1000, 10000],
+        help="documentos sintéticos extras por rodada (ex.: 0,1000,10000)",
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--qdrant-url", default=None)
+    parser.add_argument("--collection", default="ml_documents_eval")
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,217 @@
+# =========================
+# IMPORTAÇÕES
+# =========================
+
+# Biblioteca padrão para ler argumentos da linha de comando
+import argparse
+
+# Biblioteca padrão para serializar as respostas em JSON
+import json
+
+# Biblioteca padrão para rodar o servidor em segundo plano
+import threading
+
+# Biblioteca padrão para simular a latência do modelo
+import time
+
+# Servidor HTTP da biblioteca padrão (uma thread por requisição)
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# =========================
+# SERVIDOR LLM FALSO
+# =========================
+
+# Servidor local compatível com a rota /chat/completions da API da OpenAI
+# (a mesma usada pela Groq em /openai/v1/chat/completions).
+# Serve para testar o pipeline RAG sem chamar o endpoint real da Groq:
+#
+#   python Rag/fake_llm_server.py --port 8001
+#   GROQ_BASE_URL=http://127.0.0.1:8001 GROQ_API_KEY=fake uv run Rag/rag.py
+#
+# O cliente Groq lê automaticamente a variável GROQ_BASE_URL.
+
+# Resposta padrão devolvida pelo servidor
+DEFAULT_ANSWER = (
+    "Machine learning é um campo da inteligência artificial que permite "
+    "que computadores aprendam padrões a partir de dados."
+)
+
+
+def split_tokens(text):
+    # Divide a resposta em "tokens" (palavras com o espaço seguinte),
+    # imitando os pedaços enviados pelo modelo durante o streaming
+    words = text.split(" ")
+    return [word + " " for word in words[:-1]] + [words[-1]]
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    # Configurações preenchidas por make_handler()
+    answer = DEFAULT_ANSWER
+    ttft = 0.2  # atraso (s) até o primeiro token
+    token_delay = 0.02  # atraso (s) entre tokens
+    fail_every = 0  # a cada N requisições, responde 429 (0 = nunca)
+
+    # Sem o algoritmo de Nagle cada pedaço sai na hora; com ele o primeiro
+    # token pode esperar o ACK atrasado do cliente e distorcer TTFT e tokens/s
+    disable_nagle_algorithm = True
+
+    # Contador de requisições compartilhado entre as threads do servidor
+    requests_seen = 0
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        # Silencia o log padrão de cada requisição
+        pass
+
+    def do_POST(self):
+        if not self.path.endswith("/chat/completions"):
+            self.send_error(404)
+            return
+
+        # Lê o corpo da requisição enviado pelo cliente
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+
+        # Simula o limite de requisições da API (HTTP 429)
+        with self.lock:
+            type(self).requests_seen += 1
+            count = type(self).requests_seen
+
+        if self.fail_every and count % self.fail_every == 0:
+            self.send_json(
+                {"error": {"message": "Rate limit reached", "type": "rate_limit"}},
+                status=429,
+                headers={"Retry-After": "0.1"},
+            )
+            return
+
+        model = body.get("model", "fake-llm")
+        tokens = split_tokens(self.answer)
+        usage = {
+            "prompt_tokens": sum(
+                len(m.get("content", "").split()) for m in body.get("messages", [])
+            ),
+            "completion_tokens": len(tokens),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        if body.get("stream"):
+            self.stream_response(model, tokens, usage)
+        else:
+            self.full_response(model, usage)
+
+    def full_response(self, model, usage):
+        # Simula o tempo total de geração antes de responder
+        time.sleep(self.ttft + self.token_delay * usage["completion_tokens"])
+
+        self.send_json(
+            {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": self.answer},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": usage,
+            }
+        )
+
+    def stream_response(self, model, tokens, usage):
+        # Server-Sent Events: cada pedaço vai numa linha "data: {...}"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        time.sleep(self.ttft)
+
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(self.token_delay)
+            self.send_event(self.chunk(model, {"content": token}, None))
+
+        # Último pedaço: motivo de parada + uso de tokens
+        last = self.chunk(model, {}, "stop")
+        last["usage"] = usage
+        self.send_event(last)
+
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def chunk(self, model, delta, finish_reason):
+        return {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+
+    def send_event(self, data):
+        self.wfile.write(f"data: {json.dumps(data)}\n\n".encode())
+        self.wfile.flush()
+
+    def send_json(self, data, status=200, headers=None):
+        content = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+
+def make_handler(answer=DEFAULT_ANSWER, ttft=0.2, token_delay=0.02, fail_every=0):
+    # Cria uma subclasse do handler com a configuração desejada
+    # (cada servidor tem o seu próprio contador de requisições)
+    return type(
+        "ConfiguredFakeLLMHandler",
+        (FakeLLMHandler,),
+        {
+            "answer": answer,
+            "ttft": ttft,
+            "token_delay": token_delay,
+            "fail_every": fail_every,
+            "requests_seen": 0,
+            "lock": threading.Lock(),
+        },
+    )
+
+
+def start_fake_server(host="127.0.0.1", port=0, **options):
+    # Sobe o servidor numa thread em segundo plano
+    # port=0 deixa o sistema escolher uma porta livre
+    server = ThreadingHTTPServer((host, port), make_handler(**options))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # Retorna o servidor (para server.shutdown()) e a URL base para o cliente
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+# =========================
+# EXECUÇÃO
+# =========================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor LLM falso (OpenAI/Groq)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--answer", default=DEFAULT_ANSWER)
+    parser.add_argument("--ttft", type=float, default=0.2)
+    parser.add_argument("--token-delay", type=float, default=0.02)
+    parser.add_argument("--fail-every", type=int, default=0)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(
+        (args.host, args.port),
+        make_handler(args.answer, args.ttft, args.token_delay, args.fail_every),
+    )
+    print(f"Servidor LLM falso em http://{args.host}:{args.port}")
+    server.serve_forever()
@@ -6,6 +6,9 @@
 # Aqui será usada para acessar variáveis de ambiente (API keys)
 import os
 
+# Biblioteca padrão para medir a latência da chamada ao LLM
+import time
+
 # Carrega variáveis de ambiente a partir de um arquivo .env
 # Muito usado para evitar expor chaves sensíveis no código
 from dotenv import load_dotenv
@@ -25,6 +28,15 @@ from qdrant_client import QdrantClient
 # Modelo para gerar embeddings (transforma texto em vetor numérico)
 from sentence_transformers import SentenceTransformer
 
+# Geração em streaming com métricas de latência (TTFT e tokens/s)
+from streaming import format_metrics, new_metrics, stream_completion
+
+# Cache semântico de respostas (evita chamar o LLM para perguntas parecidas)
+from semantic_cache import SemanticCache, context_key, format_stats
+
+# Montagem do contexto com orçamento de tokens e remoção de redundância (MMR)
+from context_packing import format_report, pack_context
+
 
 # =========================
 # CONFIGURAÇÃO INICIAL
@@ -72,9 +84,21 @@ model = SentenceTransformer("all-MiniLM-L6-v2")
 
 # Inicializa cliente da Groq usando a chave do ambiente
 # Permite fazer chamadas para o modelo LLM
+# Para testes locais, GROQ_BASE_URL pode apontar para o fake_llm_server.py
 client = Groq(api_key=os.getenv("GROQ_API_KEY"))
 
 
+# =========================
+# CACHE SEMÂNTICO
+# =========================
+
+# Guarda respostas do LLM indexadas pelo embedding da pergunta
+# - threshold: similaridade mínima entre perguntas para reaproveitar a resposta
+# - ttl_seconds: tempo de vida de cada resposta
+# - max_entries: limite de tamanho (remove as menos usadas)
+cache = SemanticCache(threshold=0.9, ttl_seconds=3600, max_entries=1000)
+
+
 # =========================
 # CONFIGURAÇÃO DO QDRANT (BANCO VETORIAL)
 # =========================
@@ -104,10 +128,15 @@ qdrant.create_collection(
 # Lista que armazenará os vetores no formato aceito pelo Qdrant
 points = []
 
+# Guarda o embedding de cada documento para reaproveitar
+# na montagem do contexto (sem recalcular nem buscar no Qdrant)
+doc_vectors = {}
+
 # Percorre todos os documentos
 for idx, doc in enumerate(documents):
     # Gera embedding do documento
     embedding = model.encode(doc).tolist()
+    doc_vectors[doc] = embedding
 
     # Cria estrutura do ponto vetorial
     # id -> identificador único
@@ -127,9 +156,12 @@ qdrant.upsert(collection_name="ml_documents", points=points, wait=True)
 # =========================
 
 
-def retrieve(query, top_k=3):
+def retrieve(query, top_k=3, query_embedding=None):
     # Converte a pergunta do usuário em embedding
-    query_embedding = model.encode(query).tolist()
+    # (ou reaproveita um embedding já calculado)
+    if query_embedding is None:
+        query_embedding = model.encode(query)
+    query_embedding = query_embedding.tolist()
 
     # Consulta o Qdrant buscando os vetores mais similares
     seach_result = qdrant.query_points(
@@ -144,14 +176,46 @@ def retrieve(query, top_k=3):
     return [(hit.payload["text"], hit.score) for hit in seach_result.points]
 
 
+# =========================
+# MONTAGEM DO CONTEXTO
+# =========================
+
+# Orçamento máximo de tokens para o contexto enviado ao LLM
+CONTEXT_TOKEN_BUDGET = 256
+
+
+def count_tokens(text):
+    # Conta tokens com o tokenizer do modelo de embedding
+    # (aproximação da contagem do LLM, suficiente para o orçamento)
+    return len(model.tokenizer.encode(text, add_special_tokens=False))
+
+
+def build_context(retrieve_docs, report=None):
+    # Reaproveita os embeddings calculados na indexação
+    embeddings = [doc_vectors[doc] for doc, _ in retrieve_docs]
+
+    # Seleciona passagens por MMR: relevantes, sem quase-duplicatas
+    # e cabendo no orçamento de tokens
+    packed, packing_report = pack_context(
+        retrieve_docs, embeddings, CONTEXT_TOKEN_BUDGET, count_tokens
+    )
+
+    # report (opcional) recebe a contagem de tokens antes/depois
+    if report is not None:
+        report.update(packing_report)
+
+    # Concatena as passagens escolhidas formando o contexto
+    return "\n".join([doc for doc, _ in packed])
+
+
 # =========================
 # GERADOR (LLM)
 # =========================
 
 
-def generate_answer(query, retrieve_docs):
-    # Concatena os documentos recuperados formando o contexto
-    context = "\n".join([doc for doc, _ in retrieve_docs])
+def generate_answer(query, retrieve_docs, report=None):
+    # Monta o contexto sem redundância e dentro do orçamento de tokens
+    context = build_context(retrieve_docs, report)
 
     # Faz chamada ao modelo LLM da Groq
     response = client.chat.completions.create(
@@ -172,6 +236,10 @@ def generate_answer(query, retrieve_docs):
         temperature=0,  # reduz criatividade → resposta mais factual
     )
 
+    # Registra quantos tokens o prompt realmente consumiu no LLM
+    if report is not None and response.usage is not None:
+        report["prompt_tokens"] = response.usage.prompt_tokens
+
     # Retorna apenas o texto da resposta gerada
     return response.choices[0].message.content
 
@@ -182,16 +250,69 @@ def generate_answer(query, retrieve_docs):
 
 
 def rag(query, top_k=3):
+    # Embedding da pergunta calculado uma vez (recuperação + cache)
+    query_embedding = model.encode(query)
+
     # 1️⃣ Recupera documentos relevantes no banco vetorial
-    retrieved = retrieve(query, top_k)
+    retrieved = retrieve(query, top_k, query_embedding=query_embedding)
 
-    # 2️⃣ Envia os documentos como contexto para o LLM
-    answer = generate_answer(query, retrieved)
+    # 2️⃣ Consulta o cache semântico antes de chamar o LLM
+    context = context_key(retrieved)
+    answer = cache.get(query_embedding, context)
+
+    # 3️⃣ Em caso de falta, envia os documentos como contexto para o LLM
+    if answer is None:
+        start = time.perf_counter()
+        answer = generate_answer(query, retrieved)
+        cache.put(query_embedding, context, answer, time.perf_counter() - start)
 
     # Retorna resposta + documentos utilizados
     return answer, retrieved
 
 
+# =========================
+# PIPELINE RAG EM STREAMING
+# =========================
+
+
+def generate_answer_stream(query, retrieve_docs, metrics, report=None):
+    # Monta o contexto sem redundância e dentro do orçamento de tokens
+    context = build_context(retrieve_docs, report)
+
+    # Devolve um gerador: cada item é um pedaço da resposta
+    # metrics recebe TTFT, tempo total e tokens/s ao final
+    return stream_completion(
+        client,
+        [
+            {
+                "role": "system",
+                "content": (
+                    "Você é um especialista em machine learning. "
+                    "Use apenas o contexto fornecido para responder as perguntas."
+                ),
+            },
+            {
+                "role": "user",
+                "content": f"Contexto:\n{context}\n\nPergunta: {query}",
+            },
+        ],
+        metrics,
+        model="llama-3.1-8b-instant",
+    )
+
+
+def rag_stream(query, top_k=3):
+    # 1️⃣ Recupera documentos relevantes no banco vetorial
+    retrieved = retrieve(query, top_k)
+
+    # 2️⃣ Gera a resposta aos poucos (tokens chegam conforme o LLM produz)
+    metrics = new_metrics()
+    tokens = generate_answer_stream(query, retrieved, metrics)
+
+    # Retorna gerador de tokens + documentos + métricas
+    return tokens, retrieved, metrics
+
+
 # =========================
 # EXECUÇÃO
 # =========================
@@ -206,3 +327,33 @@ print("Resposta:", answer)
 print("Documentos recuperados:")
 for doc, sim in docs:
     print(f"Documento: {doc}, Similaridade: {sim}")
+
+# Recupera mais candidatos e deixa a montagem do contexto escolher
+# as passagens mais úteis dentro do orçamento de tokens
+report = {}
+answer = generate_answer(
+    "O que é machine learning?", retrieve("O que é machine learning?", top_k=8), report
+)
+print("Resposta (contexto compactado):", answer)
+
+# Mostra tokens do contexto antes/depois e tokens do prompt no LLM
+print(format_report(report))
+
+# Uma paráfrase da mesma pergunta é respondida pelo cache semântico
+answer, docs = rag("O que é o machine learning?")
+print("Resposta (paráfrase):", answer)
+
+# Mostra taxa de acerto do cache e latência economizada
+print(format_stats(cache.stats()))
+
+# Executa a mesma pergunta em streaming
+tokens, docs, metrics = rag_stream("O que é machine learning?")
+
+# Mostra cada token assim que chega do LLM
+print("Resposta (streaming): ", end="", flush=True)
+for token in tokens:
+    print(token, end="", flush=True)
+print()
+
+# Mostra tempo até o primeiro token e velocidade de geração
+print(format_metrics(metrics))
@@ -1,6 +1,9 @@
 # Biblioteca padrão para acessar variáveis de ambiente
 import os
 
+# Biblioteca padrão para medir a latência da chamada ao LLM
+import time
+
 # Biblioteca para operações matemáticas (vetores, norma, produto escalar)
 import numpy as np
 
@@ -13,6 +16,15 @@ from groq import Groq
 # Modelo para gerar embeddings (vetores numéricos de texto)
 from sentence_transformers import SentenceTransformer
 
+# Geração em streaming com métricas de latência (TTFT e tokens/s)
+from streaming import format_metrics, new_metrics, stream_completion
+
+# Cache semântico de respostas (evita chamar o LLM para perguntas parecidas)
+from semantic_cache import SemanticCache, context_key, format_stats
+
+# Montagem do contexto com orçamento de tokens e remoção de redundância (MMR)
+from context_packing import format_report, pack_context
+
 
 # Carrega as variáveis definidas no arquivo .env
 # Exemplo: GROQ_API_KEY=sua_chave
@@ -42,12 +54,25 @@ model = SentenceTransformer("all-MiniLM-L6-v2")
 
 # Inicializa o cliente da Groq usando a API KEY
 # A chave deve estar definida na variável de ambiente GROQ_API_KEY
+# Para testes locais, GROQ_BASE_URL pode apontar para o fake_llm_server.py
 client = Groq(api_key=os.getenv("GROQ_API_KEY"))
 
 # Gera embeddings para todos os documentos da base
 # Isso é feito uma única vez (pré-processamento)
 doc_embeddings = model.encode(documents)
 
+# Cache semântico na frente da chamada à Groq
+# - threshold: similaridade mínima entre perguntas para reaproveitar a resposta
+# - ttl_seconds: tempo de vida de cada resposta
+# - max_entries: limite de tamanho (remove as menos usadas)
+cache = SemanticCache(threshold=0.9, ttl_seconds=3600, max_entries=1000)
+
+# Embedding de cada documento, para reaproveitar na montagem do contexto
+doc_vectors = dict(zip(documents, doc_embeddings))
+
+# Orçamento máximo de tokens para o contexto enviado ao LLM
+CONTEXT_TOKEN_BUDGET = 256
+
 
 # Função para calcular similaridade de cosseno entre dois vetores
 # Mede o quão parecidos dois textos são semanticamente
@@ -57,10 +82,12 @@ def cosine_similarity(a, b):
 
 # Função de recuperação (Retriever)
 # Recebe uma pergunta e retorna os top_k documentos mais similares
-def retrieve(query, top_k=3):
+# query_embedding permite reaproveitar um embedding já calculado
+def retrieve(query, top_k=3, query_embedding=None):
     
     # Converte a pergunta em embedding
-    query_embedding = model.encode([query])[0]
+    if query_embedding is None:
+        query_embedding = model.encode([query])[0]
 
     similarities = []
 
@@ -76,11 +103,36 @@ def retrieve(query, top_k=3):
     return [(documents[i], sim) for i, sim in similarities[:top_k]]
 
 
+# Conta tokens com o tokenizer do modelo de embedding
+# (aproximação da contagem do LLM, suficiente para respeitar o orçamento)
+def count_tokens(text):
+    return len(model.tokenizer.encode(text, add_special_tokens=False))
+
+
+# Monta o contexto do prompt
+# Remove passagens quase duplicadas e respeita o orçamento de tokens
+# report (opcional) recebe a contagem de tokens antes/depois
+def build_context(retrieve_docs, report=None):
+
+    # Usa os embeddings já calculados para os documentos
+    embeddings = [doc_vectors[doc] for doc, _ in retrieve_docs]
+
+    packed, packing_report = pack_context(
+        retrieve_docs, embeddings, CONTEXT_TOKEN_BUDGET, count_tokens
+    )
+
+    if report is not None:
+        report.update(packing_report)
+
+    # Junta as passagens escolhidas em um único contexto
+    return "\n".join([doc for doc, _ in packed])
+
+
 # Função responsável por gerar a resposta usando o LLM
-def generate_answer(query, retrieve_docs):
+def generate_answer(query, retrieve_docs, report=None):
 
-    # Junta os documentos recuperados em um único contexto
-    context = "\n".join([doc for doc, _ in retrieve_docs])
+    # Monta o contexto com os documentos recuperados
+    context = build_context(retrieve_docs, report)
 
     # Faz chamada ao modelo da Groq (LLM)
     response = client.chat.completions.create(
@@ -98,6 +150,10 @@ def generate_answer(query, retrieve_docs):
         temperature=0,  # Determinístico (menos criativo, mais preciso)
     )
 
+    # Registra quantos tokens o prompt realmente consumiu no LLM
+    if report is not None and response.usage is not None:
+        report["prompt_tokens"] = response.usage.prompt_tokens
+
     # Retorna apenas o texto da resposta
     return response.choices[0].message.content
 
@@ -106,15 +162,64 @@ def generate_answer(query, retrieve_docs):
 # Orquestra recuperação + geração
 def rag(query, top_k=3):
 
+    # Converte a pergunta em embedding uma única vez
+    # (usado tanto na recuperação quanto no cache)
+    query_embedding = model.encode([query])[0]
+
     # Recupera documentos relevantes
-    retrieved = retrieve(query, top_k)
+    retrieved = retrieve(query, top_k, query_embedding=query_embedding)
 
-    # Gera resposta com base nesses documentos
-    answer = generate_answer(query, retrieved)
+    # Consulta o cache: pergunta parecida + mesmo contexto = mesma resposta
+    context = context_key(retrieved)
+    answer = cache.get(query_embedding, context)
+
+    if answer is None:
+        # Gera resposta com base nesses documentos
+        start = time.perf_counter()
+        answer = generate_answer(query, retrieved)
+        cache.put(query_embedding, context, answer, time.perf_counter() - start)
 
     return answer, retrieved
 
 
+# Versão em streaming do gerador
+# Devolve os tokens conforme chegam, preenchendo metrics durante a iteração
+def generate_answer_stream(query, retrieve_docs, metrics, report=None):
+
+    # Monta o contexto com os documentos recuperados
+    context = build_context(retrieve_docs, report)
+
+    return stream_completion(
+        client,
+        [
+            {
+                "role": "system",
+                "content": "Você é um especialista em machine learning. Use apenas o contexto fornecido para responder as perguntas.",
+            },
+            {
+                "role": "user",
+                "content": f"Contexto:\n{context}\n\nPergunta: {query}",
+            },
+        ],
+        metrics,
+        model="llama-3.1-8b-instant",
+    )
+
+
+# Versão em streaming do RAG
+# Retorna (gerador de tokens, documentos recuperados, métricas)
+def rag_stream(query, top_k=3):
+
+    # Recupera documentos relevantes
+    retrieved = retrieve(query, top_k)
+
+    # As métricas ficam completas quando o gerador termina
+    metrics = new_metrics()
+    tokens = generate_answer_stream(query, retrieved, metrics)
+
+    return tokens, retrieved, metrics
+
+
 # Executa o pipeline RAG com uma pergunta de exemplo
 answer, docs = rag("O que é machine learning?")
 
@@ -125,3 +230,26 @@ print("Resposta:", answer)
 print("Documentos recuperados:")
 for doc, sim in docs:
     print(f"Documento: {doc}, Similaridade: {sim}")
+
+# Recupera mais candidatos e deixa a montagem do contexto escolher
+# as passagens mais úteis dentro do orçamento de tokens
+report = {}
+answer = generate_answer("O que é machine learning?", retrieve("O que é machine learning?", top_k=8), report)
+print("Resposta (contexto compactado):", answer)
+print(format_report(report))
+
+# Uma paráfrase da mesma pergunta é respondida pelo cache semântico
+answer, docs = rag("O que é o machine learning?")
+print("Resposta (paráfrase):", answer)
+print(format_stats(cache.stats()))
+
+# Executa a mesma pergunta em streaming, exibindo os tokens conforme chegam
+tokens, docs, metrics = rag_stream("O que é machine learning?")
+
+print("Resposta (streaming): ", end="", flush=True)
+for token in tokens:
+    print(token, end="", flush=True)
+print()
+
+# Exibe as métricas de latência da geração
+print(format_metrics(metrics))
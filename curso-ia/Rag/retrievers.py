@@ -0,0 +1,141 @@
+# =========================
+# IMPORTAÇÕES
+# =========================
+
+# Biblioteca para operações vetoriais (similaridade em lote)
+import numpy as np
+
+# Modelos de requisição do Qdrant (consultas em lote)
+from qdrant_client import models
+
+
+# =========================
+# RECUPERAÇÃO EM LOTE
+# =========================
+
+# Versões em lote dos retrievers de rag.py e rag-qdrant.py
+# Recebem uma lista de perguntas e devolvem, para cada uma,
+# a lista de (texto_documento, similaridade) — o mesmo formato de retrieve()
+
+
+def numpy_batch_retriever(model, documents, doc_embeddings=None):
+    # Retriever em memória (NumPy), como em rag.py
+    if doc_embeddings is None:
+        doc_embeddings = model.encode(documents)
+
+    # Normaliza uma única vez: produto escalar = similaridade de cosseno
+    doc_matrix = np.asarray(doc_embeddings, dtype=np.float32)
+    doc_matrix = doc_matrix / np.linalg.norm(doc_matrix, axis=1, keepdims=True)
+
+    def retrieve_batch(queries, top_k=3):
+        # Um único encode para todas as perguntas do lote
+        query_matrix = np.asarray(model.encode(queries), dtype=np.float32)
+        query_matrix = query_matrix / np.linalg.norm(
+            query_matrix, axis=1, keepdims=True
+        )
+
+        # Similaridade de todas as perguntas com todos os documentos
+        similarities = query_matrix @ doc_matrix.T
+
+        results = []
+        for row in similarities:
+            top = np.argsort(-row)[:top_k]
+            results.append([(documents[i], float(row[i])) for i in top])
+        return results
+
+    return retrieve_batch
+
+
+def qdrant_batch_retriever(model, qdrant, collection_name="ml_documents"):
+    # Retriever no Qdrant, como em rag-qdrant.py
+    def retrieve_batch(queries, top_k=3):
+        # Um único encode para todas as perguntas do lote
+        query_embeddings = model.encode(queries)
+
+        # Uma única chamada ao Qdrant com todas as consultas
+        responses = qdrant.query_batch_points(
+            collection_name=collection_name,
+            requests=[
+                models.QueryRequest(
+                    query=embedding.tolist(), limit=top_k, with_payload=True
+                )
+                for embedding in query_embeddings
+            ],
+        )
+
+        return [
+            [(hit.payload["text"], hit.score) for hit in response.points]
+            for response in responses
+        ]
+
+    return retrieve_batch
+
+
+# =========================
+# RECUPERAÇÃO POR PERGUNTA
+# =========================
+
+# Mesmos algoritmos de retrieve() em rag.py e rag-qdrant.py,
+# parametrizados para que possam ser avaliados lado a lado
+
+
+def numpy_retriever(model, documents, doc_embeddings):
+    # Retriever de rag.py: laço com similaridade de cosseno por documento
+    def retrieve(query, top_k=3):
+        query_embedding = model.encode([query])[0]
+
+        similarities = []
+        for i, doc_emb in enumerate(doc_embeddings):
+            sim = np.dot(query_embedding, doc_emb) / (
+                np.linalg.norm(query_embedding) * np.linalg.norm(doc_emb)
+            )
+            similarities.append((i, sim))
+
+        similarities.sort(key=lambda x: x[1], reverse=True)
+        return [(documents[i], sim) for i, sim in similarities[:top_k]]
+
+    return retrieve
+
+
+def index_qdrant(qdrant, documents, doc_embeddings, collection_name, batch_size=256):
+    # Recria a coleção e indexa os documentos com embeddings já calculados
+    if qdrant.collection_exists(collection_name):
+        qdrant.delete_collection(collection_name)
+
+    qdrant.create_collection(
+        collection_name=collection_name,
+        vectors_config=models.VectorParams(
+            size=len(doc_embeddings[0]), distance=models.Distance.COSINE
+        ),
+    )
+
+    for start in range(0, len(documents), batch_size):
+        qdrant.upsert(
+            collection_name=collection_name,
+            points=[
+                models.PointStruct(
+                    id=idx,
+                    vector=list(map(float, doc_embeddings[idx])),
+                    payload={"text": documents[idx]},
+                )
+                for idx in range(start, min(start + batch_size, len(documents)))
+            ],
+            wait=True,
+        )
+
+
+def qdrant_retriever(model, qdrant, collection_name="ml_documents"):
+    # Retriever de rag-qdrant.py: busca vetorial no Qdrant
+    def retrieve(query, top_k=3):
+        query_embedding = model.encode(query).tolist()
+
+        search_result = qdrant.query_points(
+            collection_name=collection_name,
+            query=query_embedding,
+            limit=top_k,
+            with_payload=True,
+        )
+
+        return [(hit.payload["text"], hit.score) for hit in search_result.points]
+
+    return retrieve
@@ -0,0 +1,136 @@
+# =========================
+# IMPORTAÇÕES
+# =========================
+
+# Biblioteca padrão para gerar a chave do conjunto de contexto
+import hashlib
+
+# Biblioteca padrão para proteger o cache quando usado por várias threads
+import threading
+
+# Biblioteca padrão para controlar expiração (TTL) e latência
+import time
+
+# Dicionário ordenado: permite remover a entrada usada há mais tempo (LRU)
+from collections import OrderedDict
+
+# Biblioteca para operações vetoriais (similaridade de cosseno em lote)
+import numpy as np
+
+
+# =========================
+# CACHE SEMÂNTICO DE RESPOSTAS
+# =========================
+
+
+def context_key(retrieve_docs):
+    # Identifica o conjunto de documentos recuperados
+    # A ordem não importa: o mesmo conjunto gera a mesma chave
+    digest = hashlib.sha256()
+    for doc in sorted(doc for doc, _ in retrieve_docs):
+        digest.update(doc.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class SemanticCache:
+    # Guarda respostas do LLM indexadas pelo embedding da pergunta
+    # Uma pergunta parecida (similaridade >= threshold) com o mesmo
+    # conjunto de contexto reaproveita a resposta sem chamar o LLM
+
+    def __init__(self, threshold=0.9, ttl_seconds=3600, max_entries=1000):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        # chave -> (embedding normalizado, contexto, resposta, latência, criado_em)
+        self._entries = OrderedDict()
+        self._next_key = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.latency_saved = 0.0
+
+    def _normalize(self, embedding):
+        embedding = np.asarray(embedding, dtype=np.float32)
+        return embedding / np.linalg.norm(embedding)
+
+    def _expire(self, now):
+        # Remove entradas cujo TTL já venceu
+        expired = [
+            key
+            for key, (*_, created_at) in self._entries.items()
+            if now - created_at > self.ttl_seconds
+        ]
+        for key in expired:
+            del self._entries[key]
+
+    def get(self, query_embedding, context):
+        # Procura uma pergunta anterior parecida com o mesmo contexto
+        query = self._normalize(query_embedding)
+
+        with self._lock:
+            self._expire(time.monotonic())
+
+            candidates = [
+                (key, entry)
+                for key, entry in self._entries.items()
+                if entry[1] == context
+            ]
+
+            if candidates:
+                # Similaridade de cosseno com todas as candidatas de uma vez
+                matrix = np.stack([entry[0] for _, entry in candidates])
+                similarities = matrix @ query
+                best = int(np.argmax(similarities))
+
+                if similarities[best] >= self.threshold:
+                    key, (_, _, answer, latency, _) = candidates[best]
+
+                    # Marca como usada recentemente (política LRU)
+                    self._entries.move_to_end(key)
+
+                    self.hits += 1
+                    self.latency_saved += latency
+                    return answer
+
+            self.misses += 1
+            return None
+
+    def put(self, query_embedding, context, answer, latency):
+        # Armazena a resposta e o tempo que o LLM levou para gerá-la
+        with self._lock:
+            self._entries[self._next_key] = (
+                self._normalize(query_embedding),
+                context,
+                answer,
+                latency,
+                time.monotonic(),
+            )
+            self._next_key += 1
+
+            # Limite de tamanho: descarta as entradas menos usadas
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        # Taxa de acerto e latência economizada (segundos de LLM evitados)
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "latency_saved": self.latency_saved,
+            "entries": len(self._entries),
+        }
+
+
+def format_stats(stats):
+    # Formata as estatísticas do cache para exibição no terminal
+    return (
+        f"Cache: {stats['hits']} acertos / {stats['misses']} faltas "
+        f"(taxa {stats['hit_rate']:.0%}) | "
+        f"Latência economizada: {stats['latency_saved']:.3f}s | "
+        f"Entradas: {stats['entries']}"
+    )
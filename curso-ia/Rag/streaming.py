@@ -0,0 +1,84 @@
+# =========================
+# IMPORTAÇÕES
+# =========================
+
+# Biblioteca padrão para medir o tempo com alta precisão
+import time
+
+
+# =========================
+# GERAÇÃO EM STREAMING
+# =========================
+
+
+def new_metrics():
+    # Métricas preenchidas durante o streaming de uma requisição
+    return {
+        "time_to_first_token": None,  # segundos até o primeiro token
+        "total_time": None,  # segundos até o fim da geração
+        "tokens": 0,  # tokens gerados
+        "tokens_per_second": None,  # tokens após o 1º / tempo após o 1º token
+    }
+
+
+def stream_completion(
+    client, messages, metrics, model="llama-3.1-8b-instant", temperature=0
+):
+    # Gerador que devolve os pedaços de texto assim que chegam do LLM
+    # O dicionário metrics é preenchido ao longo da iteração
+    start = time.perf_counter()
+
+    # stream=True faz o servidor enviar a resposta aos poucos (SSE)
+    stream = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        stream=True,
+    )
+
+    usage = None
+    for chunk in stream:
+        # O último pedaço pode trazer o uso de tokens
+        # (OpenAI em "usage", Groq em "x_groq.usage")
+        x_groq = getattr(chunk, "x_groq", None)
+        usage = getattr(chunk, "usage", None) or getattr(x_groq, "usage", None) or usage
+
+        if not chunk.choices:
+            continue
+
+        token = chunk.choices[0].delta.content
+        if not token:
+            continue
+
+        # Marca o tempo até o primeiro token (TTFT)
+        if metrics["time_to_first_token"] is None:
+            metrics["time_to_first_token"] = time.perf_counter() - start
+
+        metrics["tokens"] += 1
+        yield token
+
+    metrics["total_time"] = time.perf_counter() - start
+
+    # Prefere a contagem oficial do servidor à contagem de pedaços
+    if usage is not None and getattr(usage, "completion_tokens", None):
+        metrics["tokens"] = usage.completion_tokens
+
+    # Tokens por segundo medidos na fase de geração (após o primeiro token).
+    # O primeiro token já foi pago pelo TTFT: fica fora do numerador
+    if metrics["time_to_first_token"] is not None:
+        generation_time = metrics["total_time"] - metrics["time_to_first_token"]
+        if generation_time > 0 and metrics["tokens"] > 1:
+            metrics["tokens_per_second"] = (metrics["tokens"] - 1) / generation_time
+
+
+def format_metrics(metrics):
+    # Formata as métricas para exibição no terminal
+    def fmt(value, pattern):
+        return "N/A" if value is None else pattern.format(value)
+
+    return (
+        f"TTFT: {fmt(metrics['time_to_first_token'], '{:.3f}s')} | "
+        f"Tempo total: {fmt(metrics['total_time'], '{:.3f}s')} | "
+        f"Tokens: {metrics['tokens']} | "
+        f"Tokens/s: {fmt(metrics['tokens_per_second'], '{:.1f}')}"
+    )
@@ -0,0 +1,56 @@
+import sys
+import unittest
+from pathlib import Path
+
+from groq import AsyncGroq
+
+# run_batch contra o servidor LLM falso respondendo 429 a cada N
+# requisições, com um retriever falso (sem modelo de embedding):
+#
+#   cd Rag && python -m unittest discover -s tests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from batch_runner import run_batch
+from fake_llm_server import DEFAULT_ANSWER, start_fake_server
+
+QUESTIONS = [f"Pergunta {i}?" for i in range(12)]
+FAIL_EVERY = 4
+
+
+def retrieve_batch(questions, top_k):
+    return [[(f"documento sobre {question}", 1.0)] * top_k for question in questions]
+
+
+class RunBatchTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        server, base_url = start_fake_server(
+            ttft=0.02, token_delay=0.001, fail_every=FAIL_EVERY
+        )
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.client = AsyncGroq(api_key="fake", base_url=base_url, max_retries=0)
+        self.addAsyncCleanup(self.client.close)
+
+    async def test_retries_and_completion_order(self):
+        results = [
+            result
+            async for result in run_batch(QUESTIONS, retrieve_batch, self.client, concurrency=4)
+        ]
+
+        # Todos os resultados chegam, sem erro, apesar dos 429
+        self.assertEqual(sorted(r["index"] for r in results), list(range(len(QUESTIONS))))
+        self.assertTrue(all("error" not in r for r in results))
+        self.assertTrue(all(r["answer"] == DEFAULT_ANSWER for r in results))
+        self.assertGreater(sum(r["retries"] for r in results), 0)
+
+        # Ordem de conclusão, não de entrada: a primeira pergunta que levou
+        # 429 espera o Retry-After (0,1s) enquanto perguntas seguintes, que
+        # respondem em ~25ms, terminam e são entregues antes dela
+        order = [r["index"] for r in results]
+        first_retried = next(i for i, r in enumerate(results) if r["retries"])
+        self.assertGreater(max(order[:first_retried], default=-1), order[first_retried])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import sys
+import unittest
+from pathlib import Path
+
+from groq import Groq
+
+# Métricas do streaming contra o servidor LLM falso (sem rede):
+#
+#   cd Rag && python -m unittest discover -s tests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fake_llm_server import split_tokens, start_fake_server
+from streaming import new_metrics, stream_completion
+
+# Resposta curta: contar o primeiro token sem o seu tempo inflaria os
+# tokens/s em 3/2, bem acima da folga de 25% para o jitter do relógio
+ANSWER = "um dois três"
+TTFT = 0.2
+TOKEN_DELAY = 0.1
+
+
+class StreamCompletionTest(unittest.TestCase):
+    def setUp(self):
+        server, base_url = start_fake_server(answer=ANSWER, ttft=TTFT, token_delay=TOKEN_DELAY)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.client = Groq(api_key="fake", base_url=base_url)
+
+    def test_metrics(self):
+        metrics = new_metrics()
+        messages = [{"role": "user", "content": "O que é machine learning?"}]
+        text = "".join(stream_completion(self.client, messages, metrics))
+
+        self.assertEqual(text, ANSWER)
+        # O servidor só manda o primeiro token depois de TTFT
+        self.assertGreaterEqual(metrics["time_to_first_token"], TTFT)
+        self.assertGreaterEqual(metrics["total_time"], metrics["time_to_first_token"])
+        # Contagem igual a usage.completion_tokens enviado pelo servidor
+        self.assertEqual(metrics["tokens"], len(split_tokens(ANSWER)))
+        # Cada token após o primeiro leva TOKEN_DELAY
+        self.assertAlmostEqual(
+            metrics["tokens_per_second"], 1 / TOKEN_DELAY, delta=0.25 / TOKEN_DELAY
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
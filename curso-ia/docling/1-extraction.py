@@ -7,6 +7,10 @@ from pathlib import Path
 # para um formato estruturado manipulável em Python
 from docling.document_converter import DocumentConverter
 
+# Cache de conversão local: reaproveita o documento já convertido
+# (chave = hash do conteúdo do PDF + opções do pipeline)
+from conversion_cache import convert_cached
+
 # Cria uma instância do conversor
 # A partir dela poderemos chamar o método convert()
 converter = DocumentConverter()
@@ -22,7 +26,7 @@ converter = DocumentConverter()
 # pdf_path = Path(__file__).parent / "2408.09869v5.pdf"
 
 # Converte o PDF local para o formato interno do Docling
-# result = converter.convert(pdf_path)
+# document = convert_cached(converter, pdf_path)
 
 
 # ================================
@@ -31,11 +35,9 @@ converter = DocumentConverter()
 
 # Converte diretamente o PDF disponível na internet (arXiv)
 # O Docling baixa o arquivo e faz a conversão automaticamente
-result = converter.convert("https://arxiv.org/pdf/2408.09869")
-
-# O objeto result contém várias informações da conversão
-# Aqui acessamos o documento estruturado convertido
-document = result.document
+# convert_cached guarda o documento convertido: nas próximas execuções
+# ele é recarregado do cache local (para URLs a chave é o endereço)
+document = convert_cached(converter, "https://arxiv.org/pdf/2408.09869")
 
 # Exporta o conteúdo do documento convertido para o formato Markdown
 # Isso transforma o PDF em texto estruturado com marcações (títulos, listas, etc.)
@@ -1,6 +1,5 @@
-# Biblioteca padrão para interagir com o sistema operacional
-# Aqui será usada para criar diretórios
-import os
+# Biblioteca padrão para medir o tempo da exportação
+import time
 
 # Classe para manipulação de caminhos de arquivos de forma segura
 from pathlib import Path
@@ -16,8 +15,38 @@ from docling.datamodel.pipeline_options import PdfPipelineOptions
 # PdfFormatOption permite configurar opções específicas para PDF
 from docling.document_converter import DocumentConverter, PdfFormatOption
 
-# Classe que representa imagens encontradas dentro do documento
-from docling_core.types.doc import PictureItem
+# Cache de conversão local: reaproveita o documento já convertido
+# (chave = hash do conteúdo do PDF + opções do pipeline)
+from conversion_cache import convert_cached
+
+# Exportação paralela e sem duplicatas das imagens do documento
+from image_export import export_pictures
+
+# ================================
+# CONFIGURAÇÕES
+# ================================
+
+# Escala de renderização das imagens
+# 2.0 significa o dobro da resolução padrão
+IMAGES_SCALE = 2.0
+
+# Formato de saída: "PNG", "WEBP" ou "JPEG"
+IMAGE_FORMAT = "PNG"
+
+# Nível de compressão do PNG: 0 (rápido, arquivo maior) a 9 (lento, arquivo menor)
+COMPRESS_LEVEL = 6
+
+# Qualidade do WEBP/JPEG: 0 a 100
+QUALITY = 85
+
+# Remoção de duplicatas (logos e ícones repetidos):
+# "content" = pixels idênticos | "perceptual" = visualmente iguais | None = desligado
+# "perceptual" pode juntar figuras diferentes com o mesmo layout (ex.: dois
+# gráficos parecidos); use só quando as repetições forem logos/ícones
+DEDUP = "content"
+
+# Número de threads que codificam e gravam as imagens
+EXPORT_WORKERS = 4
 
 # ================================
 # CONFIGURAÇÃO DO PIPELINE PDF
@@ -27,8 +56,7 @@ from docling_core.types.doc import PictureItem
 pipeline_options = PdfPipelineOptions()
 
 # Define a escala das imagens extraídas
-# 2.0 significa que as imagens serão renderizadas com o dobro da resolução padrão
-pipeline_options.images_scale = 2.0
+pipeline_options.images_scale = IMAGES_SCALE
 
 # Habilita a geração de imagens para elementos gráficos encontrados no PDF
 pipeline_options.generate_picture_images = True
@@ -56,41 +84,38 @@ converter = DocumentConverter(
 pdf_path = Path(__file__).parent / "2408.09869v5.pdf"
 
 # Executa a conversão do PDF
-result = converter.convert(pdf_path)
-
-
-# ================================
-# CRIAÇÃO DA PASTA PARA IMAGENS
-# ================================
-
-# Cria a pasta "images" se ela não existir
-# exist_ok=True evita erro caso a pasta já exista
-os.makedirs("images", exist_ok=True)
+# O documento (com as imagens embutidas) fica no cache local,
+# então as próximas execuções não rodam os modelos de novo
+document = convert_cached(converter, pdf_path)
 
 
 # ================================
 # EXTRAÇÃO DAS IMAGENS DO DOCUMENTO
 # ================================
 
-# Contador para numerar as imagens extraídas
-picture_counter = 0
-
-# Itera sobre todos os elementos estruturados do documento
-# iterate_items() percorre títulos, parágrafos, tabelas, imagens, etc.
-for element, _level in result.document.iterate_items():
-    # Verifica se o elemento atual é uma imagem (PictureItem)
-    if isinstance(element, PictureItem):
-        # Incrementa o contador de imagens
-        picture_counter += 1
-
-        # Define o caminho do arquivo onde a imagem será salva
-        image_path = Path("images") / f"picture_{picture_counter}.png"
+start = time.perf_counter()
+
+# Percorre as imagens (PictureItem) na ordem do documento,
+# codifica e grava cada uma numa thread do pool
+# Imagens repetidas são gravadas uma única vez; o manifesto
+# (images/manifest.json) aponta as duplicatas para o arquivo original
+manifest = export_pictures(
+    document,
+    output_dir="images",
+    image_format=IMAGE_FORMAT,
+    compress_level=COMPRESS_LEVEL,
+    quality=QUALITY,
+    dedup=DEDUP,
+    workers=EXPORT_WORKERS,
+)
 
-        # Abre o arquivo em modo binário para escrita ("wb")
-        with open(image_path, "wb") as f:
-            # Obtém a imagem associada ao elemento
-            # e salva no formato PNG
-            element.get_image(result.document).save(f, "PNG")
+# Exibe mensagem confirmando o salvamento
+for number, image_path in manifest.items():
+    print(f"Saved image {number} to {image_path}")
 
-        # Exibe mensagem confirmando o salvamento
-        print(f"Saved image to {image_path}")
+# Resumo: quantas imagens únicas foram gravadas e em quanto tempo
+unique = len({path for path in manifest.values() if path})
+print(
+    f"{len(manifest)} imagens, {unique} únicas gravadas "
+    f"em {time.perf_counter() - start:.2f}s"
+)
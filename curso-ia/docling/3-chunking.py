@@ -13,6 +13,10 @@ from docling.chunking import HierarchicalChunker
 # em um documento estruturado manipulável em Python
 from docling.document_converter import DocumentConverter
 
+# Cache de conversão local: reaproveita o documento já convertido
+# (chave = hash do conteúdo do PDF + opções do pipeline)
+from conversion_cache import convert_cached
+
 # ================================
 # CONVERSÃO DO PDF
 # ================================
@@ -26,12 +30,10 @@ converter = DocumentConverter()
 # / "2408.09869v5.pdf" → adiciona o nome do PDF ao caminho
 pdf_path = Path(__file__).parent / "2408.09869v5.pdf"
 
-# Executa a conversão do PDF
-# O resultado contém metadados e o documento estruturado
-result = converter.convert(pdf_path)
-
-# Extrai o objeto document estruturado do resultado
-document = result.document
+# Executa a conversão do PDF e extrai o documento estruturado
+# Se o mesmo PDF já foi convertido com as mesmas opções,
+# o documento é carregado do cache em vez de ser convertido de novo
+document = convert_cached(converter, pdf_path)
 
 
 # ================================
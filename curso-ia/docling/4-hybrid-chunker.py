@@ -8,12 +8,17 @@ from docling.chunking import HybridChunker
 # Conversor principal do Docling (transforma PDF em documento estruturado)
 from docling.document_converter import DocumentConverter
 
-# Wrapper de tokenizer compatível com o sistema de chunking do Docling
-from docling_core.transforms.chunker.tokenizer.huggingface import HuggingFaceTokenizer
-
 # Biblioteca da Hugging Face para carregar tokenizers pré-treinados
 from transformers import AutoTokenizer
 
+# Cache de conversão local: reaproveita o documento já convertido
+# (chave = hash do conteúdo do PDF + opções do pipeline)
+from conversion_cache import convert_cached
+
+# Tokenizer compatível com o chunking do Docling que memoiza os tokens
+# de cada trecho, e o wrapper que devolve chunks já com seus tokens
+from token_cache import CachingTokenizer, chunk_with_tokens
+
 # ================================
 # CONFIGURAÇÕES
 # ================================
@@ -42,10 +47,8 @@ converter = DocumentConverter()
 pdf_path = Path(__file__).parent / "2408.09869v5.pdf"
 
 # Converte o PDF para um documento estruturado
-result = converter.convert(pdf_path)
-
-# Extrai o objeto document do resultado
-document = result.document
+# (ou carrega do cache se já foi convertido antes)
+document = convert_cached(converter, pdf_path)
 
 
 # ================================
@@ -54,7 +57,9 @@ document = result.document
 
 # Cria o tokenizer baseado no modelo de embedding escolhido
 # AutoTokenizer baixa automaticamente o tokenizer do modelo
-tokenizer = HuggingFaceTokenizer(
+# CachingTokenizer tokeniza cada trecho uma única vez, mesmo que o
+# HybridChunker conte o mesmo texto em várias passagens (divisão e merge)
+tokenizer = CachingTokenizer(
     tokenizer=AutoTokenizer.from_pretrained(EMBED_MODEL),
     # Define o limite máximo de tokens permitido
     max_tokens=MAX_TOKENS,
@@ -81,8 +86,9 @@ chuncker = HybridChunker(
 # ================================
 
 # Aplica o chunker ao documento
+# Cada chunk já vem com token_count (sem tokenizar de novo)
 # Retorna um gerador → convertendo para lista para facilitar uso
-chuncks = list(chuncker.chunk(document))
+chuncks = list(chunk_with_tokens(chuncker, document))
 
 
 # ================================
@@ -94,8 +100,8 @@ for i, chunk in enumerate(chuncks):
     # Imprime o índice do chunk
     print(f"--- Chunk {i} ---\n")
 
-    # Conta quantos tokens reais existem no texto do chunk
-    txt_tokens = tokenizer.count_tokens(chunk.text)
+    # Número de tokens reais do texto do chunk (calculado no chunking)
+    txt_tokens = chunk.token_count
 
     # Exibe:
     # - número de tokens
@@ -103,3 +109,6 @@ for i, chunk in enumerate(chuncks):
     print(f"chunck_text: ({txt_tokens} tokens):\n{chunk.text}!r")
 
     print()
+
+# Quantas vezes o texto foi realmente tokenizado
+print(tokenizer.stats())
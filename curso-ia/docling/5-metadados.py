@@ -18,8 +18,16 @@ from docling.document_converter import DocumentConverter
 # Geralmente usado para armazenar API Keys
 from dotenv import load_dotenv
 
-# Provider de modelo OpenAI usado pelo LangExtract
-from langextract.providers.openai import OpenAILanguageModel
+# Documento estruturado do Docling (para carregar JSONs já convertidos)
+from docling_core.types.doc import DoclingDocument
+
+# Cache de conversão local: reaproveita o documento já convertido
+# (chave = hash do conteúdo do PDF + opções do pipeline)
+from conversion_cache import convert_cached
+
+# Extração em lote: concorrência limitada, cache por
+# (documento, prompt, exemplos, modelo) e JSONL gravado incrementalmente
+from metadata_extraction import build_model, extract_batch
 
 # ================================
 # CONFIGURAÇÃO INICIAL
@@ -41,18 +49,17 @@ converter = DocumentConverter()
 pdf_path = Path(__file__).parent / "2408.09869v5.pdf"
 
 # Converte o PDF em documento estruturado
-result = converter.convert(pdf_path)
-
-# Extrai o objeto document
-document = result.document
+# (ou carrega do cache se já foi convertido antes)
+documents = [convert_cached(converter, pdf_path)]
 
-# Exporta o documento para Markdown
-# Isso facilita enviar o texto para o LLM
-markdown_output = document.export_to_markdown()
+# Documentos já convertidos em lote (batch_conversion.py), se houver
+converted_dir = Path(__file__).parent.parent / "converted"
+for json_path in sorted(converted_dir.rglob("*.json")):
+    documents.append(DoclingDocument.load_from_json(json_path))
 
-# Pega apenas os primeiros 6000 caracteres
-# Evita enviar texto muito grande para o modelo
-first_pages = markdown_output[:6000]
+# De cada documento, apenas os primeiros 6000 caracteres em Markdown
+# são enviados ao LLM (evita enviar texto muito grande para o modelo)
+MAX_CHARS = 6000
 
 
 # ================================
@@ -112,44 +119,52 @@ examples = [
 # EXECUÇÃO DA EXTRAÇÃO COM LLM
 # ================================
 
-# lx.extract envia:
-# - o texto
-# - o prompt
-# - os exemplos
-# - o modelo escolhido
-# para o LLM realizar a extração estruturada
-
-extraction_result = lx.extract(
-    text_or_documents=first_pages,
-    prompt_description=prompt,
-    examples=examples,
-    model_id="gpt-4o-mini",  # modelo usado para extração
-)
-
+# Modelo usado para extração (OPENAI_BASE_URL aponta para um servidor
+# local compatível com a OpenAI, útil para testes sem chave de API)
+# No máximo 4 chamadas ao LLM em andamento, somando todos os documentos
+model = build_model("gpt-4o-mini", max_in_flight=4)
 
-# ================================
-# SALVANDO RESULTADO
-# ================================
-
-# Salva o resultado em formato JSONL anotado
+# Arquivo JSONL anotado (lido depois por 6-embeddings.py)
 # Cada linha representa um documento com suas extrações
-lx.io.save_annotated_documents(
-    [extraction_result], output_name="docling_paper_metadata.jsonl"
+output_path = (
+    Path(__file__).parent.parent / "test_output" / "docling_paper_metadata.jsonl"
 )
 
-
-# ================================
-# EXIBINDO RESULTADOS
-# ================================
-
-# Linha separadora no terminal
-print("-" * 80)
-
-# Percorre todas as extrações encontradas
-for extraction in extraction_result.extractions:
-    # Imprime classe e texto extraído
-    print(f"{extraction.extraction_class}: {extraction.extraction_text}")
-
-    # Se houver atributos extras (ex: tipo de URL), imprime também
-    if extraction.attributes:
-        print(f"  Atributos: {extraction.attributes}")
+# extract_batch envia, para cada documento:
+# - o texto
+# - o prompt
+# - os exemplos
+# - o modelo escolhido
+# com até 4 documentos em paralelo; resultados repetidos vêm do cache,
+# cada documento é gravado no JSONL assim que termina e só é extraído de
+# novo se o texto, o prompt, os exemplos ou o modelo mudarem
+for document_id, extraction_result, origin in extract_batch(
+    documents,
+    prompt,
+    examples,
+    output_path,
+    model_id="gpt-4o-mini",
+    model=model,
+    concurrency=4,
+    max_chars=MAX_CHARS,
+):
+
+    # ================================
+    # EXIBINDO RESULTADOS
+    # ================================
+
+    # Linha separadora no terminal
+    print("-" * 80)
+    print(f"{document_id} ({origin})")
+
+    if extraction_result is None:
+        continue
+
+    # Percorre todas as extrações encontradas
+    for extraction in extraction_result.extractions:
+        # Imprime classe e texto extraído
+        print(f"{extraction.extraction_class}: {extraction.extraction_text}")
+
+        # Se houver atributos extras (ex: tipo de URL), imprime também
+        if extraction.attributes:
+            print(f"  Atributos: {extraction.attributes}")
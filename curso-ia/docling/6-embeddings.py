@@ -1,6 +1,3 @@
-# Biblioteca padrão para manipular JSON
-import json
-
 # Classe para manipulação segura de caminhos de arquivos
 from pathlib import Path
 
@@ -10,15 +7,28 @@ from docling.chunking import HybridChunker
 # Conversor principal de documentos (PDF → documento estruturado)
 from docling.document_converter import DocumentConverter
 
-# Tokenizer compatível com HuggingFace para contagem real de tokens
-from docling_core.transforms.chunker.tokenizer.huggingface import HuggingFaceTokenizer
-
 # Cliente oficial do Qdrant (banco vetorial)
 from qdrant_client import QdrantClient, models
 
 # Biblioteca para carregar tokenizer do modelo de embedding
 from transformers import AutoTokenizer
 
+# Cache de conversão local: reaproveita o documento já convertido
+# (chave = hash do conteúdo do PDF + opções do pipeline)
+from conversion_cache import convert_cached
+
+# Tokenizer compatível com HuggingFace que memoiza os tokens de cada trecho,
+# e o wrapper que devolve chunks já com seus tokens
+from token_cache import CachingTokenizer, chunk_with_tokens
+
+# Índice dos metadados extraídos (document_id -> linha do JSONL)
+from metadata_index import MetadataIndex, join_metadata
+
+# Embedding explícito em lote (com cache de vetores) e upload de vetores prontos
+from embedding import EmbeddingCache, Timings, load_embedder
+
+# Reindexação incremental: só chunks novos/alterados são enviados
+from incremental_index import ensure_collection, sync_document
 
 # ================================
 # CONFIGURAÇÕES
@@ -30,6 +40,19 @@ MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
 # Número máximo de tokens por chunk
 MAX_TOKENS = 300
 
+# Textos por lote de embedding
+EMBED_BATCH_SIZE = 256
+
+# Threads do ONNX Runtime (None = todas) e processos do fastembed (None = 1)
+EMBED_THREADS = None
+EMBED_PARALLEL = None
+
+# Workers de upload (com servidor Qdrant; no modo local é sequencial)
+UPLOAD_PARALLEL = 4
+
+# Tempo de cada etapa, exibido no final
+timings = Timings()
+
 
 # ================================
 # CONVERSÃO DO PDF
@@ -42,17 +65,16 @@ converter = DocumentConverter()
 pdf_path = Path(__file__).parent / "2408.09869v5.pdf"
 
 # Converte PDF em documento estruturado
-result = converter.convert(pdf_path)
-
-# Extrai objeto document
-document = result.document
+# (ou carrega do cache se já foi convertido antes)
+with timings.measure("conversão"):
+    document = convert_cached(converter, pdf_path)
 
 
 # ================================
 # CONFIGURAÇÃO DO TOKENIZER
 # ================================
 
-tokenizer = HuggingFaceTokenizer(
+tokenizer = CachingTokenizer(
     tokenizer=AutoTokenizer.from_pretrained(MODEL_NAME),
 
     # Limite máximo por chunk
@@ -76,47 +98,24 @@ chuncker = HybridChunker(
     merge_peers=True,
 )
 
-# Gera lista de chunks
-chunks = list(chuncker.chunk(document))
+# Gera lista de chunks, cada um com token_count
+with timings.measure("chunking"):
+    chunks = list(chunk_with_tokens(chuncker, document))
 
 
 # ================================
 # LEITURA DO METADATA EXTRAÍDO
 # ================================
 
-# Valores padrão caso não encontre
-paper_title = "N/A"
-paper_url = "N/A"
-
 # Caminho para o arquivo JSONL gerado anteriormente
 metadata_path = (
     Path(__file__).parent.parent / "test_output" / "docling_paper_metadata.jsonl"
 )
 
-# Abre o arquivo e lê linha por linha
-with open(metadata_path, "r") as f:
-    for line in f:
-        doc = json.loads(line)
-
-        # Percorre as extrações feitas pelo LLM
-        for extraction in doc.get("extractions", []):
-            extraction_class = extraction.get("extraction_class", "")
-            extraction_text = extraction.get("extraction_text", "")
-
-            # Se for título e ainda não foi definido
-            if extraction_class == "title" and paper_title == "N/A":
-                paper_title = extraction_text
-
-            # Se for URL e ainda não foi definido
-            if extraction_class == "url" and paper_url == "N/A":
-                paper_url = extraction_text
-
-
-# Metadados que serão associados a todos os chunks
-metadata_document_info = {
-    "title": paper_title,
-    "url": paper_url,
-}
+# Abre o índice ao lado do JSONL (só as linhas novas são lidas)
+# A busca de um documento é um seek direto na sua linha, sem varrer o
+# arquivo; sem metadados para o documento, title/url ficam "N/A"
+metadata_index = MetadataIndex(metadata_path)
 
 
 # ================================
@@ -126,17 +125,18 @@ metadata_document_info = {
 # Inicializa banco vetorial local (armazenado em db/data)
 qdrant = QdrantClient(path="db/data")
 
-# Cria coleção vetorial
-qdrant.create_collection(
-    collection_name="docling_paper",
-    vectors_config=models.VectorParams(
-        # Define tamanho do vetor baseado no modelo
-        size=qdrant.get_embedding_size(MODEL_NAME),
+# Carrega o modelo de embedding uma única vez (usado nos chunks e na consulta)
+embedder = load_embedder(MODEL_NAME, threads=EMBED_THREADS)
 
-        # Métrica de similaridade (Cosine é padrão para embeddings)
-        distance=models.Distance.COSINE,
-    ),
-)
+# Cache de vetores: chunks com o mesmo texto não são recalculados
+embedding_cache = EmbeddingCache(MODEL_NAME)
+
+# Cria a coleção vetorial apenas se ainda não existir
+# (tamanho do vetor vem do modelo; métrica Cosine)
+# Pontos do esquema antigo (sem document_id) são apagados aqui
+legacy = ensure_collection(qdrant, "docling_paper", embedder.embedding_size)
+if legacy:
+    print(f"{legacy} pontos antigos (sem document_id) removidos da coleção")
 
 
 # ================================
@@ -144,39 +144,50 @@ qdrant.create_collection(
 # ================================
 
 payload = []  # Metadados + texto
-embed = []    # Documentos para embedding automático
-ids = []      # IDs únicos
 
-for idx, chunk in enumerate(chunks):
+for chunk in chunks:
 
     # Payload = informação que ficará associada ao vetor
     payload.append({
         "text": chunk.text,
-        "metadata": metadata_document_info
+        # Contagem de tokens calculada no chunking (sem tokenizar de novo)
+        "token_count": chunk.token_count,
+        # Documento de origem (5-metadados.py usa o nome como document_id)
+        "document_id": document.name,
     })
 
-    # Documento que o Qdrant usará para gerar embedding automaticamente
-    embed.append(
-        models.Document(
-            text=chunk.text,
-            model=MODEL_NAME
-        )
-    )
 
-    # ID único para cada chunk
-    ids.append(idx)
+# Metadados juntados em lote: uma busca no índice por documento
+join_metadata(payload, metadata_index)
 
 
 # ================================
-# UPLOAD PARA O BANCO VETORIAL
+# EMBEDDING E UPLOAD INCREMENTAIS
 # ================================
 
-qdrant.upload_collection(
-    collection_name="docling_paper",
-    vectors=embed,
-    ids=ids,
-    payload=payload,
+# Compara o hash (texto + títulos) de cada chunk com o que já está no
+# Qdrant: só chunks novos ou alterados são calculados (em lote, com cache)
+# e enviados como vetores prontos; chunks que sumiram são apagados
+report = sync_document(
+    qdrant,
+    "docling_paper",
+    document.name,
+    chunks,
+    payload,
+    embedder,
+    cache=embedding_cache,
+    batch_size=EMBED_BATCH_SIZE,
+    embed_parallel=EMBED_PARALLEL,
+    upload_parallel=UPLOAD_PARALLEL,
+    timings=timings,
 )
+print(
+    f"chunks iguais: {report['unchanged']} | "
+    f"novos/alterados: {report['added']} | removidos: {report['deleted']}"
+)
+
+# Tempo de cada etapa
+print(timings.format())
 
 
 # ================================
@@ -186,10 +197,7 @@ qdrant.upload_collection(
 # Faz uma pergunta em linguagem natural
 result = qdrant.query_points(
     collection_name="docling_paper",
-    query=models.Document(
-        text="what is docling?",
-        model=MODEL_NAME,
-    ),
+    query=next(embedder.query_embed("what is docling?")),
 ).points
 
 
@@ -202,5 +210,6 @@ print("text:", result[0].payload["text"])
 print("metadata:", result[0].payload["metadata"]["url"])
 
 
-# Fecha conexão com o banco
+# Fecha conexão com o banco e o cache de vetores
 qdrant.close()
+embedding_cache.close()
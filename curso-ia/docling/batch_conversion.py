@@ -0,0 +1,323 @@
+# Biblioteca padrão para ler argumentos da linha de comando
+import argparse
+
+# Biblioteca padrão para padrões glob (inclusive absolutos, como /data/*.pdf)
+import glob
+
+# Biblioteca padrão para gravar o relatório em JSONL
+import json
+
+# Biblioteca padrão para descobrir o número de CPUs
+import os
+
+# Biblioteca padrão para medir o throughput
+import time
+
+# Pool de processos: cada worker converte documentos em paralelo
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+# "spawn" cria processos limpos (mais seguro com PyTorch/ONNX que "fork")
+from multiprocessing import get_context
+
+# Classe para manipulação segura de caminhos de arquivos
+from pathlib import Path
+
+# Opções de aceleração (número de threads por worker)
+from docling.datamodel.accelerator_options import AcceleratorOptions
+
+# Formatos de entrada e status da conversão
+from docling.datamodel.base_models import ConversionStatus, InputFormat
+
+# Opções específicas do pipeline de processamento de PDF
+from docling.datamodel.pipeline_options import PdfPipelineOptions
+
+# DocumentConverter é o conversor principal
+# PdfFormatOption permite configurar opções específicas para PDF
+from docling.document_converter import DocumentConverter, PdfFormatOption
+
+# ================================
+# CONVERSÃO EM LOTE
+# ================================
+
+# Converte um diretório (ou glob) de PDFs em paralelo:
+#
+#   uv run docling/batch_conversion.py "relatorios/**/*.pdf" --workers 4
+#
+# - cada worker cria UM DocumentConverter e o reutiliza para todos os PDFs
+# - document_timeout interrompe um PDF patológico (status PARTIAL_SUCCESS);
+#   é cooperativo: um worker travado (ex.: no parser nativo do PDF) não o
+#   respeita. Por isso há também um timeout rígido (hard_timeout): vencido,
+#   o PDF é registrado como FAILURE, o pool é morto e recriado, e os PDFs
+#   que estavam em andamento voltam para a fila
+# - max_num_pages recusa PDFs grandes demais (status FAILURE)
+# - cada documento é gravado em disco assim que termina, e uma linha é
+#   acrescentada ao relatório JSONL
+# - a saída espelha as subpastas da origem (a/x.pdf -> a/x.json), então PDFs
+#   com o mesmo nome em pastas diferentes não se sobrescrevem
+
+
+# Conversor do processo atual (criado uma vez por worker)
+_converter = None
+
+
+def build_converter(document_timeout=None, num_threads=4):
+    # Opções do pipeline de PDF usadas por todos os documentos
+    pipeline_options = PdfPipelineOptions()
+
+    # Tempo máximo (s) por documento antes de abortar a conversão
+    pipeline_options.document_timeout = document_timeout
+
+    # Limita as threads de cada worker para não disputar núcleos entre processos
+    pipeline_options.accelerator_options = AcceleratorOptions(num_threads=num_threads)
+
+    return DocumentConverter(
+        format_options={
+            InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)
+        }
+    )
+
+
+def init_worker(document_timeout, num_threads):
+    # Executado uma vez em cada processo do pool
+    global _converter
+    _converter = build_converter(document_timeout, num_threads)
+
+
+def worker_converter():
+    # Conversor criado por init_worker() no processo atual
+    return _converter
+
+
+def output_path_for(pdf_path, root, output_dir):
+    # Caminho relativo à raiz da origem, com extensão .json
+    relative = Path(pdf_path).resolve().relative_to(Path(root).resolve())
+    return Path(output_dir) / relative.with_suffix(".json")
+
+
+def convert_one(pdf_path, output_path, max_num_pages):
+    # Converte um PDF no worker e grava o DoclingDocument em JSON
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+
+    try:
+        result = worker_converter().convert(
+            pdf_path, raises_on_error=False, max_num_pages=max_num_pages
+        )
+        status = result.status
+        pages = len(result.pages)
+
+        if status in (ConversionStatus.SUCCESS, ConversionStatus.PARTIAL_SUCCESS):
+            result.document.save_as_json(output_path)
+        else:
+            output_path = None
+
+        errors = [error.error_message for error in result.errors]
+    except Exception as error:
+        # Um PDF com erro não derruba o lote
+        status, pages, output_path = ConversionStatus.FAILURE, 0, None
+        errors = [repr(error)]
+
+    return {
+        "source": str(pdf_path),
+        "status": status.value,
+        "pages": pages,
+        "seconds": round(time.perf_counter() - start, 3),
+        "output": str(output_path) if output_path else None,
+        "errors": errors,
+    }
+
+
+def collect_pdfs(source):
+    # Aceita um diretório (busca recursiva) ou um padrão glob
+    path = Path(source)
+    if path.is_dir():
+        return sorted(path.rglob("*.pdf"))
+    if path.is_file():
+        return [path]
+    return sorted(Path(p) for p in glob.glob(source, recursive=True))
+
+
+def source_root(source):
+    # Raiz usada para montar os caminhos de saída: o próprio diretório, a
+    # pasta do arquivo ou a parte do glob antes do primeiro curinga
+    path = Path(source)
+    if path.is_dir():
+        return path
+    if path.is_file():
+        return path.parent
+    parts = []
+    for part in path.parts:
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+    return Path(*parts) if parts else Path()
+
+
+def failure_report(pdf_path, seconds, error):
+    return {
+        "source": str(pdf_path),
+        "status": ConversionStatus.FAILURE.value,
+        "pages": 0,
+        "seconds": round(seconds, 3),
+        "output": None,
+        "errors": [error],
+    }
+
+
+def kill_pool(pool):
+    # Python 3.14+ tem kill_workers(); antes disso, mata os processos direto
+    if hasattr(pool, "kill_workers"):
+        pool.kill_workers()
+        return
+    for process in list((pool._processes or {}).values()):
+        process.kill()
+
+
+def convert_batch(
+    pdf_paths,
+    output_dir,
+    workers=None,
+    document_timeout=120.0,
+    max_num_pages=500,
+    num_threads=None,
+    skip_existing=True,
+    root=None,
+    hard_timeout=None,
+):
+    # Gerador: devolve o relatório de cada PDF na ordem em que termina
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    workers = workers or max(1, (os.cpu_count() or 2) // 2)
+    # Divide os núcleos entre os workers
+    num_threads = num_threads or max(1, (os.cpu_count() or 1) // workers)
+
+    # Sem raiz informada, usa a pasta comum a todos os PDFs
+    if root is None and pdf_paths:
+        root = os.path.commonpath([str(Path(p).resolve().parent) for p in pdf_paths])
+    outputs = {str(p): output_path_for(p, root, output_dir) for p in pdf_paths}
+
+    # Timeout rígido: o cooperativo mais uma folga
+    if hard_timeout is None and document_timeout:
+        hard_timeout = document_timeout + 60
+
+    # Retomada: PDFs com saída já gravada não são convertidos de novo
+    pending = [str(p) for p in pdf_paths if not (skip_existing and outputs[str(p)].exists())]
+
+    while pending:
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("spawn"),
+            initializer=init_worker,
+            initargs=(document_timeout, num_threads),
+        )
+        running = {}  # future -> (pdf, início)
+        hung = False
+        try:
+            while pending or running:
+                # No máximo `workers` PDFs em andamento: o prazo de cada um
+                # começa a contar quando ele de fato entra num worker
+                while pending and len(running) < workers:
+                    pdf = pending.pop(0)
+                    future = pool.submit(convert_one, pdf, str(outputs[pdf]), max_num_pages)
+                    running[future] = (pdf, time.monotonic())
+
+                timeout = None
+                if hard_timeout:
+                    oldest = min(started for _, started in running.values())
+                    timeout = max(0.0, oldest + hard_timeout - time.monotonic())
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    running.pop(future)
+                    yield future.result()
+
+                now = time.monotonic()
+                expired = [
+                    future
+                    for future, (_, started) in running.items()
+                    if hard_timeout and now - started >= hard_timeout
+                ]
+                if expired:
+                    for future in expired:
+                        pdf, started = running.pop(future)
+                        yield failure_report(
+                            pdf, now - started, f"hard timeout ({hard_timeout}s): worker encerrado"
+                        )
+                    # Os demais em andamento recomeçam num pool novo
+                    pending = [pdf for pdf, _ in running.values()] + pending
+                    running = {}
+                    hung = True
+                    break
+        finally:
+            if hung:
+                kill_pool(pool)
+            pool.shutdown(wait=not hung, cancel_futures=True)
+
+
+def main(args):
+    pdf_paths = collect_pdfs(args.source)
+    report_path = Path(args.output_dir) / "report.jsonl"
+
+    print(f"{len(pdf_paths)} PDFs encontrados")
+
+    start = time.perf_counter()
+    pages = documents = failures = partial = 0
+
+    Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+    with open(report_path, "a", encoding="utf-8") as report:
+        for item in convert_batch(
+            pdf_paths,
+            args.output_dir,
+            workers=args.workers,
+            document_timeout=args.timeout,
+            max_num_pages=args.max_pages,
+            num_threads=args.threads,
+            root=source_root(args.source),
+            hard_timeout=args.hard_timeout,
+        ):
+            # Relatório gravado à medida que os documentos terminam
+            report.write(json.dumps(item, ensure_ascii=False) + "\n")
+            report.flush()
+
+            documents += 1
+            pages += item["pages"]
+            failures += item["status"] == ConversionStatus.FAILURE.value
+            partial += item["status"] == ConversionStatus.PARTIAL_SUCCESS.value
+
+            print(
+                f"[{item['status']}] {item['source']} "
+                f"({item['pages']} páginas, {item['seconds']}s)"
+            )
+
+    elapsed = time.perf_counter() - start
+    print("-" * 80)
+    print(
+        f"{documents} documentos, {pages} páginas em {elapsed:.1f}s | "
+        f"{pages / elapsed:.2f} páginas/s | "
+        f"parciais (timeout/erros): {partial} | falhas: {failures}"
+    )
+
+
+# ================================
+# EXECUÇÃO
+# ================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Conversão de PDFs em lote")
+    parser.add_argument("source", help="diretório ou padrão glob de PDFs")
+    parser.add_argument("--output-dir", default="converted")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--threads", type=int, default=None, help="threads por worker")
+    parser.add_argument("--timeout", type=float, default=120.0, help="segundos por PDF")
+    parser.add_argument(
+        "--hard-timeout",
+        type=float,
+        default=None,
+        help="segundos por PDF antes de matar o worker (padrão: timeout + 60)",
+    )
+    parser.add_argument("--max-pages", type=int, default=500)
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,143 @@
+# Biblioteca padrão para ler argumentos da linha de comando
+import argparse
+
+# Biblioteca padrão para medir o tempo
+import time
+
+# Classe para manipulação segura de caminhos de arquivos
+from pathlib import Path
+
+# Atributos privados em modelos pydantic
+from pydantic import PrivateAttr
+
+# Chunker híbrido (estrutura + limite real de tokens)
+from docling.chunking import HybridChunker
+
+# Conversor principal de documentos (PDF → documento estruturado)
+from docling.document_converter import DocumentConverter
+
+# Documento estruturado do Docling (para carregar um JSON já convertido)
+from docling_core.types.doc import DoclingDocument
+
+# Tokenizer compatível com HuggingFace para contagem real de tokens
+from docling_core.transforms.chunker.tokenizer.huggingface import HuggingFaceTokenizer
+
+# Biblioteca para carregar tokenizer do modelo de embedding
+from transformers import AutoTokenizer
+
+# Cache de conversão local
+from conversion_cache import convert_cached
+
+# Tokenização memoizada e chunks com tokens
+from token_cache import CachingTokenizer, chunk_with_tokens
+
+# ================================
+# BENCHMARK DE TOKENIZAÇÃO
+# ================================
+
+# Conta quantas vezes o texto passa pelo tokenizer do HuggingFace
+# por documento, no fluxo 4-hybrid-chunker.py → 6-embeddings.py:
+#
+#   uv run docling/benchmark_tokenization.py
+#   uv run docling/benchmark_tokenization.py --document convertido.json
+#
+# antes: HybridChunker + count_tokens por chunk + tokenização no embedding
+# depois: CachingTokenizer + token_count em cada chunk + tokenização no embedding
+#
+# Os dois lados fazem o mesmo trabalho de ponta a ponta: o embedding recebe
+# texto e tokeniza cada chunk nos dois casos; o cache só elimina as
+# tokenizações repetidas do chunking e a recontagem dos chunks.
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+MAX_TOKENS = 300
+
+
+class CountingTokenizer(HuggingFaceTokenizer):
+    # Tokenizer original, apenas contando as chamadas
+    _calls: int = PrivateAttr(default=0)
+
+    def count_tokens(self, text):
+        self._calls += 1
+        return super().count_tokens(text)
+
+
+def before(document, hf_tokenizer):
+    tokenizer = CountingTokenizer(tokenizer=hf_tokenizer, max_tokens=MAX_TOKENS)
+    chunker = HybridChunker(
+        tokenizer=tokenizer, max_tokens=MAX_TOKENS, merge_peers=True
+    )
+
+    chunks = list(chunker.chunk(document))
+    chunking_calls = tokenizer._calls
+
+    # 4-hybrid-chunker.py: conta os tokens de cada chunk de novo
+    for chunk in chunks:
+        tokenizer.count_tokens(chunk.text)
+
+    # 6-embeddings.py: o modelo de embedding tokeniza cada chunk mais uma vez
+    for chunk in chunks:
+        hf_tokenizer(chunk.text)
+
+    return len(chunks), chunking_calls, tokenizer._calls + len(chunks)
+
+
+def after(document, hf_tokenizer):
+    tokenizer = CachingTokenizer(tokenizer=hf_tokenizer, max_tokens=MAX_TOKENS)
+    chunker = HybridChunker(
+        tokenizer=tokenizer, max_tokens=MAX_TOKENS, merge_peers=True
+    )
+
+    # A contagem vem junto com cada chunk (4-hybrid-chunker.py não reconta)
+    chunks = list(chunk_with_tokens(chunker, document))
+    stats = tokenizer.stats()
+
+    # 6-embeddings.py: o modelo de embedding tokeniza cada chunk, como antes
+    for chunk in chunks:
+        hf_tokenizer(chunk.text)
+
+    cache_hits = stats["count_calls"] - stats["tokenizer_calls"]
+    return len(chunks), cache_hits, stats["tokenizer_calls"] + len(chunks)
+
+
+def main(args):
+    if args.document:
+        document = DoclingDocument.load_from_json(args.document)
+    else:
+        pdf_path = Path(__file__).parent / "2408.09869v5.pdf"
+        document = convert_cached(DocumentConverter(), pdf_path)
+
+    hf_tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+
+    start = time.perf_counter()
+    chunks, chunking_calls, total_before = before(document, hf_tokenizer)
+    time_before = time.perf_counter() - start
+
+    start = time.perf_counter()
+    chunks_after, cache_hits, total_after = after(document, hf_tokenizer)
+    time_after = time.perf_counter() - start
+
+    print(f"Documento: {document.name} | chunks: {chunks} / {chunks_after}")
+    print("-" * 80)
+    print(
+        f"antes:  {total_before:>6} tokenizações "
+        f"({chunking_calls} no chunking + {total_before - chunking_calls} depois) "
+        f"em {time_before:.2f}s"
+    )
+    print(
+        f"depois: {total_after:>6} tokenizações "
+        f"({total_after - chunks_after} no chunking + {chunks_after} no embedding; "
+        f"{cache_hits} contagens atendidas pelo cache) "
+        f"em {time_after:.2f}s"
+    )
+
+
+# ================================
+# EXECUÇÃO
+# ================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de tokenização")
+    parser.add_argument("--document", help="DoclingDocument já convertido (JSON)")
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,96 @@
+# Biblioteca padrão para calcular o hash do conteúdo do arquivo
+import hashlib
+
+# Biblioteca padrão para ler a versão instalada do Docling
+from importlib.metadata import version
+
+# Biblioteca padrão para acessar variáveis de ambiente e renomear arquivos
+import os
+
+# Classe para manipulação segura de caminhos de arquivos
+from pathlib import Path
+
+# Enum com os formatos de entrada suportados (PDF, DOCX, etc.)
+from docling.datamodel.base_models import InputFormat
+
+# Documento estruturado do Docling (pode ser salvo/carregado em JSON)
+from docling_core.types.doc import DoclingDocument
+
+# Modo de serialização das imagens (EMBEDDED mantém as imagens no JSON)
+from docling_core.types.doc.base import ImageRefMode
+
+
+# ================================
+# CACHE DE CONVERSÃO
+# ================================
+
+# A conversão (modelos de layout, OCR, tabelas) é a etapa mais lenta.
+# Este cache guarda o DoclingDocument serializado, indexado por:
+# - hash do conteúdo do arquivo (ou a própria URL)
+# - pipeline e opções configuradas no converter para aquele formato
+# - argumentos extras do convert() (page_range, max_num_pages, ...)
+# - versão do Docling
+# Assim chunking, metadados e embeddings podem ser iterados sem
+# pagar a conversão de novo.
+
+# Pasta do cache (pode ser trocada pela variável DOCLING_CACHE_DIR)
+CACHE_DIR = Path(
+    os.getenv("DOCLING_CACHE_DIR", Path(__file__).parent / ".docling_cache")
+)
+
+
+def content_hash(source):
+    # URLs são identificadas pelo próprio endereço
+    if isinstance(source, str) and source.startswith(("http://", "https://")):
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    # Arquivos locais: hash do conteúdo lido em blocos de 1 MB
+    digest = hashlib.sha256()
+    with open(source, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def options_fingerprint(converter, input_format=InputFormat.PDF, **convert_kwargs):
+    # Representação textual de tudo que altera o resultado da conversão
+    format_option = converter.format_to_options.get(input_format)
+
+    parts = [f"docling={version('docling')}"]
+    if format_option is not None:
+        parts.append(f"pipeline={format_option.pipeline_cls.__name__}")
+        if format_option.pipeline_options is not None:
+            parts.append(str(format_option.pipeline_options.model_dump()))
+    parts.append(str(sorted((k, str(v)) for k, v in convert_kwargs.items())))
+
+    return "|".join(parts)
+
+
+def cache_key(source, converter, **convert_kwargs):
+    # Chave final: hash do conteúdo + hash das opções
+    options = options_fingerprint(converter, **convert_kwargs)
+    options_hash = hashlib.sha256(options.encode("utf-8")).hexdigest()
+    return f"{content_hash(source)[:32]}-{options_hash[:16]}"
+
+
+def convert_cached(converter, source, cache_dir=CACHE_DIR, **convert_kwargs):
+    # Substitui converter.convert(source).document
+    # Retorna o DoclingDocument, do cache quando possível
+    key = cache_key(source, converter, **convert_kwargs)
+    cache_path = Path(cache_dir) / f"{key}.json"
+
+    # Acerto: recarrega o documento serializado (sem rodar os modelos)
+    if cache_path.exists():
+        return DoclingDocument.load_from_json(cache_path)
+
+    # Falta: converte normalmente
+    document = converter.convert(source, **convert_kwargs).document
+
+    # Salva com as imagens embutidas, gravando primeiro num arquivo
+    # temporário para nunca deixar um JSON pela metade no cache
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    document.save_as_json(tmp_path, image_mode=ImageRefMode.EMBEDDED)
+    os.replace(tmp_path, cache_path)
+
+    return document
@@ -0,0 +1,181 @@
+# Biblioteca padrão para calcular a chave de cada vetor no cache
+import hashlib
+
+# Biblioteca padrão para variáveis de ambiente
+import os
+
+# Banco SQLite embutido: guarda os vetores já calculados
+import sqlite3
+
+# Biblioteca padrão para proteger o cache entre threads
+import threading
+
+# Biblioteca padrão para medir o tempo de cada etapa
+import time
+
+# Medição de tempo em blocos "with"
+from contextlib import contextmanager
+
+# Classe para manipulação segura de caminhos de arquivos
+from pathlib import Path
+
+# Biblioteca numérica para os vetores
+import numpy as np
+
+# Modelo de embedding local (o mesmo que o Qdrant usa em models.Document)
+from fastembed import TextEmbedding
+
+# ================================
+# EMBEDDING EXPLÍCITO EM LOTE
+# ================================
+
+# Com models.Document(text=..., model=...) o cliente do Qdrant calcula os
+# embeddings por dentro, sem controle de lote, threads ou reuso. Aqui:
+# - os vetores são calculados em lotes grandes pelo fastembed, com
+#   `threads` do ONNX Runtime ou `parallel` processos
+# - vetores já calculados vêm de um cache SQLite (chave = modelo + texto)
+# - o upload envia vetores prontos, em lotes, com `parallel` workers
+# - cada etapa tem o tempo medido (ver Timings)
+
+# Pasta do cache (pode ser trocada pela variável EMBEDDING_CACHE_DIR)
+CACHE_DIR = Path(
+    os.getenv("EMBEDDING_CACHE_DIR", Path(__file__).parent / ".embedding_cache")
+)
+
+
+class Timings:
+    # Acumula o tempo gasto em cada etapa nomeada
+
+    def __init__(self):
+        self.seconds = {}
+
+    def add(self, stage, seconds):
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def measure(self, stage):
+        # Uso: with timings.measure("embedding"): ...
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def format(self):
+        total = sum(self.seconds.values()) or 1.0
+        return "\n".join(
+            f"{stage:<12} {seconds:>8.2f}s {seconds / total:>6.0%}"
+            for stage, seconds in self.seconds.items()
+        )
+
+
+class EmbeddingCache:
+    # Vetores por (modelo, texto) num arquivo SQLite
+
+    def __init__(self, model_name, cache_dir=CACHE_DIR):
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        self.model_name = model_name
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            Path(cache_dir) / "embeddings.sqlite", check_same_thread=False
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS vectors (key TEXT PRIMARY KEY, vector BLOB)"
+        )
+
+    def key(self, text):
+        return hashlib.sha256(f"{self.model_name}|{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, texts):
+        # Vetor de cada texto (None quando ainda não está no cache)
+        keys = [self.key(text) for text in texts]
+        found = {}
+        with self._lock:
+            # Consulta em blocos (o SQLite limita o número de parâmetros)
+            for start in range(0, len(keys), 500):
+                block = keys[start : start + 500]
+                rows = self._db.execute(
+                    f"SELECT key, vector FROM vectors WHERE key IN ({','.join('?' * len(block))})",
+                    block,
+                )
+                found.update(rows)
+        return [
+            np.frombuffer(found[key], dtype=np.float32) if key in found else None
+            for key in keys
+        ]
+
+    def put_many(self, texts, vectors):
+        rows = [
+            (self.key(text), np.asarray(vector, dtype=np.float32).tobytes())
+            for text, vector in zip(texts, vectors)
+        ]
+        with self._lock, self._db:
+            self._db.executemany("INSERT OR REPLACE INTO vectors VALUES (?, ?)", rows)
+
+    def close(self):
+        self._db.close()
+
+
+def load_embedder(model_name, threads=None):
+    # Carrega o modelo uma vez; threads = threads do ONNX Runtime
+    return TextEmbedding(model_name=model_name, threads=threads)
+
+
+def embed_texts(
+    embedder, texts, batch_size=256, parallel=None, cache=None, timings=None
+):
+    # Vetores (np.float32) na mesma ordem de `texts`
+    # - parallel: número de processos do fastembed (None = no processo atual)
+    # - cache: EmbeddingCache; só os textos ausentes passam pelo modelo
+    timings = timings or Timings()
+
+    vectors = [None] * len(texts)
+    if cache is not None:
+        with timings.measure("cache"):
+            vectors = cache.get_many(texts)
+
+    missing = [index for index, vector in enumerate(vectors) if vector is None]
+    if missing:
+        with timings.measure("embedding"):
+            computed = list(
+                embedder.embed(
+                    [texts[index] for index in missing],
+                    batch_size=batch_size,
+                    parallel=parallel,
+                )
+            )
+        for index, vector in zip(missing, computed):
+            vectors[index] = np.asarray(vector, dtype=np.float32)
+
+        if cache is not None:
+            with timings.measure("cache"):
+                cache.put_many([texts[index] for index in missing], computed)
+
+    return vectors
+
+
+def upload_vectors(
+    qdrant,
+    collection_name,
+    vectors,
+    payloads,
+    ids,
+    batch_size=256,
+    parallel=4,
+    timings=None,
+):
+    # Envia vetores prontos (nada é calculado dentro do cliente)
+    # parallel = processos de upload (com servidor; no modo local é sequencial)
+    if not vectors:
+        return
+
+    timings = timings or Timings()
+    with timings.measure("upload"):
+        qdrant.upload_collection(
+            collection_name=collection_name,
+            vectors=np.vstack(vectors),
+            payload=payloads,
+            ids=ids,
+            batch_size=batch_size,
+            parallel=parallel,
+        )
@@ -0,0 +1,133 @@
+# Biblioteca padrão para o hash de conteúdo das imagens
+import hashlib
+
+# Biblioteca padrão para gravar o manifesto das imagens
+import json
+
+# Pool de threads: a codificação de imagens do Pillow libera o GIL
+from concurrent.futures import ThreadPoolExecutor
+
+# Classe para manipulação segura de caminhos de arquivos
+from pathlib import Path
+
+# Pillow: redimensionamento para o hash perceptual
+from PIL import Image
+
+# Classe que representa imagens encontradas dentro do documento
+from docling_core.types.doc import PictureItem
+
+# ================================
+# EXPORTAÇÃO DE IMAGENS
+# ================================
+
+# Extensão e parâmetros de compressão de cada formato suportado:
+# o PNG (sem perdas) usa o nível de compressão; WEBP e JPEG, a qualidade
+FORMATS = {
+    "PNG": ("png", lambda level, quality: {"optimize": False, "compress_level": level}),
+    "WEBP": ("webp", lambda level, quality: {"quality": quality, "method": 4}),
+    "JPEG": ("jpg", lambda level, quality: {"quality": quality, "optimize": True}),
+}
+
+
+def content_hash(image):
+    # Hash exato dos pixels (mesma imagem = mesmo hash)
+    digest = hashlib.sha256()
+    digest.update(f"{image.mode}{image.size}".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def perceptual_hash(image, hash_size=8):
+    # dHash: compara o brilho de pixels vizinhos numa miniatura 9x8
+    # Logos e ícones repetidos (mesmo com pequenas diferenças) dão o mesmo hash
+    small = image.convert("L").resize((hash_size + 1, hash_size), Image.LANCZOS)
+    pixels = list(small.getdata())
+
+    bits = 0
+    for row in range(hash_size):
+        for col in range(hash_size):
+            left = pixels[row * (hash_size + 1) + col]
+            right = pixels[row * (hash_size + 1) + col + 1]
+            bits = (bits << 1) | (left > right)
+
+    # A cor média (quantizada) separa imagens lisas de cores diferentes,
+    # que teriam o mesmo dHash; o tamanho separa proporções diferentes
+    color = image.convert("RGB").resize((1, 1), Image.BOX).getpixel((0, 0))
+    color = "".join(f"{channel >> 4:x}" for channel in color)
+
+    return f"{bits:016x}-{color}-{image.size[0]}x{image.size[1]}"
+
+
+def export_pictures(
+    document,
+    output_dir="images",
+    image_format="PNG",
+    compress_level=6,
+    quality=85,
+    dedup="content",
+    workers=4,
+):
+    # Codifica e grava todas as imagens do documento em paralelo
+    # - dedup="content": remove duplicatas exatas
+    # - dedup="perceptual": remove também duplicatas visualmente iguais
+    #   (opcional: o dHash 8x8 pode juntar figuras distintas de layout igual)
+    # - dedup=None: grava todas
+    # compress_level (PNG) vai de 0 (rápido, maior) a 9 (lento, menor)
+    # quality (WEBP/JPEG) vai de 0 a 100
+    # Retorna o manifesto: número da imagem -> arquivo gravado
+    extension, save_options = FORMATS[image_format]
+    options = save_options(compress_level, quality)
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Imagens na ordem do documento (a numeração segue a do script original)
+    pictures = [
+        element
+        for element, _level in document.iterate_items()
+        if isinstance(element, PictureItem)
+    ]
+
+    def fingerprint(element):
+        # Etapa paralela 1: obtém a imagem e calcula o hash
+        image = element.get_image(document)
+        if image is None or dedup is None:
+            return image, None
+        if dedup == "perceptual":
+            return image, perceptual_hash(image)
+        return image, content_hash(image)
+
+    def write(number, image):
+        # Etapa paralela 2: codifica e grava uma imagem única
+        if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        image_path = output_dir / f"picture_{number}.{extension}"
+        with open(image_path, "wb") as f:
+            image.save(f, image_format, **options)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        fingerprints = list(pool.map(fingerprint, pictures))
+
+        # Decide as duplicatas em ordem: a primeira ocorrência é a gravada
+        manifest = {}
+        seen = {}  # hash -> número da primeira imagem com esse hash
+        to_write = []
+        for number, (image, key) in enumerate(fingerprints, 1):
+            if image is None:
+                manifest[number] = None
+            elif key is not None and key in seen:
+                manifest[number] = manifest[seen[key]]
+            else:
+                if key is not None:
+                    seen[key] = number
+                manifest[number] = str(output_dir / f"picture_{number}.{extension}")
+                to_write.append((number, image))
+
+        list(pool.map(lambda item: write(*item), to_write))
+
+    # Manifesto: duplicatas apontam para o arquivo da primeira ocorrência
+    with open(output_dir / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
@@ -0,0 +1,181 @@
+# Biblioteca padrão para o hash de cada chunk
+import hashlib
+
+# Biblioteca padrão para gerar IDs determinísticos dos pontos
+import uuid
+
+# Modelos do Qdrant (filtros, seletores de pontos, índices)
+from qdrant_client import models
+
+# Embedding explícito em lote e upload de vetores prontos
+from embedding import Timings, embed_texts, upload_vectors
+
+# ================================
+# REINDEXAÇÃO INCREMENTAL
+# ================================
+
+# Quando um PDF é revisado, só os chunks que mudaram precisam de embedding:
+# - cada chunk tem um hash do texto + caminho de títulos (headings)
+# - o ID do ponto no Qdrant vem desse hash, então um chunk igual mantém o
+#   mesmo ID entre execuções
+# - os IDs gravados para o documento (filtro por document_id) são
+#   comparados com os atuais: só os novos passam pelo modelo e são
+#   enviados, e os que sumiram são apagados
+#
+# Limitação: a mudança só de metadados (título, URL) não altera o hash;
+# apague o documento da coleção para regravar os payloads.
+
+
+def chunk_hash(chunk):
+    # Hash do texto + títulos do chunk (TokenizedChunk ou chunk do Docling)
+    meta = getattr(chunk, "chunk", chunk).meta
+    headings = " > ".join(meta.headings or [])
+
+    digest = hashlib.sha256()
+    digest.update(headings.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(chunk.text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def chunk_ids(document_id, hashes):
+    # ID de cada chunk: documento + hash (+ ocorrência, para chunks repetidos)
+    seen = {}
+    ids = []
+    for value in hashes:
+        occurrence = seen.get(value, 0)
+        seen[value] = occurrence + 1
+        ids.append(
+            str(uuid.uuid5(uuid.NAMESPACE_URL, f"{document_id}#{value}#{occurrence}"))
+        )
+    return ids
+
+
+def ensure_collection(qdrant, collection_name, vector_size):
+    # Cria a coleção se ainda não existir e garante o índice no document_id
+    # Retorna quantos pontos antigos (sem document_id) foram apagados
+    if not qdrant.collection_exists(collection_name):
+        qdrant.create_collection(
+            collection_name=collection_name,
+            vectors_config=models.VectorParams(
+                size=vector_size, distance=models.Distance.COSINE
+            ),
+        )
+
+    # Índice no document_id: a busca dos pontos de um documento não varre
+    # tudo. Criado também em coleções antigas (criar de novo não tem efeito)
+    if "document_id" not in (qdrant.get_collection(collection_name).payload_schema or {}):
+        qdrant.create_payload_index(
+            collection_name=collection_name,
+            field_name="document_id",
+            field_schema=models.PayloadSchemaType.KEYWORD,
+        )
+
+    return delete_legacy_points(qdrant, collection_name)
+
+
+def delete_legacy_points(qdrant, collection_name):
+    # Pontos do esquema antigo (recriação completa, IDs inteiros, sem
+    # document_id) nunca casam com a remoção por documento e ficariam para
+    # sempre; os documentos atuais são reenviados por sync_document
+    legacy_filter = models.Filter(
+        must=[models.IsEmptyCondition(is_empty=models.PayloadField(key="document_id"))]
+    )
+    legacy = qdrant.count(
+        collection_name=collection_name, count_filter=legacy_filter, exact=True
+    ).count
+    if legacy:
+        qdrant.delete(
+            collection_name=collection_name,
+            points_selector=models.FilterSelector(filter=legacy_filter),
+        )
+    return legacy
+
+
+def stored_ids(qdrant, collection_name, document_id, page_size=1000):
+    # IDs dos pontos já gravados para o documento (sem baixar vetores)
+    document_filter = models.Filter(
+        must=[
+            models.FieldCondition(
+                key="document_id", match=models.MatchValue(value=document_id)
+            )
+        ]
+    )
+
+    ids = set()
+    offset = None
+    while True:
+        points, offset = qdrant.scroll(
+            collection_name=collection_name,
+            scroll_filter=document_filter,
+            limit=page_size,
+            offset=offset,
+            with_payload=False,
+            with_vectors=False,
+        )
+        ids.update(str(point.id) for point in points)
+        if offset is None:
+            return ids
+
+
+def sync_document(
+    qdrant,
+    collection_name,
+    document_id,
+    chunks,
+    payloads,
+    embedder,
+    cache=None,
+    batch_size=256,
+    embed_parallel=None,
+    upload_parallel=4,
+    timings=None,
+):
+    # Deixa a coleção igual aos chunks atuais do documento
+    # payloads[i] é o payload do chunks[i] (recebe chunk_hash)
+    # Retorna {"unchanged", "added", "deleted"}
+    timings = timings or Timings()
+
+    hashes = [chunk_hash(chunk) for chunk in chunks]
+    ids = chunk_ids(document_id, hashes)
+    for payload, value in zip(payloads, hashes):
+        payload["chunk_hash"] = value
+
+    with timings.measure("diff"):
+        existing = stored_ids(qdrant, collection_name, document_id)
+
+    new = [index for index, point_id in enumerate(ids) if point_id not in existing]
+    removed = existing - set(ids)
+
+    # Só os chunks novos ou alterados passam pelo modelo
+    vectors = embed_texts(
+        embedder,
+        [chunks[index].text for index in new],
+        batch_size=batch_size,
+        parallel=embed_parallel,
+        cache=cache,
+        timings=timings,
+    )
+    upload_vectors(
+        qdrant,
+        collection_name,
+        vectors,
+        [payloads[index] for index in new],
+        [ids[index] for index in new],
+        batch_size=batch_size,
+        parallel=upload_parallel,
+        timings=timings,
+    )
+
+    if removed:
+        with timings.measure("delete"):
+            qdrant.delete(
+                collection_name=collection_name,
+                points_selector=models.PointIdsList(points=sorted(removed)),
+            )
+
+    return {
+        "unchanged": len(ids) - len(new),
+        "added": len(new),
+        "deleted": len(removed),
+    }
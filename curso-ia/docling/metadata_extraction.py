@@ -0,0 +1,231 @@
+# Biblioteca padrão para transformar os exemplos em texto (chave do cache)
+import dataclasses
+
+# Biblioteca padrão para calcular os hashes do cache
+import hashlib
+
+# Biblioteca padrão para ler/gravar JSON e JSONL
+import json
+
+# Biblioteca padrão para variáveis de ambiente e renomear arquivos
+import os
+
+# Biblioteca padrão para identificar a thread nos arquivos temporários
+import threading
+
+# Pool de threads: a extração passa quase todo o tempo esperando o LLM
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Classe para manipulação segura de caminhos de arquivos
+from pathlib import Path
+
+# Biblioteca LangExtract (extração estruturada via LLM)
+import langextract as lx
+
+# Conversão AnnotatedDocument <-> dicionário (mesmo formato do lx.io)
+from langextract import data_lib
+
+# Provider de modelo OpenAI usado pelo LangExtract
+from langextract.providers.openai import OpenAILanguageModel
+
+# ================================
+# EXTRAÇÃO DE METADADOS EM LOTE
+# ================================
+
+# Extrai metadados de vários documentos do Docling ao mesmo tempo:
+# - no máximo `max_in_flight` chamadas ao LLM em andamento, somando todos
+#   os documentos e os trechos de cada um (semáforo único no modelo)
+# - cada resultado fica em cache, indexado por:
+#   hash do texto enviado + prompt + exemplos + modelo
+#   (rodar de novo com o mesmo prompt não paga o LLM outra vez)
+# - cada documento é acrescentado ao JSONL assim que termina, no formato
+#   de lx.io.save_annotated_documents, com a chave do cache; um documento
+#   só é pulado se a chave gravada for a atual. Mudou o PDF, o prompt, os
+#   exemplos ou o modelo: ele é extraído de novo e a nova linha substitui
+#   a anterior (o MetadataIndex fica com a última linha de cada documento)
+#
+# Para testar sem chave de API, use um servidor falso compatível com a
+# API da OpenAI (ex.: Rag/fake_llm_server.py) que responda um JSON fixo:
+#
+#   uv run Rag/fake_llm_server.py --ttft 0 --token-delay 0 \
+#       --answer '{"extractions": [{"title": "Docling Technical Report"}]}'
+#   OPENAI_BASE_URL=http://127.0.0.1:8001/v1 OPENAI_API_KEY=teste \
+#       uv run docling/5-metadados.py
+
+# Pasta do cache (pode ser trocada pela variável METADATA_CACHE_DIR)
+CACHE_DIR = Path(
+    os.getenv("METADATA_CACHE_DIR", Path(__file__).parent / ".metadata_cache")
+)
+
+
+class LimitedOpenAILanguageModel(OpenAILanguageModel):
+    # Toda chamada ao LLM passa por _process_single_prompt, venha ela de
+    # qualquer documento ou da paralelização interna do LangExtract: um
+    # semáforo aqui limita o total de chamadas em andamento
+
+    def __init__(self, *args, max_in_flight=4, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+
+    def _process_single_prompt(self, prompt, config):
+        with self._slots:
+            return super()._process_single_prompt(prompt, config)
+
+
+def build_model(model_id="gpt-4o-mini", api_key=None, base_url=None, max_in_flight=4):
+    # Modelo compartilhado por todas as threads (o cliente da OpenAI é
+    # thread-safe). base_url aponta para um servidor local nos testes
+    return LimitedOpenAILanguageModel(
+        model_id=model_id,
+        api_key=api_key or os.getenv("OPENAI_API_KEY"),
+        base_url=base_url or os.getenv("OPENAI_BASE_URL"),
+        max_in_flight=max_in_flight,
+    )
+
+
+def extraction_key(text, prompt, examples, model_id):
+    # Tudo que altera o resultado da extração entra na chave
+    examples_json = json.dumps(
+        [dataclasses.asdict(example) for example in examples],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+
+    parts = [
+        hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+        hashlib.sha256(examples_json.encode("utf-8")).hexdigest(),
+        model_id,
+    ]
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def document_text(document, max_chars=6000):
+    # Texto enviado ao LLM: início do documento em Markdown
+    return document.export_to_markdown()[:max_chars]
+
+
+def load_cached(cache_path):
+    # AnnotatedDocument salvo, ou None se ainda não existe
+    if not cache_path.exists():
+        return None
+    with open(cache_path, "r", encoding="utf-8") as f:
+        return data_lib.dict_to_annotated_document(json.load(f))
+
+
+def save_cached(cache_path, result):
+    # Grava num arquivo temporário e renomeia: o cache nunca fica pela metade
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data_lib.annotated_document_to_dict(result), f, ensure_ascii=False)
+    os.replace(tmp_path, cache_path)
+
+
+def extract_one(document_id, text, key, prompt, examples, model, cache_dir, max_workers):
+    # Extrai um documento, consultando o cache antes do LLM
+    # Retorna (AnnotatedDocument, origem: "cache" ou "llm")
+    cache_path = Path(cache_dir) / f"{key}.json"
+
+    result = load_cached(cache_path)
+    if result is not None:
+        result.document_id = document_id
+        return result, "cache"
+
+    result = lx.extract(
+        text_or_documents=text,
+        prompt_description=prompt,
+        examples=examples,
+        model=model,
+        # Esquemas não se aplicam quando o modelo é passado pronto
+        use_schema_constraints=False,
+        max_workers=max_workers,
+        show_progress=False,
+    )
+    result.document_id = document_id
+
+    save_cached(cache_path, result)
+    return result, "llm"
+
+
+def written_keys(output_path):
+    # document_id -> chave do cache da última linha gravada no JSONL
+    # (linhas antigas, sem chave, ficam com None e são extraídas de novo)
+    if not output_path.exists():
+        return {}
+    keys = {}
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                keys[record.get("document_id")] = record.get("extraction_key")
+    return keys
+
+
+def extract_batch(
+    documents,
+    prompt,
+    examples,
+    output_path,
+    model_id="gpt-4o-mini",
+    model=None,
+    concurrency=4,
+    max_chars=6000,
+    max_workers=4,
+    cache_dir=CACHE_DIR,
+):
+    # Gerador: extrai os metadados de cada DoclingDocument (identificado
+    # pelo nome) e devolve (document_id, AnnotatedDocument, origem) na
+    # ordem em que terminam, já gravados no JSONL
+    # Um documento com erro não derruba o lote: volta com resultado None,
+    # origem "erro: ..." e fica fora do JSONL (é tentado de novo na próxima)
+    # concurrency: documentos processados ao mesmo tempo; o limite de
+    # chamadas ao LLM fica no modelo (build_model(max_in_flight=...))
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    model = model or build_model(model_id, max_in_flight=concurrency)
+
+    written = written_keys(output_path)
+    pending = []
+    for document in documents:
+        text = document_text(document, max_chars)
+        key = extraction_key(text, prompt, examples, model_id)
+        if written.get(document.name) != key:
+            pending.append((document.name, text, key))
+
+    with (
+        ThreadPoolExecutor(max_workers=concurrency) as pool,
+        open(output_path, "a", encoding="utf-8") as output,
+    ):
+        futures = {
+            pool.submit(
+                extract_one,
+                document_id,
+                text,
+                key,
+                prompt,
+                examples,
+                model,
+                cache_dir,
+                max_workers,
+            ): (document_id, key)
+            for document_id, text, key in pending
+        }
+
+        for future in as_completed(futures):
+            document_id, key = futures[future]
+            try:
+                result, origin = future.result()
+            except Exception as error:
+                yield document_id, None, f"erro: {error!r}"
+                continue
+
+            # Uma linha por documento, gravada assim que ele termina,
+            # com a chave que decide se ele é extraído de novo
+            line = data_lib.annotated_document_to_dict(result)
+            line["extraction_key"] = key
+            output.write(json.dumps(line, ensure_ascii=False) + "\n")
+            output.flush()
+
+            yield document_id, result, origin
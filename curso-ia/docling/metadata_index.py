@@ -0,0 +1,139 @@
+# Biblioteca padrão para identificar o início do arquivo indexado
+import hashlib
+
+# Biblioteca padrão para ler o JSONL e gravar o índice
+import json
+
+# Biblioteca padrão para renomear o índice de forma atômica
+import os
+
+# Classe para manipulação segura de caminhos de arquivos
+from pathlib import Path
+
+# ================================
+# ÍNDICE DE METADADOS
+# ================================
+
+# O JSONL gerado por 5-metadados.py tem uma linha por documento, com todas
+# as extrações. Em vez de ler o arquivo inteiro para cada documento, este
+# índice guarda, ao lado do JSONL (<arquivo>.idx.json), a posição em bytes
+# de cada linha por document_id:
+# - buscar um documento = um seek + uma linha lida (O(1))
+# - o JSONL só cresce (extract_batch acrescenta linhas), então ao abrir o
+#   índice apenas as linhas novas são lidas
+# - se o JSONL for reescrito (início diferente ou menor), o índice é refeito
+
+# Bytes do início do arquivo usados para detectar que ele foi reescrito
+HEAD_BYTES = 1024
+
+
+class MetadataIndex:
+    def __init__(self, jsonl_path, index_path=None):
+        self.jsonl_path = Path(jsonl_path)
+        self.index_path = Path(index_path or f"{self.jsonl_path}.idx.json")
+
+        # document_id -> posição (byte) da linha no JSONL
+        self.offsets = {}
+        self._size = 0
+        self._head = hashlib.sha256(b"").hexdigest()
+
+        self._load()
+        self.refresh()
+
+    def _file_head(self, size):
+        # Hash dos primeiros bytes já indexados (até HEAD_BYTES)
+        with open(self.jsonl_path, "rb") as f:
+            return hashlib.sha256(f.read(min(size, HEAD_BYTES))).hexdigest()
+
+    def _load(self):
+        # Índice salvo anteriormente (se existir)
+        if not self.index_path.exists():
+            return
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        self.offsets = saved["offsets"]
+        self._size = saved["size"]
+        self._head = saved["head"]
+
+    def _save(self):
+        # Grava num arquivo temporário e renomeia (nunca fica pela metade)
+        tmp_path = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"size": self._size, "head": self._head, "offsets": self.offsets}, f
+            )
+        os.replace(tmp_path, self.index_path)
+
+    def refresh(self):
+        # Indexa as linhas acrescentadas desde a última vez
+        if not self.jsonl_path.exists():
+            return
+
+        size = self.jsonl_path.stat().st_size
+
+        # Arquivo reescrito: recomeça do zero
+        if size < self._size or self._file_head(self._size) != self._head:
+            self.offsets, self._size = {}, 0
+
+        if size == self._size:
+            return
+
+        with open(self.jsonl_path, "rb") as f:
+            f.seek(self._size)
+            offset = self._size
+            for line in iter(f.readline, b""):
+                # Linha ainda sendo gravada (sem \n): fica para a próxima vez
+                if not line.endswith(b"\n"):
+                    break
+                if line.strip():
+                    document_id = json.loads(line).get("document_id")
+                    if document_id is not None:
+                        # Se o documento aparecer de novo, vale a linha mais nova
+                        self.offsets[document_id] = offset
+                offset += len(line)
+
+        self._size = offset
+        self._head = self._file_head(offset)
+        self._save()
+
+    def __contains__(self, document_id):
+        return document_id in self.offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def get(self, document_id):
+        # Linha completa do documento (AnnotatedDocument em dict) ou None
+        offset = self.offsets.get(document_id)
+        if offset is None:
+            return None
+        with open(self.jsonl_path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def metadata(self, document_id, default="N/A"):
+        # Resumo usado no payload: primeiro título e primeira URL extraídos
+        metadata = {"title": default, "url": default}
+
+        record = self.get(document_id)
+        if record is None:
+            return metadata
+
+        for extraction in record.get("extractions", []):
+            key = extraction.get("extraction_class", "")
+            if key in metadata and metadata[key] == default:
+                metadata[key] = extraction.get("extraction_text", default)
+
+        return metadata
+
+
+def join_metadata(payloads, index, document_id_key="document_id"):
+    # Junta os metadados nos payloads dos chunks em lote: cada documento
+    # é buscado no índice uma única vez, mesmo com milhares de chunks
+    cache = {}
+    for payload in payloads:
+        document_id = payload[document_id_key]
+        if document_id not in cache:
+            cache[document_id] = index.metadata(document_id)
+        payload["metadata"] = cache[document_id]
+    return payloads
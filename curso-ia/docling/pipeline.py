@@ -0,0 +1,284 @@
+# Biblioteca padrão para ler argumentos da linha de comando
+import argparse
+
+# Biblioteca padrão para as filas limitadas entre as etapas
+import queue
+
+# Biblioteca padrão para as threads de cada etapa
+import threading
+
+# Biblioteca padrão para medir o tempo de cada etapa
+import time
+
+# Classe para manipulação segura de caminhos de arquivos
+from pathlib import Path
+
+# Chunker híbrido (estrutura + limite real de tokens)
+from docling.chunking import HybridChunker
+
+# Conversor principal de documentos (PDF → documento estruturado)
+from docling.document_converter import DocumentConverter
+
+# Cliente oficial do Qdrant (banco vetorial)
+from qdrant_client import QdrantClient
+
+# Biblioteca para carregar tokenizer do modelo de embedding
+from transformers import AutoTokenizer
+
+# Busca de PDFs em diretório ou glob (mesma regra da conversão em lote)
+from batch_conversion import collect_pdfs
+
+# Cache de conversão local
+from conversion_cache import convert_cached
+
+# Embedding explícito em lote (com cache de vetores) e upload de vetores prontos
+from embedding import EmbeddingCache, load_embedder
+
+# Reindexação incremental: só chunks novos/alterados são enviados
+from incremental_index import ensure_collection, sync_document
+
+# Índice dos metadados extraídos por 5-metadados.py
+from metadata_index import MetadataIndex
+
+# Tokenização memoizada e chunks com tokens
+from token_cache import CachingTokenizer, chunk_with_tokens
+
+# ================================
+# PIPELINE COM ETAPAS SOBREPOSTAS
+# ================================
+
+# Conversão → chunking → metadados → embedding/upload, ligadas por filas
+# limitadas. Cada etapa tem suas próprias threads, então enquanto o
+# documento N é enviado ao Qdrant, o N+1 está no chunking e o N+2 na
+# conversão:
+#
+#   uv run docling/pipeline.py relatorios/ --convert-workers 2 --chunk-workers 2
+#
+# - as filas limitadas seguram a etapa rápida quando a seguinte atrasa
+#   (a memória não cresce com o tamanho do corpus)
+# - ao final, a utilização de cada etapa (tempo ocupado / tempo total
+#   × threads) mostra o gargalo: é a etapa que merece mais threads
+# - um documento com erro numa etapa é descartado e contado, sem parar o resto
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+MAX_TOKENS = 300
+
+# Marca de fim de fluxo que atravessa as filas
+DONE = object()
+
+
+class Stage:
+    # Uma etapa: função aplicada a cada item, com `workers` threads
+
+    def __init__(self, name, fn, workers=1):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+
+        self.items = 0
+        self.errors = []
+        self.busy = 0.0  # segundos somados de todas as threads processando
+        self._lock = threading.Lock()
+        self._running = workers
+
+    def run(self, inbox, outbox):
+        # Loop de cada thread: lê da fila de entrada, grava na de saída
+        while True:
+            item = inbox.get()
+            if item is DONE:
+                # Devolve a marca para as outras threads desta etapa
+                inbox.put(DONE)
+                break
+
+            start = time.perf_counter()
+            try:
+                result = self.fn(item)
+            except Exception as error:
+                result = None
+                with self._lock:
+                    self.errors.append(repr(error))
+            elapsed = time.perf_counter() - start
+
+            with self._lock:
+                self.busy += elapsed
+                self.items += result is not None
+
+            if result is not None:
+                outbox.put(result)
+
+        # A última thread a sair avisa a etapa seguinte
+        with self._lock:
+            self._running -= 1
+            last = self._running == 0
+        if last:
+            outbox.put(DONE)
+
+    def utilisation(self, elapsed):
+        # Fração do tempo em que as threads da etapa estiveram ocupadas
+        return self.busy / (elapsed * self.workers) if elapsed else 0.0
+
+
+def run_pipeline(sources, stages, queue_size=4):
+    # Gerador: devolve a saída da última etapa à medida que fica pronta
+    queues = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+
+    threads = []
+    for stage, inbox, outbox in zip(stages, queues, queues[1:]):
+        for _ in range(stage.workers):
+            thread = threading.Thread(target=stage.run, args=(inbox, outbox), daemon=True)
+            thread.start()
+            threads.append(thread)
+
+    # Alimenta a primeira fila numa thread (ela também respeita o limite)
+    def feed():
+        for source in sources:
+            queues[0].put(source)
+        queues[0].put(DONE)
+
+    threading.Thread(target=feed, daemon=True).start()
+
+    while (item := queues[-1].get()) is not DONE:
+        yield item
+
+    for thread in threads:
+        thread.join()
+
+
+def format_report(stages, elapsed, documents, chunks):
+    # Tabela de utilização por etapa + throughput de ponta a ponta
+    lines = [f"{'etapa':<10} {'threads':>7} {'itens':>6} {'ocupado':>9} {'utiliz.':>8} {'erros':>6}"]
+    for stage in stages:
+        lines.append(
+            f"{stage.name:<10} {stage.workers:>7} {stage.items:>6} "
+            f"{stage.busy:>8.1f}s {stage.utilisation(elapsed):>7.0%} "
+            f"{len(stage.errors):>6}"
+        )
+
+    bottleneck = max(stages, key=lambda stage: stage.utilisation(elapsed))
+    lines.append("-" * 52)
+    lines.append(
+        f"{documents} documentos, {chunks} chunks em {elapsed:.1f}s | "
+        f"{documents / elapsed:.2f} documentos/s | gargalo: {bottleneck.name}"
+    )
+    return "\n".join(lines)
+
+
+# ================================
+# ETAPAS DO FLUXO DO DOCLING
+# ================================
+
+
+def build_stages(args, qdrant, embedder):
+    # Cada thread tem seu próprio conversor e chunker (não são compartilhados)
+    # O modelo de embedding e o cache de vetores são compartilhados
+    local = threading.local()
+    metadata_index = MetadataIndex(args.metadata)
+    embedding_cache = EmbeddingCache(MODEL_NAME)
+
+    def convert(pdf_path):
+        if not hasattr(local, "converter"):
+            local.converter = DocumentConverter()
+        return convert_cached(local.converter, pdf_path)
+
+    def chunk(document):
+        if not hasattr(local, "chunker"):
+            tokenizer = CachingTokenizer(
+                tokenizer=AutoTokenizer.from_pretrained(MODEL_NAME),
+                max_tokens=MAX_TOKENS,
+            )
+            local.chunker = HybridChunker(
+                tokenizer=tokenizer, max_tokens=MAX_TOKENS, merge_peers=True
+            )
+        return document.name, list(chunk_with_tokens(local.chunker, document))
+
+    def metadata(item):
+        # Metadados do documento (uma busca no índice), juntados a cada chunk
+        document_id, chunks = item
+        info = metadata_index.metadata(document_id)
+        payloads = [
+            {
+                "text": chunk.text,
+                "token_count": chunk.token_count,
+                "document_id": document_id,
+                "metadata": info,
+            }
+            for chunk in chunks
+        ]
+        return document_id, chunks, payloads
+
+    def upload(item):
+        # Embedding em lote (com cache) + envio ao Qdrant, só dos chunks
+        # novos ou alterados; reprocessar um documento igual não envia nada
+        document_id, chunks, payloads = item
+        sync_document(
+            qdrant,
+            args.collection,
+            document_id,
+            chunks,
+            payloads,
+            embedder,
+            cache=embedding_cache,
+            upload_parallel=1,
+        )
+        return document_id, len(payloads)
+
+    return [
+        Stage("conversão", convert, args.convert_workers),
+        Stage("chunking", chunk, args.chunk_workers),
+        Stage("metadados", metadata, args.metadata_workers),
+        Stage("upload", upload, args.upload_workers),
+    ]
+
+
+def main(args):
+    pdf_paths = collect_pdfs(args.source)
+    print(f"{len(pdf_paths)} PDFs encontrados")
+
+    qdrant = QdrantClient(path=args.qdrant_path)
+    embedder = load_embedder(MODEL_NAME)
+    legacy = ensure_collection(qdrant, args.collection, embedder.embedding_size)
+    if legacy:
+        print(f"{legacy} pontos antigos (sem document_id) removidos da coleção")
+
+    stages = build_stages(args, qdrant, embedder)
+
+    start = time.perf_counter()
+    documents = chunks = 0
+    for document_id, chunk_count in run_pipeline(pdf_paths, stages, args.queue_size):
+        documents += 1
+        chunks += chunk_count
+        print(f"{document_id}: {chunk_count} chunks ({time.perf_counter() - start:.1f}s)")
+    elapsed = time.perf_counter() - start
+
+    print("-" * 52)
+    print(format_report(stages, elapsed, documents, chunks))
+    for stage in stages:
+        for error in stage.errors:
+            print(f"[erro em {stage.name}] {error}")
+
+    qdrant.close()
+
+
+# ================================
+# EXECUÇÃO
+# ================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pipeline docling → Qdrant com etapas sobrepostas")
+    parser.add_argument("source", help="diretório ou padrão glob de PDFs")
+    parser.add_argument("--convert-workers", type=int, default=2)
+    parser.add_argument("--chunk-workers", type=int, default=2)
+    parser.add_argument("--metadata-workers", type=int, default=1)
+    parser.add_argument("--upload-workers", type=int, default=1)
+    parser.add_argument("--queue-size", type=int, default=4, help="itens por fila entre etapas")
+    parser.add_argument(
+        "--metadata",
+        default=str(
+            Path(__file__).parent.parent / "test_output" / "docling_paper_metadata.jsonl"
+        ),
+    )
+    parser.add_argument("--qdrant-path", default="db/data")
+    parser.add_argument("--collection", default="docling_paper")
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,185 @@
+# Biblioteca padrão para ler argumentos da linha de comando
+import argparse
+
+# Biblioteca padrão para descobrir o número de CPUs
+import os
+
+# Biblioteca padrão para medir o tempo até o primeiro chunk
+import time
+
+# Pool de processos: cada worker converte um intervalo de páginas
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+# "spawn" cria processos limpos (mais seguro com PyTorch/ONNX que "fork")
+from multiprocessing import get_context
+
+# Classe para manipulação segura de caminhos de arquivos
+from pathlib import Path
+
+# Leitura rápida do PDF (só para contar as páginas, sem converter)
+import pypdfium2 as pdfium
+
+# Chunker híbrido (estrutura + limite real de tokens)
+from docling.chunking import HybridChunker
+
+# Documento estruturado do Docling (usado para juntar os pedaços)
+from docling_core.types.doc import DoclingDocument
+
+# Tokenizer compatível com HuggingFace para contagem real de tokens
+from docling_core.transforms.chunker.tokenizer.huggingface import HuggingFaceTokenizer
+
+# Biblioteca para carregar tokenizer do modelo de embedding
+from transformers import AutoTokenizer
+
+# Conversor reaproveitado por worker (mesmo da conversão em lote)
+from batch_conversion import init_worker, worker_converter
+
+# ================================
+# CONVERSÃO POR INTERVALOS DE PÁGINAS
+# ================================
+
+# Um PDF grande (ex.: relatório anual de 400 páginas) vira vários
+# intervalos de páginas convertidos em paralelo:
+#
+#   uv run docling/sharded_conversion.py relatorio.pdf --shard-size 20 --chunk
+#
+# - os intervalos são devolvidos EM ORDEM assim que ficam prontos, então o
+#   HybridChunker já começa no primeiro enquanto os demais convertem
+# - ao final, DoclingDocument.concatenate junta os pedaços num único
+#   documento; como os intervalos são contíguos, os números de página
+#   originais e a ordem de leitura são preservados
+#
+# Limitação: chunks não atravessam a fronteira entre dois intervalos.
+
+EMBED_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+MAX_TOKENS = 300
+
+
+def page_count(pdf_path):
+    # Conta as páginas sem rodar o pipeline do Docling
+    pdf = pdfium.PdfDocument(str(pdf_path))
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def shard_ranges(total_pages, shard_size):
+    # Intervalos 1-based e inclusivos, no formato do page_range do Docling
+    return [
+        (start, min(start + shard_size - 1, total_pages))
+        for start in range(1, total_pages + 1, shard_size)
+    ]
+
+
+def convert_shard(pdf_path, page_range):
+    # Executado no worker: converte só o intervalo de páginas
+    result = worker_converter().convert(pdf_path, page_range=page_range)
+
+    # Dicionário JSON atravessa a fronteira entre processos com segurança
+    return result.document.export_to_dict()
+
+
+def convert_sharded(
+    pdf_path, shard_size=20, workers=None, document_timeout=None, num_threads=None
+):
+    # Gerador: devolve (intervalo, DoclingDocument) em ordem de página,
+    # cada um assim que ele e todos os anteriores estiverem prontos
+    ranges = shard_ranges(page_count(pdf_path), shard_size)
+
+    workers = workers or max(1, min(len(ranges), (os.cpu_count() or 2) // 2))
+    num_threads = num_threads or max(1, (os.cpu_count() or 1) // workers)
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=get_context("spawn"),
+        initializer=init_worker,
+        initargs=(document_timeout, num_threads),
+    ) as pool:
+        # Submetidos em ordem: os primeiros intervalos começam primeiro
+        pending = {
+            pool.submit(convert_shard, str(pdf_path), page_range): index
+            for index, page_range in enumerate(ranges)
+        }
+
+        ready = {}
+        next_index = 0
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                ready[pending.pop(future)] = future.result()
+
+            # Libera os intervalos que já podem sair em ordem
+            while next_index in ready:
+                document = DoclingDocument.model_validate(ready.pop(next_index))
+                yield ranges[next_index], document
+                next_index += 1
+
+
+def merge_shards(documents, name):
+    # Junta os intervalos num único documento (páginas e ordem preservadas)
+    merged = DoclingDocument.concatenate(documents)
+    merged.name = name
+    return merged
+
+
+def build_chunker():
+    # Mesma configuração de 4-hybrid-chunker.py
+    tokenizer = HuggingFaceTokenizer(
+        tokenizer=AutoTokenizer.from_pretrained(EMBED_MODEL),
+        max_tokens=MAX_TOKENS,
+    )
+    return HybridChunker(tokenizer=tokenizer, max_tokens=MAX_TOKENS, merge_peers=True)
+
+
+def main(args):
+    pdf_path = Path(args.pdf)
+    chunker = build_chunker() if args.chunk else None
+
+    start = time.perf_counter()
+    first_chunk_at = None
+    shards = []
+    chunk_count = 0
+
+    for (first_page, last_page), document in convert_sharded(
+        pdf_path, args.shard_size, args.workers, args.timeout, args.threads
+    ):
+        shards.append(document)
+        print(
+            f"Páginas {first_page}-{last_page} prontas "
+            f"em {time.perf_counter() - start:.1f}s"
+        )
+
+        # Chunking do intervalo enquanto os próximos ainda convertem
+        if chunker is not None:
+            for _ in chunker.chunk(document):
+                if first_chunk_at is None:
+                    first_chunk_at = time.perf_counter() - start
+                chunk_count += 1
+
+    merged = merge_shards(shards, pdf_path.stem)
+    merged.save_as_json(args.output)
+    elapsed = time.perf_counter() - start
+
+    print("-" * 80)
+    print(f"{len(merged.pages)} páginas convertidas em {elapsed:.1f}s -> {args.output}")
+    if first_chunk_at is not None:
+        print(f"{chunk_count} chunks | tempo até o primeiro chunk: {first_chunk_at:.1f}s")
+
+
+# ================================
+# EXECUÇÃO
+# ================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Conversão de PDF grande em intervalos")
+    parser.add_argument("pdf")
+    parser.add_argument("--shard-size", type=int, default=20, help="páginas por intervalo")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--threads", type=int, default=None, help="threads por worker")
+    parser.add_argument("--timeout", type=float, default=None, help="segundos por intervalo")
+    parser.add_argument("--output", default="merged.json")
+    parser.add_argument("--chunk", action="store_true", help="chunking durante a conversão")
+    args = parser.parse_args()
+
+    main(args)
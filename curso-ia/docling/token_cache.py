@@ -0,0 +1,73 @@
+# Dicionário ordenado: permite descartar o texto usado há mais tempo (LRU)
+from collections import OrderedDict
+
+# Atributos privados em modelos pydantic (o tokenizer do Docling é um BaseModel)
+from pydantic import PrivateAttr
+
+# Tokenizer compatível com HuggingFace para contagem real de tokens
+from docling_core.transforms.chunker.tokenizer.huggingface import HuggingFaceTokenizer
+
+# ================================
+# TOKENIZAÇÃO MEMOIZADA
+# ================================
+
+# O HybridChunker conta tokens do mesmo trecho várias vezes (divisão por
+# itens, merge_peers, contextualização) e os scripts ainda contavam o texto
+# final de novo. Este tokenizer guarda os tokens de cada texto: no chunking,
+# cada trecho passa pelo tokenizer do HuggingFace uma única vez.
+#
+# Só a contagem segue com o chunk. O embedding (fastembed) recebe texto e
+# tokeniza de novo com o próprio tokenizer; IDs guardados aqui não teriam
+# como ser reaproveitados por ele.
+
+
+class CachingTokenizer(HuggingFaceTokenizer):
+    # Número máximo de textos guardados (os menos usados saem primeiro)
+    cache_size: int = 65536
+
+    _tokens: OrderedDict = PrivateAttr(default_factory=OrderedDict)
+    _stats: dict = PrivateAttr(
+        default_factory=lambda: {"count_calls": 0, "tokenizer_calls": 0}
+    )
+
+    def tokenize(self, text):
+        # Tokens do texto, calculados só na primeira vez
+        self._stats["count_calls"] += 1
+
+        tokens = self._tokens.get(text)
+        if tokens is None:
+            self._stats["tokenizer_calls"] += 1
+            tokens = self.tokenizer.tokenize(text=text)
+            self._tokens[text] = tokens
+            if len(self._tokens) > self.cache_size:
+                self._tokens.popitem(last=False)
+        else:
+            self._tokens.move_to_end(text)
+
+        return tokens
+
+    def count_tokens(self, text):
+        # Mesmo resultado de HuggingFaceTokenizer.count_tokens, com cache
+        return len(self.tokenize(text))
+
+    def stats(self):
+        # count_calls: pedidos de contagem | tokenizer_calls: tokenizações reais
+        return dict(self._stats, cached_texts=len(self._tokens))
+
+
+class TokenizedChunk:
+    # Chunk do Docling + contagem de tokens do texto, para as etapas
+    # seguintes (exibição, payload) não contarem de novo
+
+    def __init__(self, chunk, token_count):
+        self.chunk = chunk
+        self.text = chunk.text
+        self.token_count = token_count
+
+
+def chunk_with_tokens(chunker, document):
+    # Gera os chunks do documento já com a contagem de tokens
+    # O chunker deve usar um CachingTokenizer (a contagem sai do cache)
+    tokenizer = chunker.tokenizer
+    for chunk in chunker.chunk(document):
+        yield TokenizedChunk(chunk, tokenizer.count_tokens(chunk.text))
@@ -1,12 +1,27 @@
 import json
+import os
 from http import HTTPStatus
+from typing import Dict, List, Tuple
 
-from fastapi import APIRouter
-from pydantic import BaseModel
-from starlette.responses import Response
+import orjson
+from fastapi import APIRouter, Request
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from starlette.responses import Response, StreamingResponse
 
 router = APIRouter()
 
+# Eventos validados de uma vez por lote no endpoint /bulk
+BULK_BATCH_SIZE = int(os.getenv("EVENTS_BATCH_SIZE", "1000"))
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    # Resposta em streaming cujo gerador ainda lê o corpo da requisição. O
+    # StreamingResponse padrão escuta a desconexão em paralelo e consumiria as
+    # mensagens do corpo; aqui a desconexão chega pelo próprio request.stream()
+    # (ClientDisconnect)
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
 
 class EventSchema(BaseModel):
     event_id: str
@@ -14,6 +29,9 @@ class EventSchema(BaseModel):
     event_data: dict
 
 
+EVENT_BATCH = TypeAdapter(List[EventSchema])
+
+
 @router.post("/", dependencies=[])
 def handle_event(data: EventSchema) -> Response:
     print(data)
@@ -22,3 +40,106 @@ def handle_event(data: EventSchema) -> Response:
         content=json.dumps({"message": "Event received successfully!"}),
         status_code=HTTPStatus.ACCEPTED,
     )
+
+
+async def ndjson_lines(request: Request):
+    # Lê o corpo conforme chega, sem carregar tudo em memória.
+    # Gera (número da linha, linha) para as linhas não vazias
+    buffer = b""
+    line_number = 0
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+
+def validate_batch(
+    line_numbers: List[int], objects: List
+) -> Tuple[List[EventSchema], Dict[int, str]]:
+    # Um único validate_python para o lote; só com erro valida item a item
+    try:
+        return EVENT_BATCH.validate_python(objects), {}
+    except ValidationError as exc:
+        errors = {}
+        for error in exc.errors():
+            index = error["loc"][0]
+            field = ".".join(str(part) for part in error["loc"][1:])
+            errors.setdefault(line_numbers[index], f"{field}: {error['msg']}")
+        events = [
+            EventSchema.model_validate(obj)
+            for number, obj in zip(line_numbers, objects)
+            if number not in errors
+        ]
+        return events, errors
+
+
+def process_batch(events: List[EventSchema]):
+    print(f"{len(events)} eventos recebidos")
+
+
+def acknowledge(
+    batch: int, line_numbers: List[int], objects: List, errors: Dict[int, str]
+) -> dict:
+    # errors: linhas com JSON inválido; somam-se as que falharam na validação
+    received = len(line_numbers) + len(errors)
+    events, invalid = validate_batch(line_numbers, objects) if objects else ([], {})
+    errors = {**errors, **invalid}
+    if events:
+        process_batch(events)
+
+    return {
+        "batch": batch,
+        "received": received,
+        "accepted": len(events),
+        "rejected": [{"line": number, "error": error} for number, error in sorted(errors.items())],
+    }
+
+
+@router.post("/bulk", dependencies=[])
+async def handle_bulk(request: Request) -> DuplexStreamingResponse:
+    # Corpo NDJSON (um EventSchema por linha), validado em lotes de
+    # BULK_BATCH_SIZE. A resposta também é NDJSON: uma linha de ack assim que
+    # cada lote é validado e, no final, uma linha com os totais
+    async def acks():
+        batches = received = accepted = 0
+        line_numbers, objects, errors = [], [], {}
+
+        def flush():
+            nonlocal batches, received, accepted
+            ack = acknowledge(batches, line_numbers, objects, errors)
+            batches += 1
+            received += ack["received"]
+            accepted += ack["accepted"]
+            return orjson.dumps(ack) + b"\n"
+
+        async for number, line in ndjson_lines(request):
+            try:
+                objects.append(orjson.loads(line))
+                line_numbers.append(number)
+            except orjson.JSONDecodeError as exc:
+                errors[number] = f"JSON inválido: {exc}"
+
+            if len(line_numbers) + len(errors) >= BULK_BATCH_SIZE:
+                yield flush()
+                line_numbers, objects, errors = [], [], {}
+
+        if line_numbers or errors:
+            yield flush()
+
+        yield orjson.dumps(
+            {
+                "received": received,
+                "accepted": accepted,
+                "rejected": received - accepted,
+                "batches": batches,
+            }
+        ) + b"\n"
+
+    return DuplexStreamingResponse(
+        acks(), status_code=HTTPStatus.ACCEPTED, media_type="application/x-ndjson"
+    )
@@ -1,5 +1,21 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from router import router as process_router
+from search import MODELS
+from utils.model_registry import registry
+from utils.qdrant_pool import QdrantPool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Um cliente assíncrono (e pool de conexões) para todas as requisições
+    app.state.qdrant = QdrantPool()
+    await app.state.qdrant.start()
+    registry.prewarm(MODELS)
+    yield
+    await app.state.qdrant.close()
+
 
-app = FastAPI()
-app.include_router(process_router)
\ No newline at end of file
+app = FastAPI(lifespan=lifespan)
+app.include_router(process_router)
@@ -0,0 +1,170 @@
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Optional
+
+import numpy as np
+from fastapi import APIRouter, Request
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import StreamingResponse
+
+from utils.hybrid_search import build_filter, fused_query_async, rerank_async
+from utils.model_registry import registry
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+DENSE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+SPARSE_MODEL = "Qdrant/bm25"
+COLBERT_MODEL = "colbert-ir/colbertv2.0"
+COLLECTION_NAME = "financial"
+MODELS = [("dense", DENSE_MODEL), ("sparse", SPARSE_MODEL), ("colbert", COLBERT_MODEL)]
+
+
+class SearchMetrics:
+    # Latências das últimas buscas em streaming: tempo até o primeiro
+    # resultado (fusão RRF) e até a ordem final (rerank ColBERT)
+
+    def __init__(self, window: int = 1000):
+        self.first_result = deque(maxlen=window)
+        self.final_result = deque(maxlen=window)
+
+    def summary(self) -> dict:
+        def percentiles(values):
+            if not values:
+                return None
+            ms = np.array(values) * 1000
+            return {
+                "p50_ms": float(np.percentile(ms, 50)),
+                "p95_ms": float(np.percentile(ms, 95)),
+            }
+
+        return {
+            "searches": len(self.final_result),
+            "time_to_first_result": percentiles(self.first_result),
+            "time_to_final_result": percentiles(self.final_result),
+        }
+
+
+metrics = SearchMetrics()
+
+
+def embed_candidates(query: str):
+    # CPU: roda no threadpool para não bloquear o event loop
+    dense = list(registry.get("dense", DENSE_MODEL).query_embed([query]))[0].tolist()
+    sparse = list(registry.get("sparse", SPARSE_MODEL).query_embed([query]))[0].as_object()
+    return dense, sparse
+
+
+def embed_colbert(query: str):
+    return list(registry.get("colbert", COLBERT_MODEL).query_embed([query]))[0].tolist()
+
+
+def embed_query(query: str):
+    return (*embed_candidates(query), embed_colbert(query))
+
+
+def serialize(points):
+    return [{"id": point.id, "score": point.score, "payload": point.payload} for point in points]
+
+
+def sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.get("/")
+async def search(
+    request: Request,
+    q: str,
+    ticker: Optional[str] = None,
+    form_type: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    limit: int = 3,
+):
+    dense, sparse, colbert = await run_in_threadpool(embed_query, q)
+
+    results = await request.app.state.qdrant.hybrid_query(
+        COLLECTION_NAME,
+        dense,
+        sparse,
+        colbert,
+        query_filter=build_filter(ticker, form_type, date_from, date_to),
+        limit=limit,
+    )
+
+    return {"query": q, "results": serialize(results.points)}
+
+
+@router.get("/stream")
+async def search_stream(
+    request: Request,
+    q: str,
+    ticker: Optional[str] = None,
+    form_type: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    limit: int = 3,
+):
+    # Server-Sent Events: "fused" com todos os candidatos do dense + sparse
+    # -> RRF assim que saem; "reranked" com os `limit` melhores desses mesmos
+    # candidatos na ordem do ColBERT, então o cliente nunca recebe no rerank
+    # um ponto que não viu antes. O embedding ColBERT da query roda enquanto a
+    # fusão consulta o Qdrant.
+    start = time.perf_counter()
+    pool = request.app.state.qdrant
+    query_filter = build_filter(ticker, form_type, date_from, date_to)
+
+    async def events():
+        colbert_task = asyncio.ensure_future(run_in_threadpool(embed_colbert, q))
+        try:
+            dense, sparse = await run_in_threadpool(embed_candidates, q)
+            fused = await pool.run(
+                fused_query_async, COLLECTION_NAME, dense, sparse, query_filter
+            )
+            first_result = time.perf_counter() - start
+            metrics.first_result.append(first_result)
+            yield sse(
+                "fused",
+                {
+                    "results": serialize(fused.points),
+                    "elapsed_ms": first_result * 1000,
+                },
+            )
+
+            if fused.points:
+                reranked = await pool.run(
+                    rerank_async,
+                    COLLECTION_NAME,
+                    await colbert_task,
+                    [point.id for point in fused.points],
+                    limit,
+                )
+                points = reranked.points
+            else:
+                points = []
+            final_result = time.perf_counter() - start
+            metrics.final_result.append(final_result)
+            yield sse(
+                "reranked",
+                {"results": serialize(points), "elapsed_ms": final_result * 1000},
+            )
+        except Exception:
+            # Detalhes só no log: a mensagem da exceção pode expor a infraestrutura
+            logger.exception("Falha na busca em streaming")
+            yield sse("error", {"message": "Falha na busca"})
+        finally:
+            colbert_task.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/metrics")
+async def search_metrics():
+    return metrics.summary()
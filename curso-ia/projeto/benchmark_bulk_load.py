@@ -0,0 +1,83 @@
+import argparse
+import random
+import time
+
+import numpy as np
+from qdrant_client import QdrantClient
+
+from benchmark_filters import create_collection, synthetic_points
+from utils.bulk_loader import bulk_load, format_report, restore_indexing
+
+# Throughput de carga: comportamento atual de ingestion.py
+# (upload_points com batch_size=5, HNSW construído durante a carga) contra
+# bulk_load (indexação adiada, lote adaptativo, upserts em paralelo):
+#
+#   docker run -p 6333:6333 qdrant/qdrant
+#   uv run projeto/benchmark_bulk_load.py --points 20000
+#
+# Os dois tempos incluem a espera até a coleção ficar GREEN (indexada).
+# Com --qdrant-url :memory: roda no modo local, que não constrói HNSW nem
+# aceita upserts concorrentes (workers=1): serve só para validar o fluxo.
+
+COLLECTION_NAME = "financial_bulk_benchmark"
+
+
+def baseline(qdrant: QdrantClient, points, batch_size: int):
+    start = time.perf_counter()
+    qdrant.upload_points(collection_name=COLLECTION_NAME, points=points, batch_size=batch_size)
+    upload_seconds = time.perf_counter() - start
+
+    index_start = time.perf_counter()
+    info = qdrant.get_collection(COLLECTION_NAME)
+    restore_indexing(qdrant, COLLECTION_NAME, info.config.optimizer_config.indexing_threshold)
+    index_seconds = time.perf_counter() - index_start
+
+    return {
+        "points": len(points),
+        "batches": -(-len(points) // batch_size),
+        "retries": 0,
+        "upload_seconds": upload_seconds,
+        "index_seconds": index_seconds,
+        "points_per_second": len(points) / (upload_seconds + index_seconds),
+    }
+
+
+def main(args):
+    tickers = [f"T{i:04d}" for i in range(args.tickers)]
+    rng = np.random.default_rng(42)
+    random.seed(42)
+    points = list(synthetic_points(tickers, args.points, rng))
+
+    if args.qdrant_url == ":memory:":
+        qdrant, workers = QdrantClient(":memory:"), 1
+    else:
+        qdrant, workers = QdrantClient(url=args.qdrant_url, timeout=120), args.workers
+
+    create_collection(qdrant, COLLECTION_NAME)
+    current = baseline(qdrant, points, args.baseline_batch_size)
+
+    create_collection(qdrant, COLLECTION_NAME)
+    bulk = bulk_load(qdrant, COLLECTION_NAME, points, workers=workers)
+
+    print("-" * 80)
+    print(format_report("atual", current))
+    print(format_report("bulk_load", bulk))
+    print(
+        f"ganho: {bulk['points_per_second'] / current['points_per_second']:.1f}x | "
+        f"lote final: {bulk['final_batch_size']}"
+    )
+
+    qdrant.delete_collection(COLLECTION_NAME)
+    qdrant.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de carga em massa no Qdrant")
+    parser.add_argument("--points", type=int, default=20000)
+    parser.add_argument("--tickers", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--baseline-batch-size", type=int, default=5)
+    parser.add_argument("--qdrant-url", default="http://localhost:6333")
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,99 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from utils import model_registry
+from utils.embedding_runtime import EmbeddingRuntime
+from utils.semantic_chunker import SemanticChunker
+
+# Compara os backends do encoder do SemanticChunker em CPU:
+#
+#   uv run projeto/benchmark_chunker.py --threads 1,2,4 --tolerance 0.9
+#
+# - throughput: parágrafos/s no encoder, por backend e número de threads
+# - fronteiras: chunks gerados por cada backend vs. o baseline PyTorch
+#   (Jaccard entre os conjuntos de chunks); abaixo da tolerância, sai com erro
+# - similaridade: cosseno médio/mínimo entre os vetores e os do baseline
+
+BASELINE = "torch"
+
+
+def chunk_agreement(chunks, baseline_chunks) -> float:
+    chunks, baseline_chunks = set(chunks), set(baseline_chunks)
+    union = chunks | baseline_chunks
+    return len(chunks & baseline_chunks) / len(union) if union else 1.0
+
+
+def throughput(runtime: EmbeddingRuntime, paragraphs, repeats: int) -> float:
+    runtime.embed(paragraphs[:8])  # aquecimento (load + primeira inferência)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        runtime.embed(paragraphs)
+    return len(paragraphs) * repeats / (time.perf_counter() - start)
+
+
+def main(args):
+    text = Path(args.text).read_text(encoding="utf-8")
+    paragraphs = SemanticChunker.split_paragraphs(text)
+    backends = args.backends.split(",")
+    thread_counts = [int(t) for t in args.threads.split(",")]
+
+    print(f"{len(paragraphs)} parágrafos de {args.text}")
+    print("-" * 80)
+
+    vectors, chunks = {}, {}
+    for threads in thread_counts:
+        # Registry novo por configuração: os loaders leem EMBED_THREADS no load
+        model_registry.EMBED_THREADS = threads
+        registry = model_registry.ModelRegistry()
+
+        for backend in backends:
+            runtime = EmbeddingRuntime(backend=backend, registry=registry)
+            rate = throughput(runtime, paragraphs, args.repeats)
+            print(f"{backend:<10} threads={threads:<3} {rate:>9.1f} parágrafos/s")
+
+            if backend not in chunks:
+                vectors[backend] = runtime.embed(paragraphs)
+                chunker = SemanticChunker(max_tokens=args.max_tokens, runtime=runtime)
+                chunks[backend] = chunker.create_chunks(text)
+
+    if BASELINE not in chunks:
+        return 0
+
+    print("-" * 80)
+    failed = False
+    for backend in backends:
+        if backend == BASELINE:
+            continue
+        cosine = (vectors[backend] * vectors[BASELINE]).sum(axis=1)
+        agreement = chunk_agreement(chunks[backend], chunks[BASELINE])
+        ok = agreement >= args.tolerance
+        failed |= not ok
+        print(
+            f"{backend:<10} fronteiras iguais ao {BASELINE}: {agreement:.1%} "
+            f"({len(chunks[backend])} vs {len(chunks[BASELINE])} chunks) | "
+            f"cosseno médio {np.mean(cosine):.4f}, mínimo {np.min(cosine):.4f} "
+            f"[{'ok' if ok else 'FALHOU'}]"
+        )
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark dos backends do SemanticChunker")
+    parser.add_argument(
+        "--text", default=str(Path(__file__).parent / "AAPL_10-K_1A_temp.md")
+    )
+    parser.add_argument("--backends", default="torch,onnx,onnx-int8")
+    parser.add_argument("--threads", default="1,2,4")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--max-tokens", type=int, default=300)
+    parser.add_argument(
+        "--tolerance", type=float, default=0.9, help="fração mínima de chunks iguais"
+    )
+    args = parser.parse_args()
+
+    sys.exit(main(args))
@@ -0,0 +1,135 @@
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import orjson
+
+# Eventos/s: POST /events/ (um evento por requisição) x POST /events/bulk
+# (corpo NDJSON enviado em streaming, validado em lotes):
+#
+#   uv run projeto/benchmark_events.py --events 20000 --concurrency 32
+#
+# O servidor (uvicorn, só com o router de eventos) sobe num subprocesso com
+# a saída descartada, para o print por evento não dominar a medição.
+
+APP_DIR = Path(__file__).resolve().parent / "app"
+
+
+def serve(port: int):
+    sys.path.insert(0, str(APP_DIR))
+    import endpoint
+    import uvicorn
+    from fastapi import FastAPI
+
+    app = FastAPI()
+    app.include_router(endpoint.router, prefix="/events")
+    uvicorn.run(app, port=port, log_level="warning", access_log=False)
+
+
+def make_events(n: int):
+    return [
+        {
+            "event_id": f"evt-{i}",
+            "event_type": "filing.published",
+            "event_data": {"ticker": "AAPL", "form_type": "10-Q", "sequence": i},
+        }
+        for i in range(n)
+    ]
+
+
+async def run_single(client: httpx.AsyncClient, events, concurrency: int) -> int:
+    pending = iter(events)
+    accepted = 0
+
+    async def worker():
+        nonlocal accepted
+        for event in pending:
+            response = await client.post("/events/", json=event)
+            accepted += response.status_code == 202
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return accepted
+
+
+async def run_bulk(client: httpx.AsyncClient, events, chunk_events: int) -> int:
+    async def body():
+        for start in range(0, len(events), chunk_events):
+            yield b"".join(
+                orjson.dumps(event) + b"\n" for event in events[start : start + chunk_events]
+            )
+
+    # A resposta é NDJSON: um ack por lote conforme é validado e, por último,
+    # a linha com os totais
+    async with client.stream("POST", "/events/bulk", content=body()) as response:
+        lines = [orjson.loads(line) async for line in response.aiter_lines() if line]
+    acks, totals = lines[:-1], lines[-1]
+    assert sum(ack["accepted"] for ack in acks) == totals["accepted"]
+    return totals["accepted"]
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            await client.get("/docs")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError("servidor não subiu")
+
+
+async def benchmark(args):
+    events = make_events(args.events)
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=300
+    ) as client:
+        await wait_ready(client)
+        await run_single(client, events[: args.concurrency], args.concurrency)  # aquecimento
+
+        results = []
+        for name, run in [
+            ("um por requisição", lambda: run_single(client, events, args.concurrency)),
+            ("bulk NDJSON", lambda: run_bulk(client, events, args.chunk_events)),
+        ]:
+            start = time.perf_counter()
+            accepted = await run()
+            elapsed = time.perf_counter() - start
+            results.append((name, accepted, elapsed))
+
+    print("-" * 80)
+    print(f"{'rota':<20} {'aceitos':>8} {'tempo (s)':>10} {'eventos/s':>10}")
+    for name, accepted, elapsed in results:
+        print(f"{name:<20} {accepted:>8} {elapsed:>10.2f} {accepted / elapsed:>10.0f}")
+    print(f"ganho: {results[0][2] / results[1][2]:.1f}x")
+
+
+def main(args):
+    server = subprocess.Popen(
+        [sys.executable, __file__, "--serve", "--port", str(args.port)],
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        asyncio.run(benchmark(args))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do endpoint de eventos em lote")
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--chunk-events", type=int, default=500, help="eventos por chunk do stream")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port)
+    else:
+        main(args)
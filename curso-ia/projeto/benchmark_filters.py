@@ -0,0 +1,168 @@
+import argparse
+import random
+import time
+import uuid
+
+import numpy as np
+from qdrant_client import QdrantClient, models
+
+from utils.hybrid_search import build_filter, create_payload_indexes, hybrid_query
+
+# Latência da busca híbrida (dense + sparse -> RRF -> ColBERT) com e sem
+# filtro de ticker, numa coleção sintética com muitas empresas:
+#
+#   uv run projeto/benchmark_filters.py --tickers 200 --points 20000
+#   uv run projeto/benchmark_filters.py --qdrant-url http://localhost:6333
+#
+# Sem filtro, os candidatos vêm de todas as empresas e só uma fração é do
+# ticker pedido ("precisão"); com filtro (e índice de payload), o dense,
+# o sparse e o ColBERT só consideram os pontos daquela empresa.
+# O modo local (:memory:) não usa os índices de payload; o ganho real
+# aparece com um servidor Qdrant.
+
+COLLECTION_NAME = "financial_benchmark"
+DENSE_SIZE = 384
+COLBERT_SIZE = 128
+COLBERT_TOKENS = 8
+SPARSE_VOCAB = 30000
+SPARSE_TERMS = 40
+
+
+def random_unit(rng: np.random.Generator, *shape):
+    vectors = rng.standard_normal(shape).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+def random_sparse(rng: np.random.Generator) -> dict:
+    indices = rng.choice(SPARSE_VOCAB, size=SPARSE_TERMS, replace=False)
+    return {"indices": indices.tolist(), "values": rng.random(SPARSE_TERMS).tolist()}
+
+
+def create_collection(qdrant: QdrantClient, collection_name: str = COLLECTION_NAME):
+    if qdrant.collection_exists(collection_name):
+        qdrant.delete_collection(collection_name)
+
+    # Mesmo esquema de create_collection.py
+    qdrant.create_collection(
+        collection_name=collection_name,
+        vectors_config={
+            "dense": models.VectorParams(size=DENSE_SIZE, distance=models.Distance.COSINE),
+            "colbert": models.VectorParams(
+                size=COLBERT_SIZE,
+                distance=models.Distance.COSINE,
+                multivector_config=models.MultiVectorConfig(
+                    comparator=models.MultiVectorComparator.MAX_SIM
+                ),
+            ),
+        },
+        sparse_vectors_config={"sparse": models.SparseVectorParams()},
+    )
+    create_payload_indexes(qdrant, collection_name)
+
+
+def synthetic_points(tickers, n_points: int, rng, batch_size=500):
+    # Pontos com o esquema da coleção financial (vetores aleatórios)
+    for start in range(0, n_points, batch_size):
+        size = min(batch_size, n_points - start)
+        dense = random_unit(rng, size, DENSE_SIZE)
+        colbert = random_unit(rng, size, COLBERT_TOKENS, COLBERT_SIZE)
+        for i in range(size):
+            yield models.PointStruct(
+                id=str(uuid.uuid4()),
+                vector={
+                    "dense": dense[i].tolist(),
+                    "sparse": models.SparseVector(**random_sparse(rng)),
+                    "colbert": colbert[i].tolist(),
+                },
+                payload={
+                    "text": f"chunk {start + i}",
+                    "metadata": {
+                        "ticker": tickers[(start + i) % len(tickers)],
+                        "form_type": random.choice(["10-K", "10-Q"]),
+                        "report_date": f"{random.randint(2019, 2025)}-06-30",
+                    },
+                },
+            )
+
+
+def load_points(qdrant: QdrantClient, tickers, n_points: int, rng, batch_size=500):
+    qdrant.upload_points(
+        collection_name=COLLECTION_NAME,
+        points=synthetic_points(tickers, n_points, rng),
+        batch_size=batch_size,
+    )
+
+
+def run(qdrant: QdrantClient, queries, filtered: bool, limit: int):
+    latencies, precision = [], []
+    for ticker, dense, sparse, colbert in queries:
+        query_filter = build_filter(ticker=ticker) if filtered else None
+
+        start = time.perf_counter()
+        result = hybrid_query(
+            qdrant,
+            COLLECTION_NAME,
+            dense,
+            sparse,
+            colbert,
+            query_filter=query_filter,
+            limit=limit,
+        )
+        latencies.append(time.perf_counter() - start)
+
+        hits = [p.payload["metadata"]["ticker"] == ticker for p in result.points]
+        precision.append(sum(hits) / limit)
+
+    latencies = np.array(latencies) * 1000
+    return {
+        "p50": np.percentile(latencies, 50),
+        "p95": np.percentile(latencies, 95),
+        "precision": float(np.mean(precision)),
+    }
+
+
+def main(args):
+    rng = np.random.default_rng(42)
+    random.seed(42)
+    tickers = [f"T{i:04d}" for i in range(args.tickers)]
+
+    qdrant = QdrantClient(url=args.qdrant_url) if args.qdrant_url else QdrantClient(":memory:")
+    create_collection(qdrant)
+
+    start = time.perf_counter()
+    load_points(qdrant, tickers, args.points, rng)
+    print(f"{args.points} pontos, {args.tickers} tickers carregados em {time.perf_counter() - start:.1f}s")
+
+    queries = [
+        (
+            random.choice(tickers),
+            random_unit(rng, DENSE_SIZE).tolist(),
+            random_sparse(rng),
+            random_unit(rng, COLBERT_TOKENS, COLBERT_SIZE).tolist(),
+        )
+        for _ in range(args.queries)
+    ]
+
+    print("-" * 80)
+    print(f"{'busca':<12} {'p50 (ms)':>10} {'p95 (ms)':>10} {'precisão':>10}")
+    for name, filtered in [("sem filtro", False), ("com filtro", True)]:
+        stats = run(qdrant, queries, filtered, args.limit)
+        print(
+            f"{name:<12} {stats['p50']:>10.1f} {stats['p95']:>10.1f} "
+            f"{stats['precision']:>10.0%}"
+        )
+
+    qdrant.delete_collection(COLLECTION_NAME)
+    qdrant.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de busca híbrida filtrada")
+    parser.add_argument("--tickers", type=int, default=200)
+    parser.add_argument("--points", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=3)
+    parser.add_argument("--qdrant-url", default=None)
+    args = parser.parse_args()
+
+    main(args)
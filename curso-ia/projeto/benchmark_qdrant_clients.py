@@ -0,0 +1,168 @@
+import argparse
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from qdrant_client import QdrantClient
+
+from benchmark_filters import (
+    COLBERT_SIZE,
+    COLBERT_TOKENS,
+    DENSE_SIZE,
+    create_collection,
+    random_sparse,
+    random_unit,
+    synthetic_points,
+)
+from utils.bulk_loader import bulk_load
+from utils.hybrid_search import build_filter, hybrid_query
+from utils.qdrant_pool import QdrantPool
+
+# Teste de carga da busca híbrida no caminho de serviço:
+#
+#   docker run -p 6333:6333 -p 6334:6334 qdrant/qdrant
+#   uv run projeto/benchmark_qdrant_clients.py --concurrency 32 --requests 2000
+#
+# - sync REST: QdrantClient compartilhado por N threads (endpoint síncrono
+#   do FastAPI, que roda no threadpool)
+# - async REST / async gRPC: QdrantPool (AsyncQdrantClient) com N
+#   consultas simultâneas num único event loop
+# A latência é medida por consulta; a vazão, pelo tempo total.
+
+COLLECTION_NAME = "financial_clients_benchmark"
+
+
+def make_queries(tickers, n: int, rng):
+    # Metade das consultas com filtro de ticker
+    return [
+        (
+            random_unit(rng, DENSE_SIZE).tolist(),
+            random_sparse(rng),
+            random_unit(rng, COLBERT_TOKENS, COLBERT_SIZE).tolist(),
+            build_filter(ticker=random.choice(tickers)) if i % 2 else None,
+        )
+        for i in range(n)
+    ]
+
+
+def summarize(latencies, elapsed: float):
+    latencies = np.array(latencies) * 1000
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": np.percentile(latencies, 50),
+        "p95": np.percentile(latencies, 95),
+        "p99": np.percentile(latencies, 99),
+    }
+
+
+def run_sync(url: str, queries, concurrency: int, timeout: int):
+    qdrant = QdrantClient(url=url, timeout=timeout)
+    latencies = []
+    lock = threading.Lock()
+    pending = iter(queries)
+
+    def worker():
+        while True:
+            with lock:
+                query = next(pending, None)
+            if query is None:
+                return
+            dense, sparse, colbert, query_filter = query
+            start = time.perf_counter()
+            hybrid_query(qdrant, COLLECTION_NAME, dense, sparse, colbert, query_filter)
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    elapsed = time.perf_counter() - start
+    qdrant.close()
+    return summarize(latencies, elapsed)
+
+
+async def run_async(url: str, queries, concurrency: int, prefer_grpc: bool, args):
+    pool = QdrantPool(
+        url=url,
+        prefer_grpc=prefer_grpc,
+        grpc_port=args.grpc_port,
+        pool_size=args.pool_size,
+        timeout=args.timeout,
+        max_concurrency=concurrency,
+    )
+    await pool.start()
+    latencies = []
+    pending = iter(queries)
+
+    async def worker():
+        for dense, sparse, colbert, query_filter in pending:
+            start = time.perf_counter()
+            await pool.hybrid_query(COLLECTION_NAME, dense, sparse, colbert, query_filter)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    await pool.close()
+    return summarize(latencies, elapsed)
+
+
+def main(args):
+    rng = np.random.default_rng(42)
+    random.seed(42)
+    tickers = [f"T{i:04d}" for i in range(args.tickers)]
+
+    qdrant = QdrantClient(url=args.qdrant_url, timeout=args.timeout)
+    create_collection(qdrant, COLLECTION_NAME)
+    bulk_load(qdrant, COLLECTION_NAME, synthetic_points(tickers, args.points, rng))
+    qdrant.close()
+
+    queries = make_queries(tickers, args.requests, rng)
+    warmup = queries[: args.concurrency]
+
+    print(
+        f"{args.points} pontos | {args.requests} consultas | "
+        f"concorrência {args.concurrency} | pool {args.pool_size}"
+    )
+    print("-" * 80)
+    print(f"{'cliente':<14} {'req/s':>8} {'p50 (ms)':>10} {'p95 (ms)':>10} {'p99 (ms)':>10}")
+
+    runs = [
+        ("sync REST", lambda q: run_sync(args.qdrant_url, q, args.concurrency, args.timeout)),
+        (
+            "async REST",
+            lambda q: asyncio.run(run_async(args.qdrant_url, q, args.concurrency, False, args)),
+        ),
+        (
+            "async gRPC",
+            lambda q: asyncio.run(run_async(args.qdrant_url, q, args.concurrency, True, args)),
+        ),
+    ]
+    for name, run in runs:
+        run(warmup)  # conexões abertas e caches do servidor aquecidos
+        stats = run(queries)
+        print(
+            f"{name:<14} {stats['rps']:>8.0f} {stats['p50']:>10.1f} "
+            f"{stats['p95']:>10.1f} {stats['p99']:>10.1f}"
+        )
+
+    QdrantClient(url=args.qdrant_url).delete_collection(COLLECTION_NAME)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Teste de carga: sync REST x async REST x async gRPC")
+    parser.add_argument("--qdrant-url", default="http://localhost:6333")
+    parser.add_argument("--grpc-port", type=int, default=6334)
+    parser.add_argument("--points", type=int, default=10000)
+    parser.add_argument("--tickers", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--pool-size", type=int, default=16)
+    parser.add_argument("--timeout", type=int, default=30)
+    args = parser.parse_args()
+
+    main(args)
@@ -2,6 +2,7 @@ import os
 
 from dotenv import load_dotenv
 from qdrant_client import QdrantClient, models
+from utils.hybrid_search import create_payload_indexes
 
 load_dotenv()
 
@@ -28,4 +29,8 @@ qdrant.create_collection(
         ),
     },
     sparse_vectors_config={"sparse": models.SparseVectorParams()},
-)
\ No newline at end of file
+)
+
+# Índices em metadata.ticker, metadata.form_type e metadata.report_date:
+# buscas filtradas por empresa/formulário/data não varrem a coleção inteira
+create_payload_indexes(qdrant, COLLECTION_NAME)
@@ -1,64 +1,196 @@
+import time
+
+# Início do processo, para medir o cold start (inclui os imports)
+START = time.perf_counter()
+
+import hashlib
+import json
 import os
+import resource
 import uuid
+import warnings
 
 from dotenv import load_dotenv
-from fastembed import TextEmbedding, SparseTextEmbedding, LateInteractionTextEmbedding
 from qdrant_client import QdrantClient, models
 from utils.semantic_chunker import SemanticChunker
 from utils.edgar_client import EdgarClient
+from utils.model_registry import registry
+from utils.embedding_runtime import runtime
+from utils.bulk_loader import (
+    bulk_load,
+    defer_indexing,
+    format_report,
+    indexing_threshold,
+    restore_indexing,
+)
+from utils.checkpoint import CheckpointJournal
+from utils.dedup import NearDuplicateFilter, format_report as format_dedup_report
 
 load_dotenv()
 
-DENSE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 SPARSE_MODEL = "Qdrant/bm25"
 COLBERT_MODEL = "colbert-ir/colbertv2.0"
 COLLECTION_NAME = "financial"
 EMAIL = EMAIL = os.getenv("EDGAR_EMAIL")
 MAX_TOKENS = 300
+BATCH_SIZE = int(os.getenv("INGESTION_BATCH_SIZE", "64"))
+UPLOAD_WORKERS = int(os.getenv("INGESTION_UPLOAD_WORKERS", "4"))
+FILINGS = [("AAPL", "10-K"), ("AAPL", "10-Q")]
 
 qdrant = QdrantClient(
     url=os.getenv("QDRANT_URL"),
     api_key=os.getenv("QDRANT_API_KEY"),
 )
 
-edgar = EdgarClient(email=EMAIL)
+# Backend do encoder do chunker: onnx (padrão), onnx-int8 ou torch
+chunker = SemanticChunker(
+    max_tokens=MAX_TOKENS, backend=os.getenv("CHUNKER_BACKEND", "onnx")
+)
+# Com outro backend o chunker cria o próprio EmbeddingRuntime: a ingestão
+# volta a ter duas cópias do MiniLM e dois pools de inferência, e o pico de
+# memória e o tempo de CPU do relatório final não são os do runtime compartilhado
+if chunker.runtime is not runtime:
+    warnings.warn(
+        f"CHUNKER_BACKEND={chunker.runtime.backend} difere do runtime da ingestão "
+        f"({runtime.backend}): chunker e ingestão carregam cada um o seu modelo denso",
+        RuntimeWarning,
+    )
 
-data_10k = edgar.fetch_filing_data("AAPL", "10-K")
-text_10k = edgar.get_combined_text(data_10k)
+# Os modelos carregam em segundo plano enquanto os filings são baixados
+chunker.prewarm()
+registry.prewarm([("sparse", SPARSE_MODEL), ("colbert", COLBERT_MODEL)])
 
-data_10q = edgar.fetch_filing_data("AAPL", "10-Q")
-text_10q = edgar.get_combined_text(data_10q)
+edgar = EdgarClient(email=EMAIL)
 
-chunker = SemanticChunker(max_tokens=MAX_TOKENS)
+# Etapas concluídas de um run interrompido são puladas (ver utils/checkpoint.py)
+journal = CheckpointJournal("ingestion")
+if len(journal):
+    print(f"Retomando run interrompido: {len(journal)} etapas já concluídas")
 
 all_chunks = []
-for data, text in [(data_10k, text_10k), (data_10q, text_10q)]:
-    chunks = chunker.create_chunks(text)
+for ticker, form_type in FILINGS:
+    filing_key = f"{ticker} {form_type}"
+
+    if journal.done("fetched", filing_key):
+        filing = journal.load("fetched", filing_key)
+    else:
+        data = edgar.fetch_filing_data(ticker, form_type)
+        filing = {"metadata": data["metadata"], "text": edgar.get_combined_text(data)}
+        journal.mark("fetched", filing_key, filing)
+
+    if journal.done("chunked", filing_key):
+        chunks = journal.load("chunked", filing_key)
+    else:
+        chunks = chunker.create_chunks(filing["text"])
+        journal.mark("chunked", filing_key, chunks)
+
     for chunk in chunks:
-        all_chunks.append({"text": chunk, "metadata": data["metadata"]})
-
-dense_model = TextEmbedding(DENSE_MODEL)
-sparse_model = SparseTextEmbedding(SPARSE_MODEL)
-colbert_model = LateInteractionTextEmbedding(COLBERT_MODEL)
-
-points = []
-for chunk_data in all_chunks:
-    chunk = chunk_data["text"]
-    metadata = chunk_data["metadata"]
-
-    dense_embedding = list(dense_model.passage_embed([chunk]))[0].tolist()
-    sparse_embedding = list(sparse_model.passage_embed([chunk]))[0].as_object()
-    colbert_embedding = list(colbert_model.passage_embed([chunk]))[0].tolist()
-
-    point = models.PointStruct(
-        id=str(uuid.uuid4()),
-        vector={
-            "dense": dense_embedding,
-            "sparse": sparse_embedding,
-            "colbert": colbert_embedding,
-        },
-        payload={"text": chunk, "metadata": metadata},
+        all_chunks.append({"text": chunk, "metadata": filing["metadata"]})
+
+# Chunks quase idênticos entre os filings viram um único ponto
+# (similaridade de Jaccard estimada >= DEDUP_THRESHOLD)
+dedup = NearDuplicateFilter(threshold=float(os.getenv("DEDUP_THRESHOLD", "0.85")))
+all_chunks, dedup_stats = dedup.deduplicate(all_chunks)
+print(format_dedup_report(dedup_stats))
+
+sparse_model = registry.get("sparse", SPARSE_MODEL)
+colbert_model = registry.get("colbert", COLBERT_MODEL)
+
+
+def point_id(chunk_data) -> str:
+    # Id determinístico: reenviar um lote depois de um crash sobrescreve os
+    # mesmos pontos em vez de duplicá-los
+    key = json.dumps(chunk_data["sources"], sort_keys=True) + chunk_data["text"]
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, key))
+
+
+# O HNSW só é construído no final. O threshold original vai para o diário
+# antes de ser alterado: se o run cair com a indexação desligada, a retomada
+# ainda sabe para qual valor voltar
+if journal.done("deferred", COLLECTION_NAME):
+    indexing = journal.load("deferred", COLLECTION_NAME)
+else:
+    indexing = {"threshold": indexing_threshold(qdrant, COLLECTION_NAME)}
+    journal.mark("deferred", COLLECTION_NAME, indexing)
+# Reaplicado na retomada: o run pode ter caído entre o registro e o update
+defer_indexing(qdrant, COLLECTION_NAME)
+
+progress = {"first_chunk_at": None, "resumed_batches": 0}
+
+
+def embedded_points():
+    # Embeda lote a lote, conforme o bulk_load consome; lotes já embedados
+    # num run interrompido saem do diário
+    for start in range(0, len(all_chunks), BATCH_SIZE):
+        batch = all_chunks[start : start + BATCH_SIZE]
+        ids = [point_id(chunk_data) for chunk_data in batch]
+        batch_key = hashlib.sha256("".join(ids).encode("utf-8")).hexdigest()
+
+        if journal.done("embedded", batch_key):
+            vectors = journal.load("embedded", batch_key)
+            progress["resumed_batches"] += 1
+        else:
+            texts = [chunk_data["text"] for chunk_data in batch]
+            # Embeddings densos pelo runtime compartilhado; é o mesmo do chunking
+            # só quando CHUNKER_BACKEND coincide com o backend dele (onnx)
+            dense_embeddings = runtime.embed(texts)
+            sparse_embeddings = sparse_model.passage_embed(texts)
+            colbert_embeddings = colbert_model.passage_embed(texts)
+            vectors = [
+                {
+                    "dense": dense.tolist(),
+                    "sparse": sparse.as_object(),
+                    "colbert": colbert.tolist(),
+                }
+                for dense, sparse, colbert in zip(
+                    dense_embeddings, sparse_embeddings, colbert_embeddings
+                )
+            ]
+            journal.mark("embedded", batch_key, vectors)
+
+        if progress["first_chunk_at"] is None:
+            progress["first_chunk_at"] = time.perf_counter() - START
+
+        for id_, vector, chunk_data in zip(ids, vectors, batch):
+            yield models.PointStruct(
+                id=id_,
+                vector=vector,
+                payload={
+                    "text": chunk_data["text"],
+                    "metadata": chunk_data["metadata"],
+                    "sources": chunk_data["sources"],
+                },
+            )
+
+
+# A carga é um único run do bulk_load (lotes adaptativos e upserts em
+# paralelo, ver utils/bulk_loader.py) e a unidade do diário. Na retomada os
+# pontos são todos reenviados: com ids determinísticos, os que já estavam
+# no Qdrant são sobrescritos, não duplicados
+if journal.done("uploaded", COLLECTION_NAME):
+    load_stats = {"points": 0, "batches": 0, "retries": 0, "upload_seconds": 0.0}
+else:
+    load_stats = bulk_load(
+        qdrant, COLLECTION_NAME, embedded_points(), workers=UPLOAD_WORKERS, defer_index=False
     )
-    points.append(point)
+    journal.mark("uploaded", COLLECTION_NAME)
+
+index_start = time.perf_counter()
+restore_indexing(qdrant, COLLECTION_NAME, indexing["threshold"])
+load_stats["index_seconds"] = time.perf_counter() - index_start
+total_seconds = load_stats["upload_seconds"] + load_stats["index_seconds"]
+load_stats["points_per_second"] = load_stats["points"] / total_seconds if total_seconds else 0.0
+print(format_report("carga", load_stats))
+if progress["resumed_batches"]:
+    print(f"{progress['resumed_batches']} lotes já embedados antes da interrupção foram reaproveitados")
+
+# Run completo: o próximo começa do zero
+journal.clear()
+
+if progress["first_chunk_at"] is not None:
+    print(f"Cold start até o primeiro chunk embedado: {progress['first_chunk_at']:.2f}s")
+print(registry.report())
 
-qdrant.upload_points(collection_name=COLLECTION_NAME, points=points, batch_size=5)
\ No newline at end of file
+usage = resource.getrusage(resource.RUSAGE_SELF)
+print(f"Pico de memória (RSS): {usage.ru_maxrss / 1024:.0f} MB")
+print(f"Tempo de CPU: {usage.ru_utime + usage.ru_stime:.1f}s")
@@ -1,8 +1,15 @@
+import time
+
+# Início do processo, para medir o cold start (inclui os imports)
+START = time.perf_counter()
+
+import argparse
 import os
 
 from dotenv import load_dotenv
-from fastembed import LateInteractionTextEmbedding, SparseTextEmbedding, TextEmbedding
-from qdrant_client import QdrantClient, models
+from qdrant_client import QdrantClient
+from utils.hybrid_search import build_filter, hybrid_query
+from utils.model_registry import registry
 
 load_dotenv()
 
@@ -11,41 +18,60 @@ SPARSE_MODEL = "Qdrant/bm25"
 COLBERT_MODEL = "colbert-ir/colbertv2.0"
 COLLECTION_NAME = "financial"
 
+parser = argparse.ArgumentParser(description="Busca híbrida na coleção financial")
+parser.add_argument("query", nargs="?", default="what are the main financial risks?")
+parser.add_argument("--ticker", help="ex.: AAPL")
+parser.add_argument("--form-type", help="ex.: 10-K")
+parser.add_argument("--date-from", help="report_date mínimo (AAAA-MM-DD)")
+parser.add_argument("--date-to", help="report_date máximo (AAAA-MM-DD)")
+args = parser.parse_args()
+
+# Os três modelos carregam em segundo plano enquanto o cliente conecta
+registry.prewarm(
+    [("dense", DENSE_MODEL), ("sparse", SPARSE_MODEL), ("colbert", COLBERT_MODEL)]
+)
+
 qdrant = QdrantClient(
     url=os.getenv("QDRANT_URL"),
     api_key=os.getenv("QDRANT_API_KEY"),
 )
 
-dense_model = TextEmbedding(DENSE_MODEL)
-sparse_model = SparseTextEmbedding(SPARSE_MODEL)
-colbert_model = LateInteractionTextEmbedding(COLBERT_MODEL)
+dense_model = registry.get("dense", DENSE_MODEL)
+sparse_model = registry.get("sparse", SPARSE_MODEL)
+colbert_model = registry.get("colbert", COLBERT_MODEL)
 
-query_text = "what are the main financial risks?"
+query_text = args.query
 query_dense = list(dense_model.query_embed([query_text]))[0].tolist()
 query_sparse = list(sparse_model.query_embed([query_text]))[0].as_object()
 query_colbert = list(colbert_model.query_embed([query_text]))[0].tolist()
 
-results = qdrant.query_points(
-    collection_name=COLLECTION_NAME,
-    prefetch=[
-        {
-            "prefetch": [
-                {"query": query_dense, "using": "dense", "limit": 10},
-                {"query": query_sparse, "using": "sparse", "limit": 10},
-            ],
-            "query": models.FusionQuery(fusion=models.Fusion.RRF),
-            "limit": 20,
-        }
-    ],
-    query=query_colbert,
-    using="colbert",
-    limit=3,
+# Filtro aplicado no dense, no sparse, na fusão e no rerank ColBERT
+query_filter = build_filter(args.ticker, args.form_type, args.date_from, args.date_to)
+
+results = hybrid_query(
+    qdrant,
+    COLLECTION_NAME,
+    query_dense,
+    query_sparse,
+    query_colbert,
+    query_filter=query_filter,
 )
 
-max_score = max(result.score for result in results.points)
+first_query_at = time.perf_counter() - START
+
+if not results.points:
+    print("Nenhum resultado para os filtros informados")
+
+max_score = max((result.score for result in results.points), default=1.0)
 
 for r in results.points:
     normalized_score = r.score / max_score
     print(f"Score: {normalized_score}")
     print(f"Texto: {r.payload['text'][:100]}...")
-    print("-" * 80)
\ No newline at end of file
+    # Chunks deduplicados citam todos os filings de origem
+    sources = r.payload.get("sources", [r.payload["metadata"]])
+    print("Filings: " + ", ".join(f"{s['form_type']} {s['report_date']}" for s in sources))
+    print("-" * 80)
+
+print(f"Cold start até o primeiro resultado: {first_query_at:.2f}s")
+print(registry.report())
\ No newline at end of file
@@ -0,0 +1,155 @@
+import json
+import os
+import runpy
+import signal
+import sys
+import types
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+
+import numpy as np
+
+# Roda ingestion.py de verdade, num subprocesso, trocando só o que depende de
+# rede ou de modelos: EDGAR, chunker e encoders viram falsos determinísticos e
+# o Qdrant é um cliente local em disco. Configuração por env:
+#
+#   TEST_QDRANT_PATH            pasta do Qdrant local
+#   TEST_CALLS_LOG              JSONL com as chamadas de fetch/chunk/embed
+#   TEST_KILL_AFTER_EMBEDDED=N  SIGKILL logo depois do N-ésimo mark("embedded")
+#   TEST_CHUNKS_PER_FILING      chunks gerados por filing
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+import qdrant_client
+from utils import bulk_loader
+from utils.checkpoint import CheckpointJournal
+
+QDRANT_PATH = os.environ["TEST_QDRANT_PATH"]
+CALLS_LOG = os.environ["TEST_CALLS_LOG"]
+KILL_AFTER_EMBEDDED = int(os.getenv("TEST_KILL_AFTER_EMBEDDED", "0"))
+CHUNKS_PER_FILING = int(os.getenv("TEST_CHUNKS_PER_FILING", "750"))
+VECTOR_SIZE = 4
+
+
+def log_call(call: str, **fields):
+    with open(CALLS_LOG, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"call": call, **fields}) + "\n")
+
+
+def fake_vector(text: str, salt: str = "") -> list:
+    rng = np.random.default_rng(uuid.uuid5(uuid.NAMESPACE_URL, salt + text).int % 2**32)
+    return rng.random(VECTOR_SIZE, dtype=np.float32) + 0.1
+
+
+class FakeEdgarClient:
+    def __init__(self, email: str):
+        pass
+
+    def fetch_filing_data(self, ticker: str, form_type: str):
+        log_call("fetch", filing=f"{ticker} {form_type}")
+        # Trechos sem palavras em comum: nenhum vira duplicata na deduplicação
+        lines = [
+            " ".join(f"{ticker}{form_type}t{i}w{j}" for j in range(8))
+            for i in range(CHUNKS_PER_FILING)
+        ]
+        return {"metadata": {"ticker": ticker, "form_type": form_type}, "text": "\n".join(lines)}
+
+    def get_combined_text(self, data) -> str:
+        return data["text"]
+
+
+class FakeSemanticChunker:
+    def __init__(self, max_tokens: int, backend: str):
+        self.runtime = sys.modules["utils.embedding_runtime"].runtime
+
+    def prewarm(self):
+        pass
+
+    def create_chunks(self, text_content: str):
+        log_call("chunk")
+        return text_content.split("\n")
+
+
+class FakeSparse:
+    def __init__(self, text: str):
+        self.text = text
+
+    def as_object(self):
+        return {"indices": [len(self.text) % 100], "values": [1.0]}
+
+
+class FakeModel:
+    def __init__(self, kind: str):
+        self.kind = kind
+
+    def passage_embed(self, texts):
+        if self.kind == "sparse":
+            return [FakeSparse(text) for text in texts]
+        return [np.stack([fake_vector(text, "a"), fake_vector(text, "b")]) for text in texts]
+
+
+class FakeRegistry:
+    def prewarm(self, models):
+        pass
+
+    def get(self, kind: str, model_name: str):
+        return FakeModel(kind)
+
+    def report(self) -> str:
+        return ""
+
+
+class FakeRuntime:
+    def embed(self, texts):
+        log_call("embed", texts=len(texts))
+        return np.stack([fake_vector(text) for text in texts])
+
+
+def fake_module(name: str, **attrs):
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    sys.modules[name] = module
+
+
+fake_module("utils.edgar_client", EdgarClient=FakeEdgarClient)
+fake_module("utils.semantic_chunker", SemanticChunker=FakeSemanticChunker)
+fake_module("utils.model_registry", registry=FakeRegistry())
+fake_module("utils.embedding_runtime", runtime=FakeRuntime())
+
+LocalQdrantClient = qdrant_client.QdrantClient
+qdrant_client.QdrantClient = lambda **kwargs: LocalQdrantClient(path=QDRANT_PATH)
+
+# Upserts enviados pelo bulk_load; o kill espera os que estão em voo para
+# que o estado no Qdrant seja determinístico
+upserts = []
+
+
+class TrackedExecutor(ThreadPoolExecutor):
+    def submit(self, *args, **kwargs):
+        future = super().submit(*args, **kwargs)
+        upserts.append(future)
+        return future
+
+
+bulk_loader.ThreadPoolExecutor = TrackedExecutor
+
+mark = CheckpointJournal.mark
+embedded_marks = 0
+
+
+def mark_then_kill(self, stage: str, key: str, result=None):
+    global embedded_marks
+    mark(self, stage, key, result)
+    if stage == "embedded":
+        embedded_marks += 1
+        if embedded_marks == KILL_AFTER_EMBEDDED:
+            wait(upserts)
+            log_call("killed", upserts=len(upserts))
+            os.kill(os.getpid(), signal.SIGKILL)
+
+
+CheckpointJournal.mark = mark_then_kill
+
+runpy.run_path(str(PROJECT_DIR / "ingestion.py"), run_name="__main__")
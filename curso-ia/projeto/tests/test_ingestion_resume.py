@@ -0,0 +1,132 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from qdrant_client import QdrantClient, models
+
+# Mata a ingestão no meio (SIGKILL depois de um mark("embedded")), roda de
+# novo e compara com um run sem interrupção:
+#
+#   cd projeto && python -m unittest discover -s tests
+
+HARNESS = Path(__file__).resolve().parent / "ingestion_harness.py"
+COLLECTION_NAME = "financial"
+BATCH_SIZE = 100
+CHUNKS_PER_FILING = 750
+# 2 filings x 750 chunks = 15 lotes. O primeiro upsert (até 1024 pontos) sai
+# durante o lote 11, então o kill no lote 13 deixa pontos já gravados
+KILL_AFTER_EMBEDDED = 13
+TOTAL_BATCHES = 2 * CHUNKS_PER_FILING // BATCH_SIZE
+
+
+def create_collection(path: str):
+    qdrant = QdrantClient(path=path)
+    qdrant.create_collection(
+        collection_name=COLLECTION_NAME,
+        vectors_config={
+            "dense": models.VectorParams(size=4, distance=models.Distance.COSINE),
+            "colbert": models.VectorParams(
+                size=4,
+                distance=models.Distance.COSINE,
+                multivector_config=models.MultiVectorConfig(
+                    comparator=models.MultiVectorComparator.MAX_SIM
+                ),
+            ),
+        },
+        sparse_vectors_config={"sparse": models.SparseVectorParams()},
+    )
+    qdrant.close()
+
+
+def stored_points(path: str):
+    qdrant = QdrantClient(path=path)
+    points, offset = [], None
+    while True:
+        page, offset = qdrant.scroll(COLLECTION_NAME, limit=500, offset=offset)
+        points.extend(page)
+        if offset is None:
+            break
+    qdrant.close()
+    return points
+
+
+class IngestionResumeTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def run_ingestion(self, name: str, kill_after: int = 0):
+        run_dir = Path(self.tmp.name) / name
+        run_dir.mkdir(exist_ok=True)
+        qdrant_path = str(run_dir / "qdrant")
+        if not Path(qdrant_path).exists():
+            create_collection(qdrant_path)
+
+        calls_log = run_dir / f"calls-{kill_after}.jsonl"
+        env = {
+            **os.environ,
+            "TEST_QDRANT_PATH": qdrant_path,
+            "TEST_CALLS_LOG": str(calls_log),
+            "TEST_KILL_AFTER_EMBEDDED": str(kill_after),
+            "TEST_CHUNKS_PER_FILING": str(CHUNKS_PER_FILING),
+            "CHECKPOINT_DIR": str(run_dir / "checkpoints"),
+            "INGESTION_BATCH_SIZE": str(BATCH_SIZE),
+            # O Qdrant local não aceita upserts concorrentes
+            "INGESTION_UPLOAD_WORKERS": "1",
+        }
+        result = subprocess.run(
+            [sys.executable, str(HARNESS)],
+            cwd=HARNESS.parent.parent,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=300,
+        )
+        calls = []
+        if calls_log.exists():
+            calls = [json.loads(line) for line in calls_log.read_text().splitlines()]
+        return result, calls, qdrant_path
+
+    def test_killed_run_resumes_without_duplicates(self):
+        result, _, baseline_path = self.run_ingestion("baseline")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        baseline = stored_points(baseline_path)
+        self.assertEqual(len(baseline), 2 * CHUNKS_PER_FILING)
+
+        result, calls, qdrant_path = self.run_ingestion("resume", KILL_AFTER_EMBEDDED)
+        self.assertEqual(result.returncode, -signal.SIGKILL, result.stderr)
+        self.assertEqual(calls[-1]["call"], "killed")
+        before_resume = len(stored_points(qdrant_path))
+        self.assertGreater(before_resume, 0)
+        self.assertLess(before_resume, len(baseline))
+
+        result, calls, qdrant_path = self.run_ingestion("resume")
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        # Etapas concluídas antes do kill não são refeitas
+        counts = {}
+        for call in calls:
+            counts[call["call"]] = counts.get(call["call"], 0) + 1
+        self.assertNotIn("fetch", counts)
+        self.assertNotIn("chunk", counts)
+        self.assertEqual(counts["embed"], TOTAL_BATCHES - KILL_AFTER_EMBEDDED)
+        self.assertIn(f"{KILL_AFTER_EMBEDDED} lotes já embedados", result.stdout)
+
+        # Sem pontos duplicados e com o mesmo resultado do run sem interrupção
+        points = stored_points(qdrant_path)
+        texts = [point.payload["text"] for point in points]
+        self.assertEqual(len(texts), len(set(texts)))
+        self.assertEqual(len(points), len(baseline))
+        self.assertEqual({p.id for p in points}, {p.id for p in baseline})
+
+        # Run concluído: o diário foi apagado
+        self.assertFalse((Path(self.tmp.name) / "resume" / "checkpoints" / "ingestion").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,250 @@
+import json
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import grpc
+import httpx
+from qdrant_client import QdrantClient, models
+from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse
+
+# Carga em massa:
+# - durante a carga o HNSW não é construído (indexing_threshold=0); os
+#   segmentos só são indexados uma vez, no final
+# - o tamanho do lote começa pelo tamanho em bytes dos pontos e se ajusta
+#   pela latência observada de cada upsert
+# - vários upserts em paralelo, com novas tentativas e backoff
+#   exponencial só em falhas passageiras (transporte, 429 e 5xx)
+# - no final, a indexação volta ao valor original e a otimização é aguardada
+
+
+def point_bytes(point: models.PointStruct) -> int:
+    # Estimativa do tamanho do ponto na requisição (vetores float32 + payload)
+    size = len(json.dumps(point.payload or {}, default=str))
+    vectors = point.vector if isinstance(point.vector, dict) else {"": point.vector}
+    for vector in vectors.values():
+        if isinstance(vector, models.SparseVector):
+            size += 8 * len(vector.indices)
+        elif isinstance(vector, dict):
+            size += 8 * len(vector.get("indices", []))
+        elif vector and isinstance(vector[0], list):
+            size += 4 * sum(len(row) for row in vector)
+        else:
+            size += 4 * len(vector)
+    return size
+
+
+class AdaptiveBatchSize:
+    # Lotes próximos de target_bytes; cresce quando os upserts estão rápidos
+    # e cai pela metade quando passam de target_latency
+
+    def __init__(
+        self,
+        target_bytes: int = 8 * 1024 * 1024,
+        target_latency: float = 1.0,
+        min_size: int = 8,
+        max_size: int = 1024,
+    ):
+        self.target_bytes = target_bytes
+        self.target_latency = target_latency
+        self.min_size = min_size
+        self.max_size = max_size
+        self.size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def initial(self, sample: List[models.PointStruct]) -> int:
+        average = sum(point_bytes(p) for p in sample) / max(len(sample), 1)
+        self.size = self._clamp(int(self.target_bytes / max(average, 1)))
+        return self.size
+
+    def _clamp(self, size: int) -> int:
+        return max(self.min_size, min(self.max_size, size))
+
+    def observe(self, latency: float):
+        with self._lock:
+            if latency > self.target_latency:
+                self.size = self._clamp(self.size // 2)
+            elif latency < self.target_latency / 2:
+                self.size = self._clamp(int(self.size * 1.25))
+
+
+def indexing_threshold(qdrant: QdrantClient, collection_name: str) -> Optional[int]:
+    info = qdrant.get_collection(collection_name)
+    return info.config.optimizer_config.indexing_threshold
+
+
+def defer_indexing(qdrant: QdrantClient, collection_name: str) -> Optional[int]:
+    # Desliga a construção do HNSW e devolve o indexing_threshold original
+    original = indexing_threshold(qdrant, collection_name)
+    qdrant.update_collection(
+        collection_name=collection_name,
+        optimizers_config=models.OptimizersConfigDiff(indexing_threshold=0),
+    )
+    return original
+
+
+def restore_indexing(
+    qdrant: QdrantClient,
+    collection_name: str,
+    indexing_threshold: Optional[int],
+    timeout: float = 600.0,
+    poll_interval: float = 1.0,
+    settle_time: float = 5.0,
+):
+    # Religa a indexação e espera a otimização que isso dispara terminar.
+    # Logo após o update a coleção costuma continuar GREEN porque o otimizador
+    # ainda não começou; GREEN só vale depois que:
+    # - a coleção saiu de GREEN (otimização rodou), ou
+    # - indexed_vectors_count alcançou points_count, ou
+    # - ficou GREEN por settle_time sem o otimizador começar (coleções
+    #   menores que o threshold nunca são indexadas)
+    qdrant.update_collection(
+        collection_name=collection_name,
+        optimizers_config=models.OptimizersConfigDiff(
+            indexing_threshold=indexing_threshold if indexing_threshold is not None else 20000
+        ),
+    )
+
+    start = time.monotonic()
+    optimizing = False
+    while time.monotonic() - start < timeout:
+        info = qdrant.get_collection(collection_name)
+        if info.status != models.CollectionStatus.GREEN:
+            optimizing = True
+        elif (
+            optimizing
+            or (info.indexed_vectors_count or 0) >= (info.points_count or 0)
+            or time.monotonic() - start >= settle_time
+        ):
+            return True
+        time.sleep(poll_interval)
+    return False
+
+
+# Códigos gRPC de falhas passageiras (sobrecarga, timeout, nó indisponível)
+RETRYABLE_GRPC_CODES = {
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.DEADLINE_EXCEEDED,
+    grpc.StatusCode.RESOURCE_EXHAUSTED,
+}
+
+
+def is_transient(error: Exception) -> bool:
+    # Só vale tentar de novo erros de transporte, 429 e 5xx. Vetor com tamanho
+    # errado, coleção inexistente ou payload inválido (demais 4xx) falham igual
+    # em toda tentativa e sobem na hora
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code == 429 or (error.status_code or 0) >= 500
+    if isinstance(error, grpc.RpcError):
+        return error.code() in RETRYABLE_GRPC_CODES
+    return isinstance(
+        error, (ResponseHandlingException, httpx.TransportError, ConnectionError, TimeoutError)
+    )
+
+
+def upsert_with_retries(
+    qdrant: QdrantClient,
+    collection_name: str,
+    points: List[models.PointStruct],
+    max_retries: int = 5,
+    base_delay: float = 0.5,
+) -> Tuple[int, float]:
+    # Retorna (novas tentativas usadas, latência da tentativa que deu certo);
+    # o backoff não entra na latência
+    for attempt in range(max_retries + 1):
+        sent_at = time.perf_counter()
+        try:
+            qdrant.upsert(collection_name=collection_name, points=points, wait=True)
+            return attempt, time.perf_counter() - sent_at
+        except Exception as error:
+            if attempt == max_retries or not is_transient(error):
+                raise
+            time.sleep(base_delay * 2**attempt * (1 + random.random()))
+
+
+def bulk_load(
+    qdrant: QdrantClient,
+    collection_name: str,
+    points: Iterable[models.PointStruct],
+    workers: int = 4,
+    batch_size: Optional[AdaptiveBatchSize] = None,
+    max_retries: int = 5,
+    defer_index: bool = True,
+) -> Dict[str, float]:
+    batch_size = batch_size or AdaptiveBatchSize()
+    iterator = iter(points)
+
+    first = []
+    for point in iterator:
+        first.append(point)
+        if len(first) == 64:
+            break
+    batch_size.initial(first)
+
+    original_threshold = defer_indexing(qdrant, collection_name) if defer_index else None
+
+    start = time.perf_counter()
+    stats = {"points": 0, "batches": 0, "retries": 0}
+    pending = {}
+
+    def next_batch():
+        batch = first[: batch_size.size]
+        del first[: len(batch)]
+        for point in iterator:
+            if len(batch) >= batch_size.size:
+                first.insert(0, point)
+                break
+            batch.append(point)
+        return batch
+
+    def send(batch):
+        retries, latency = upsert_with_retries(qdrant, collection_name, batch, max_retries)
+        batch_size.observe(latency)
+        return len(batch), retries
+
+    def collect(done):
+        for future in done:
+            count, retries = future.result()
+            pending.pop(future)
+            stats["points"] += count
+            stats["batches"] += 1
+            stats["retries"] += retries
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while batch := next_batch():
+                # No máximo `workers` lotes em voo
+                if len(pending) >= workers:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                pending[pool.submit(send, batch)] = True
+            collect(wait(pending).done)
+    finally:
+        upload_seconds = time.perf_counter() - start
+        index_start = time.perf_counter()
+        if defer_index:
+            stats["index_ready"] = restore_indexing(qdrant, collection_name, original_threshold)
+        index_seconds = time.perf_counter() - index_start
+
+    total = upload_seconds + index_seconds
+    stats.update(
+        {
+            "upload_seconds": upload_seconds,
+            "index_seconds": index_seconds,
+            "points_per_second": stats["points"] / total if total else 0.0,
+            "final_batch_size": batch_size.size,
+        }
+    )
+    return stats
+
+
+def format_report(name: str, stats: Dict[str, float]) -> str:
+    return (
+        f"{name:<12} {stats['points']:>7} pontos em "
+        f"{stats['upload_seconds'] + stats['index_seconds']:.1f}s "
+        f"(upload {stats['upload_seconds']:.1f}s + indexação {stats['index_seconds']:.1f}s) | "
+        f"{stats['points_per_second']:.0f} pontos/s | lotes: {stats['batches']} | "
+        f"novas tentativas: {stats['retries']}"
+    )
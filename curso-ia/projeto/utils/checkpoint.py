@@ -0,0 +1,73 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from pathlib import Path
+from typing import Any
+
+# Diário de checkpoints da ingestão: cada etapa concluída (fetched, chunked,
+# embedded, uploaded) é gravada em journal.jsonl, com fsync, e o resultado
+# fica num arquivo ao lado. Um run interrompido retoma da última etapa
+# registrada. O artefato é gravado antes do registro: se o processo morrer
+# entre os dois, a etapa é refeita.
+
+CHECKPOINT_DIR = os.getenv(
+    "CHECKPOINT_DIR", str(Path(__file__).resolve().parent.parent / ".checkpoints")
+)
+
+
+class CheckpointJournal:
+    def __init__(self, name: str, checkpoint_dir: str = CHECKPOINT_DIR):
+        self.run_dir = Path(checkpoint_dir) / name
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        self.journal_path = self.run_dir / "journal.jsonl"
+        self.completed = set()
+
+        if self.journal_path.exists():
+            valid_bytes = 0
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    if not line.endswith(b"\n"):
+                        break
+                    self.completed.add((entry["stage"], entry["key"]))
+                    valid_bytes += len(line)
+            # Descarta a última linha se o crash a cortou no meio
+            os.truncate(self.journal_path, valid_bytes)
+
+    def __len__(self):
+        return len(self.completed)
+
+    def done(self, stage: str, key: str) -> bool:
+        return (stage, key) in self.completed
+
+    def _artifact_path(self, stage: str, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+        return self.run_dir / f"{stage}-{digest}.pkl"
+
+    def mark(self, stage: str, key: str, result: Any = None):
+        if result is not None:
+            path = self._artifact_path(stage, key)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                pickle.dump(result, f)
+            os.replace(tmp_path, path)
+
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"stage": stage, "key": key}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.completed.add((stage, key))
+
+    def load(self, stage: str, key: str) -> Any:
+        with open(self._artifact_path(stage, key), "rb") as f:
+            return pickle.load(f)
+
+    def clear(self):
+        # Run concluído: o próximo começa do zero
+        shutil.rmtree(self.run_dir, ignore_errors=True)
+        self.completed = set()
@@ -0,0 +1,133 @@
+import hashlib
+import re
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Deduplicação de chunks quase idênticos (MinHash + LSH) antes do embedding.
+# 10-K e 10-Q repetem boa parte dos fatores de risco; cada grupo de chunks
+# parecidos vira um único ponto, com todos os filings de origem no payload.
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def lsh_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    # (bands, rows) com bands * rows == num_perm cujo limiar da curva S,
+    # (1 / bands) ** (1 / rows), fica mais próximo do threshold
+    options = [(b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0]
+    return min(options, key=lambda br: abs((1 / br[0]) ** (1 / br[1]) - threshold))
+
+
+class NearDuplicateFilter:
+    def __init__(
+        self,
+        threshold: float = 0.85,
+        num_perm: int = 128,
+        shingle_size: int = 5,
+        seed: int = 1,
+    ):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = lsh_params(threshold, num_perm)
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, MERSENNE_PRIME, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, MERSENNE_PRIME, num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> np.ndarray:
+        # n-gramas de palavras, sem diferença de caixa e espaços
+        words = re.findall(r"\w+", text.lower())
+        k = self.shingle_size
+        grams = {" ".join(words[i : i + k]) for i in range(max(len(words) - k + 1, 1))}
+        return np.array(
+            [
+                int.from_bytes(hashlib.blake2b(g.encode(), digest_size=4).digest(), "little")
+                for g in grams
+            ],
+            dtype=np.uint64,
+        )
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = self.shingles(text)
+        # (a * x + b) mod p, truncado em 32 bits; mínimo por permutação
+        permuted = (np.outer(hashes, self._a) + self._b) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0)
+
+    def clusters(self, texts: List[str]) -> List[List[int]]:
+        signatures = [self.signature(text) for text in texts]
+
+        # Candidatos: textos que caem no mesmo bucket em alguma banda
+        parent = list(range(len(texts)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for band in range(self.bands):
+            buckets: Dict[bytes, int] = {}
+            rows = slice(band * self.rows, (band + 1) * self.rows)
+            for i, signature in enumerate(signatures):
+                key = signature[rows].tobytes()
+                if key not in buckets:
+                    buckets[key] = i
+                    continue
+                j = buckets[key]
+                # Confirma pela similaridade de Jaccard estimada
+                if find(i) != find(j) and np.mean(signatures[i] == signatures[j]) >= self.threshold:
+                    parent[max(find(i), find(j))] = min(find(i), find(j))
+
+        groups: Dict[int, List[int]] = {}
+        for i in range(len(texts)):
+            groups.setdefault(find(i), []).append(i)
+        return sorted(groups.values())
+
+    def deduplicate(self, chunks: List[Dict]) -> Tuple[List[Dict], Dict[str, float]]:
+        # chunks: [{"text", "metadata"}]; o primeiro chunk de cada grupo é o
+        # representante e "sources" lista os metadados de todos os filings
+        unique = []
+        for group in self.clusters([chunk["text"] for chunk in chunks]):
+            sources = []
+            for i in group:
+                if chunks[i]["metadata"] not in sources:
+                    sources.append(chunks[i]["metadata"])
+            unique.append(
+                {
+                    "text": chunks[group[0]]["text"],
+                    "metadata": merge_metadata(sources),
+                    "sources": sources,
+                }
+            )
+
+        total = len(chunks)
+        saved = total - len(unique)
+        stats = {
+            "chunks": total,
+            "unique": len(unique),
+            "saved": saved,
+            "saved_pct": saved / total if total else 0.0,
+        }
+        return unique, stats
+
+
+def merge_metadata(sources: List[Dict]) -> Dict:
+    # Campos iguais em todas as origens ficam como valor; os diferentes viram
+    # lista (o filtro do Qdrant casa se algum elemento da lista casar)
+    merged = {}
+    for key in sources[0]:
+        values = []
+        for source in sources:
+            if source.get(key) not in values:
+                values.append(source.get(key))
+        merged[key] = values[0] if len(values) == 1 else values
+    return merged
+
+
+def format_report(stats: Dict[str, float]) -> str:
+    return (
+        f"Deduplicação: {stats['chunks']} chunks -> {stats['unique']} pontos | "
+        f"{stats['saved']} vetores economizados ({stats['saved_pct']:.1%})"
+    )
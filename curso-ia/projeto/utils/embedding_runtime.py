@@ -0,0 +1,103 @@
+import queue
+import threading
+from concurrent.futures import Future
+from typing import List, Optional
+
+import numpy as np
+
+from utils.model_registry import ModelRegistry, registry as default_registry
+
+DENSE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Backend do encoder -> tipo de modelo no registry
+# - onnx: fastembed fp32 (padrão)
+# - onnx-int8: ONNX Runtime com pesos quantizados em int8 (quantização dinâmica)
+# - torch: SentenceTransformer em PyTorch (baseline de referência)
+BACKENDS = {
+    "onnx": "dense",
+    "onnx-int8": "dense_int8",
+    "torch": "sentence_transformer",
+}
+
+
+class EmbeddingRuntime:
+    # Um único modelo denso para o chunker e a ingestão (por padrão fastembed/ONNX).
+    # Todos os pedidos passam por uma fila: uma thread junta pedidos
+    # pendentes em lotes de até batch_size textos e roda uma inferência por
+    # lote, então só um pool de threads de inferência fica ativo por vez.
+
+    def __init__(
+        self,
+        model_name: str = DENSE_MODEL,
+        batch_size: int = 64,
+        registry: ModelRegistry = default_registry,
+        backend: str = "onnx",
+    ):
+        if backend not in BACKENDS:
+            raise ValueError(f"backend deve ser um de {sorted(BACKENDS)}: {backend!r}")
+        self.model_name = model_name
+        self.backend = backend
+        self.batch_size = batch_size
+        self.registry = registry
+        self._requests: queue.Queue = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        return self.registry.get(BACKENDS[self.backend], self.model_name)
+
+    def prewarm(self) -> threading.Thread:
+        return self.registry.prewarm([(BACKENDS[self.backend], self.model_name)])
+
+    def _start(self):
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            pending = [self._requests.get()]
+            size = len(pending[0][0])
+
+            # Junta o que já estiver na fila, até completar o lote
+            while size < self.batch_size:
+                try:
+                    request = self._requests.get_nowait()
+                except queue.Empty:
+                    break
+                pending.append(request)
+                size += len(request[0])
+
+            texts = [text for request_texts, _ in pending for text in request_texts]
+            try:
+                vectors = np.asarray(
+                    list(self.model.embed(texts, batch_size=self.batch_size)),
+                    dtype=np.float32,
+                )
+            except Exception as error:
+                for _, future in pending:
+                    future.set_exception(error)
+                continue
+
+            start = 0
+            for request_texts, future in pending:
+                future.set_result(vectors[start : start + len(request_texts)])
+                start += len(request_texts)
+
+    def submit(self, texts: List[str]) -> Future:
+        future: Future = Future()
+        if not texts:
+            future.set_result(np.empty((0, 0), dtype=np.float32))
+            return future
+
+        self._start()
+        self._requests.put((list(texts), future))
+        return future
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return self.submit(texts).result()
+
+
+runtime = EmbeddingRuntime()
@@ -0,0 +1,178 @@
+from typing import List, Optional
+
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
+
+# Índices de payload dos metadados dos filings (ver EdgarClient.fetch_filing_data)
+PAYLOAD_INDEXES = {
+    "metadata.ticker": models.PayloadSchemaType.KEYWORD,
+    "metadata.form_type": models.PayloadSchemaType.KEYWORD,
+    "metadata.report_date": models.PayloadSchemaType.DATETIME,
+}
+
+
+def create_payload_indexes(qdrant: QdrantClient, collection_name: str):
+    for field_name, field_schema in PAYLOAD_INDEXES.items():
+        qdrant.create_payload_index(
+            collection_name=collection_name,
+            field_name=field_name,
+            field_schema=field_schema,
+        )
+
+
+def build_filter(
+    ticker: Optional[str] = None,
+    form_type: Optional[str] = None,
+    report_date_from: Optional[str] = None,
+    report_date_to: Optional[str] = None,
+) -> Optional[models.Filter]:
+    conditions: List[models.FieldCondition] = []
+
+    if ticker:
+        conditions.append(
+            models.FieldCondition(
+                key="metadata.ticker", match=models.MatchValue(value=ticker)
+            )
+        )
+    if form_type:
+        conditions.append(
+            models.FieldCondition(
+                key="metadata.form_type", match=models.MatchValue(value=form_type)
+            )
+        )
+    if report_date_from or report_date_to:
+        conditions.append(
+            models.FieldCondition(
+                key="metadata.report_date",
+                range=models.DatetimeRange(gte=report_date_from, lte=report_date_to),
+            )
+        )
+
+    return models.Filter(must=conditions) if conditions else None
+
+
+def candidate_prefetches(
+    query_dense: List[float],
+    query_sparse: dict,
+    query_filter: Optional[models.Filter] = None,
+    prefetch_limit: int = 10,
+) -> List[models.Prefetch]:
+    # Candidatos do dense e do sparse. O filtro vai em cada etapa: os
+    # candidatos já são só os que passam no filtro
+    return [
+        models.Prefetch(
+            query=query_dense,
+            using="dense",
+            limit=prefetch_limit,
+            filter=query_filter,
+        ),
+        models.Prefetch(
+            query=models.SparseVector(**query_sparse),
+            using="sparse",
+            limit=prefetch_limit,
+            filter=query_filter,
+        ),
+    ]
+
+
+def build_prefetch(
+    query_dense: List[float],
+    query_sparse: dict,
+    query_filter: Optional[models.Filter] = None,
+    prefetch_limit: int = 10,
+    fusion_limit: int = 20,
+) -> models.Prefetch:
+    # Denso + esparso -> RRF
+    return models.Prefetch(
+        prefetch=candidate_prefetches(query_dense, query_sparse, query_filter, prefetch_limit),
+        query=models.FusionQuery(fusion=models.Fusion.RRF),
+        limit=fusion_limit,
+        filter=query_filter,
+    )
+
+
+def hybrid_query(
+    qdrant: QdrantClient,
+    collection_name: str,
+    query_dense: List[float],
+    query_sparse: dict,
+    query_colbert: List[List[float]],
+    query_filter: Optional[models.Filter] = None,
+    prefetch_limit: int = 10,
+    fusion_limit: int = 20,
+    limit: int = 3,
+):
+    # Fusão RRF -> rerank ColBERT
+    return qdrant.query_points(
+        collection_name=collection_name,
+        prefetch=[
+            build_prefetch(
+                query_dense, query_sparse, query_filter, prefetch_limit, fusion_limit
+            )
+        ],
+        query=query_colbert,
+        using="colbert",
+        query_filter=query_filter,
+        limit=limit,
+    )
+
+
+async def hybrid_query_async(
+    qdrant: AsyncQdrantClient,
+    collection_name: str,
+    query_dense: List[float],
+    query_sparse: dict,
+    query_colbert: List[List[float]],
+    query_filter: Optional[models.Filter] = None,
+    prefetch_limit: int = 10,
+    fusion_limit: int = 20,
+    limit: int = 3,
+):
+    # Mesma consulta de hybrid_query, pelo cliente assíncrono
+    return await qdrant.query_points(
+        collection_name=collection_name,
+        prefetch=[
+            build_prefetch(
+                query_dense, query_sparse, query_filter, prefetch_limit, fusion_limit
+            )
+        ],
+        query=query_colbert,
+        using="colbert",
+        query_filter=query_filter,
+        limit=limit,
+    )
+
+
+async def fused_query_async(
+    qdrant: AsyncQdrantClient,
+    collection_name: str,
+    query_dense: List[float],
+    query_sparse: dict,
+    query_filter: Optional[models.Filter] = None,
+    prefetch_limit: int = 10,
+    fusion_limit: int = 20,
+):
+    # Só a primeira etapa (dense + sparse -> RRF), sem o rerank ColBERT
+    return await qdrant.query_points(
+        collection_name=collection_name,
+        prefetch=candidate_prefetches(query_dense, query_sparse, query_filter, prefetch_limit),
+        query=models.FusionQuery(fusion=models.Fusion.RRF),
+        query_filter=query_filter,
+        limit=fusion_limit,
+    )
+
+
+async def rerank_async(
+    qdrant: AsyncQdrantClient,
+    collection_name: str,
+    query_colbert: List[List[float]],
+    point_ids: List,
+    limit: int = 3,
+):
+    # Rerank ColBERT restrito aos candidatos já fundidos (os mesmos ids)
+    return await qdrant.query_points(
+        collection_name=collection_name,
+        query=query_colbert,
+        using="colbert",
+        query_filter=models.Filter(must=[models.HasIdCondition(has_id=point_ids)]),
+        limit=limit,
+    )
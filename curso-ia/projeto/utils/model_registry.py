@@ -0,0 +1,131 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+# Pasta persistente dos modelos (ONNX do fastembed e pesos do HuggingFace).
+# Em containers, popule-a no build com `python -m utils.model_registry` para
+# que a inicialização só leia do disco, sem download.
+MODEL_CACHE_DIR = os.getenv(
+    "MODEL_CACHE_DIR", str(Path(__file__).resolve().parent.parent / ".model_cache")
+)
+
+
+# Threads do encoder denso (ONNX Runtime ou PyTorch): o único pool de
+# inferência densa, compartilhado pelo chunker e pela ingestão via EmbeddingRuntime
+EMBED_THREADS = int(os.getenv("EMBED_THREADS", os.cpu_count() or 1))
+
+
+# Os imports pesados ficam dentro dos loaders: importar o módulo não custa nada
+def _load_dense(model_name: str, cache_dir: str):
+    from fastembed import TextEmbedding
+
+    return TextEmbedding(model_name, cache_dir=cache_dir, threads=EMBED_THREADS)
+
+
+def _load_sparse(model_name: str, cache_dir: str):
+    from fastembed import SparseTextEmbedding
+
+    return SparseTextEmbedding(model_name, cache_dir=cache_dir)
+
+
+def _load_colbert(model_name: str, cache_dir: str):
+    from fastembed import LateInteractionTextEmbedding
+
+    return LateInteractionTextEmbedding(model_name, cache_dir=cache_dir)
+
+
+def _load_dense_int8(model_name: str, cache_dir: str):
+    from utils.onnx_encoder import OnnxEncoder, quantized_file_name
+
+    return OnnxEncoder(
+        model_name, cache_dir, file_name=quantized_file_name(), threads=EMBED_THREADS
+    )
+
+
+def _load_sentence_transformer(model_name: str, cache_dir: str):
+    from utils.onnx_encoder import TorchEncoder
+
+    return TorchEncoder(model_name, cache_dir, threads=EMBED_THREADS)
+
+
+def _load_tokenizer(model_name: str, cache_dir: str):
+    from transformers import AutoTokenizer
+
+    return AutoTokenizer.from_pretrained(model_name, cache_dir=cache_dir)
+
+
+LOADERS: Dict[str, Callable[[str, str], Any]] = {
+    "dense": _load_dense,
+    "dense_int8": _load_dense_int8,
+    "sentence_transformer": _load_sentence_transformer,
+    "sparse": _load_sparse,
+    "colbert": _load_colbert,
+    "tokenizer": _load_tokenizer,
+}
+
+
+class ModelRegistry:
+    def __init__(self, cache_dir: str = MODEL_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.load_times: Dict[Tuple[str, str], float] = {}
+        self._models: Dict[Tuple[str, str], Any] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _key_lock(self, key: Tuple[str, str]) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def get(self, kind: str, model_name: str) -> Any:
+        # Carrega no primeiro uso; chamadas concorrentes esperam o mesmo load
+        key = (kind, model_name)
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._key_lock(key):
+            if key not in self._models:
+                start = time.perf_counter()
+                self._models[key] = LOADERS[kind](model_name, self.cache_dir)
+                self.load_times[key] = time.perf_counter() - start
+            return self._models[key]
+
+    def is_loaded(self, kind: str, model_name: str) -> bool:
+        return (kind, model_name) in self._models
+
+    def prewarm(self, models: Iterable[Tuple[str, str]]) -> threading.Thread:
+        # Carrega os modelos numa thread em segundo plano, em sequência
+        def load_all():
+            for kind, model_name in models:
+                self.get(kind, model_name)
+
+        thread = threading.Thread(target=load_all, daemon=True)
+        thread.start()
+        return thread
+
+    def report(self) -> str:
+        return "\n".join(
+            f"{kind:<22} {model_name:<40} {seconds:>6.2f}s"
+            for (kind, model_name), seconds in self.load_times.items()
+        )
+
+
+registry = ModelRegistry()
+
+
+DEFAULT_MODELS = [
+    ("dense", "sentence-transformers/all-MiniLM-L6-v2"),
+    ("sparse", "Qdrant/bm25"),
+    ("colbert", "colbert-ir/colbertv2.0"),
+    ("tokenizer", "sentence-transformers/all-MiniLM-L6-v2"),
+]
+
+
+if __name__ == "__main__":
+    # Popula MODEL_CACHE_DIR (ex.: no build da imagem) e mostra o custo de cada load
+    for kind, model_name in DEFAULT_MODELS:
+        registry.get(kind, model_name)
+    print(f"Modelos em {registry.cache_dir}")
+    print(registry.report())
@@ -0,0 +1,125 @@
+import platform
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+# Versões int8 (quantização dinâmica) publicadas no repositório do modelo,
+# uma por família de instruções de CPU
+QUANTIZED_FILES = {
+    "arm64": "onnx/model_qint8_arm64.onnx",
+    "avx512_vnni": "onnx/model_qint8_avx512_vnni.onnx",
+    "avx512": "onnx/model_qint8_avx512.onnx",
+    "avx2": "onnx/model_quint8_avx2.onnx",
+}
+
+
+def cpu_flags() -> set:
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    return set(line.split(":", 1)[1].split())
+    except OSError:
+        pass
+    return set()
+
+
+def quantized_file_name() -> str:
+    # Escolhe o arquivo int8 com os kernels mais rápidos para esta CPU
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return QUANTIZED_FILES["arm64"]
+
+    flags = cpu_flags()
+    if "avx512_vnni" in flags:
+        return QUANTIZED_FILES["avx512_vnni"]
+    if "avx512f" in flags:
+        return QUANTIZED_FILES["avx512"]
+    return QUANTIZED_FILES["avx2"]
+
+
+class OnnxEncoder:
+    # Encoder sentence-transformers em ONNX Runtime puro (sem PyTorch):
+    # tokenização + modelo + mean pooling + normalização L2
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: str,
+        file_name: str = "onnx/model.onnx",
+        threads: Optional[int] = None,
+        max_length: int = 512,
+    ):
+        import onnxruntime as ort
+        from huggingface_hub import hf_hub_download
+        from tokenizers import Tokenizer
+
+        model_path = hf_hub_download(model_name, file_name, cache_dir=cache_dir)
+        tokenizer_path = hf_hub_download(model_name, "tokenizer.json", cache_dir=cache_dir)
+
+        self.tokenizer = Tokenizer.from_file(tokenizer_path)
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        self.session = ort.InferenceSession(
+            str(Path(model_path)), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+        inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            inputs["token_type_ids"] = np.zeros_like(input_ids)
+
+        hidden = self.session.run(None, inputs)[0]
+
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.clip(norms, 1e-12, None)).astype(np.float32)
+
+    def embed(self, texts: List[str], batch_size: int = 64) -> Iterator[np.ndarray]:
+        # Mesmo contrato do fastembed: gera um vetor por texto, na ordem
+        # Os lotes são montados por tamanho de texto (menos padding)
+        texts = list(texts)
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        vectors: List[Optional[np.ndarray]] = [None] * len(texts)
+
+        for start in range(0, len(order), batch_size):
+            batch = order[start : start + batch_size]
+            for index, vector in zip(batch, self._encode([texts[i] for i in batch])):
+                vectors[index] = vector
+
+        yield from vectors
+
+
+class TorchEncoder:
+    # Baseline PyTorch (SentenceTransformer.encode), com o mesmo contrato
+
+    def __init__(self, model_name: str, cache_dir: str, threads: Optional[int] = None):
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        if threads:
+            torch.set_num_threads(threads)
+
+        self.model = SentenceTransformer(model_name, device="cpu", cache_folder=cache_dir)
+        self.model.max_seq_length = 512
+
+    def embed(self, texts: List[str], batch_size: int = 64) -> Iterator[np.ndarray]:
+        yield from self.model.encode(
+            texts,
+            batch_size=batch_size,
+            show_progress_bar=False,
+            normalize_embeddings=True,
+        )
@@ -0,0 +1,75 @@
+import asyncio
+import os
+from typing import Optional
+
+from qdrant_client import AsyncQdrantClient
+
+from utils.hybrid_search import hybrid_query_async
+
+# Cliente Qdrant do caminho de serviço (FastAPI): um AsyncQdrantClient por
+# processo, com pool de conexões compartilhado (REST ou gRPC), timeout por
+# consulta e um limite de consultas simultâneas. Tudo configurável por env:
+#
+#   QDRANT_PREFER_GRPC=1      gRPC (porta QDRANT_GRPC_PORT, padrão 6334)
+#   QDRANT_POOL_SIZE=16       conexões HTTP / canais gRPC
+#   QDRANT_TIMEOUT=10         timeout do cliente, em segundos
+#   QDRANT_MAX_CONCURRENCY=64 consultas em voo; as demais esperam na fila
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    return os.getenv(name, str(int(default))).lower() in ("1", "true", "yes")
+
+
+class QdrantPool:
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        prefer_grpc: Optional[bool] = None,
+        grpc_port: Optional[int] = None,
+        pool_size: Optional[int] = None,
+        timeout: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        self.url = url or os.getenv("QDRANT_URL", "http://localhost:6333")
+        self.api_key = api_key or os.getenv("QDRANT_API_KEY")
+        self.prefer_grpc = (
+            prefer_grpc if prefer_grpc is not None else env_flag("QDRANT_PREFER_GRPC")
+        )
+        self.grpc_port = grpc_port or int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+        self.pool_size = pool_size or int(os.getenv("QDRANT_POOL_SIZE", "16"))
+        self.timeout = timeout or int(os.getenv("QDRANT_TIMEOUT", "10"))
+        self.max_concurrency = max_concurrency or int(
+            os.getenv("QDRANT_MAX_CONCURRENCY", "64")
+        )
+        self.client: Optional[AsyncQdrantClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def transport(self) -> str:
+        return "grpc" if self.prefer_grpc else "rest"
+
+    async def start(self):
+        # Criado dentro do event loop que vai usá-lo (lifespan do FastAPI)
+        self.client = AsyncQdrantClient(
+            url=self.url,
+            api_key=self.api_key,
+            prefer_grpc=self.prefer_grpc,
+            grpc_port=self.grpc_port,
+            pool_size=self.pool_size,
+            timeout=self.timeout,
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+
+    async def run(self, query, collection_name: str, *args, **kwargs):
+        # query: uma das funções *_async de utils/hybrid_search.py
+        async with self._semaphore:
+            return await query(self.client, collection_name, *args, **kwargs)
+
+    async def hybrid_query(self, collection_name: str, *args, **kwargs):
+        return await self.run(hybrid_query_async, collection_name, *args, **kwargs)
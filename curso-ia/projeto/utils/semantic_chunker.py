@@ -1,9 +1,10 @@
 import warnings
 from collections import defaultdict
+from typing import Optional
 
 import hdbscan
-from sentence_transformers import SentenceTransformer
-from transformers import AutoTokenizer
+
+from utils.embedding_runtime import BACKENDS, EmbeddingRuntime, runtime as default_runtime
 
 warnings.simplefilter(action="ignore", category=FutureWarning)
 
@@ -15,22 +16,50 @@ class SemanticChunker:
         min_cluster_size: int = 3,
         orphan_cluster_size: int = 2,
         max_tokens: int = 300,
+        runtime: Optional[EmbeddingRuntime] = None,
+        backend: str = "onnx",
     ):
-        self.model = SentenceTransformer(model_name)
-        self.model.max_seq_length = 512
+        self.model_name = model_name
         self.min_cluster_sizer = min_cluster_size
         self.orphan_cluster_sizer = orphan_cluster_size
         self.max_tokens = max_tokens
-        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-
-    def create_chunks(self, text_content: str):
-        paragraphs = [
+        # Mesmo runtime (e mesma instância do modelo) usado na ingestão,
+        # a menos que outro modelo ou backend ("onnx-int8", "torch") seja pedido
+        if runtime is None:
+            runtime = (
+                default_runtime
+                if (model_name, backend)
+                == (default_runtime.model_name, default_runtime.backend)
+                else EmbeddingRuntime(model_name, backend=backend)
+            )
+        self.runtime = runtime
+        self.registry = runtime.registry
+
+    # Modelo e tokenizer só são carregados no primeiro create_chunks
+    @property
+    def tokenizer(self):
+        return self.registry.get("tokenizer", self.model_name)
+
+    def prewarm(self):
+        return self.registry.prewarm(
+            [
+                (BACKENDS[self.runtime.backend], self.runtime.model_name),
+                ("tokenizer", self.model_name),
+            ]
+        )
+
+    @staticmethod
+    def split_paragraphs(text_content: str):
+        return [
             p.strip() for p in text_content.split("\n") if len(p.strip().split()) > 10
         ]
+
+    def create_chunks(self, text_content: str):
+        paragraphs = self.split_paragraphs(text_content)
         if not paragraphs:
             return []
 
-        embeddings = self.model.encode(paragraphs, show_progress_bar=False)
+        embeddings = self.runtime.embed(paragraphs)
         labels = hdbscan.HDBSCAN(
             min_cluster_size=self.min_cluster_sizer, metric="euclidean"
         ).fit_predict(embeddings)
@@ -63,7 +92,7 @@ class SemanticChunker:
                 final_chunks.append("\n\n".join(current_chunk))
 
         if len(orphans) > 1:
-            orphan_emb = self.model.encode(orphans, show_progress_bar=False)
+            orphan_emb = self.runtime.embed(orphans)
             orphan_labels = hdbscan.HDBSCAN(
                 min_cluster_size=self.orphan_cluster_sizer, metric="euclidean"
             ).fit_predict(orphan_emb)